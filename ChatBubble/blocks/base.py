@@ -1,4 +1,6 @@
 from PySide6.QtWidgets import QWidget
+from PySide6.QtCore import QUrl, Signal
+from PySide6.QtGui import QDesktopServices
 
 
 class Block(QWidget):
@@ -7,14 +9,33 @@ class Block(QWidget):
     """
     block_type = "base"
 
+    linkActivated = Signal(str)
+    open_external_links = True
+
     def append(self, text: str):
         """
         Used during streaming (only for streaming-capable blocks).
         """
         pass
 
+    def retract_line(self) -> bool:
+        """
+        Withdraws the unfinished last line (StreamParser RETRACT event).
+        Returns True if nothing is left, so the block can be removed.
+        """
+        return False
+
     def finalize(self):
         """
         Called once streaming finishes.
         """
-        pass
\ No newline at end of file
+        pass
+
+    def _activate_link(self, url: str):
+        """
+        For the labels' linkActivated (QLabel doesn't emit it when it opens
+        links itself): emits linkActivated, then opens the URL.
+        """
+        self.linkActivated.emit(url)
+        if self.open_external_links:
+            QDesktopServices.openUrl(QUrl(url))
\ No newline at end of file
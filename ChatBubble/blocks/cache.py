@@ -0,0 +1,99 @@
+import sys
+import threading
+from collections import OrderedDict
+from hashlib import blake2b
+
+
+class ParseCache:
+    """
+    Bounded LRU cache of parse results (BlockNode lists, never widgets),
+    keyed by parser version and a hash of the content.
+
+    Cached nodes are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._entries = OrderedDict()   # key -> (nodes, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(text: str, version) -> tuple:
+        digest = blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        return version, len(text), digest
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, nodes):
+        nodes = tuple(nodes)
+        size = _estimate_size(nodes)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+
+            self._entries[key] = (nodes, size)
+            self._bytes += size
+
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+def _estimate_size(nodes) -> int:
+    """
+    Rough memory footprint of a node list (objects + their strings).
+    """
+    size = sys.getsizeof(nodes)
+    for node in nodes:
+        size += sys.getsizeof(node)
+        for value in node.fields().values():
+            if isinstance(value, list):
+                size += sys.getsizeof(value)
+                for span in value:
+                    size += sys.getsizeof(span) + sum(sys.getsizeof(v) for v in span)
+            else:
+                size += sys.getsizeof(value)
+    return size
+
+
+# Shared by ChatBubble / ChatView parsers
+PARSE_CACHE = ParseCache()
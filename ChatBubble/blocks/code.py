@@ -3,6 +3,7 @@ from PySide6.QtWidgets import (
     QLabel, QPushButton, QPlainTextEdit
 )
 from PySide6.QtCore import Qt, QTimer
+from PySide6.QtGui import QTextCursor
 from .base import Block
 from ..highlighter import CodeHighlighter
 
@@ -12,7 +13,8 @@ class CodeBlock(Block):
     def __init__(self, code:str, language="text"):
         super().__init__()
         self.language = language
-        self.code = code
+        self._chunks = [code]
+        self._resize_pending = False
 
         self.setObjectName("ChatBubbleCodeBlock")
 
@@ -37,26 +39,62 @@ class CodeBlock(Block):
         self.editor.setReadOnly(True)
         self.editor.setFrameShape(QFrame.NoFrame)
         self.editor.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        # Streamed text is never undone; don't keep an undo stack per chunk
+        self.editor.setUndoRedoEnabled(False)
         
         # Show the code and resize the editor accordingly
-        self.editor.setPlainText(self.code)
+        self.editor.setPlainText(code)
         self._resize()
 
         layout.addWidget(self.editor)
 
-        CodeHighlighter(self.editor.document(), language)
+        self.highlighter = CodeHighlighter(self.editor.document(), language)
     
-    def append(self, text: str):
-        self.code += text
-        self.editor.setPlainText(self.code)
+    @property
+    def code(self) -> str:
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+        return self._chunks[0]
+
+    @code.setter
+    def code(self, code: str):
+        """
+        Replaces the whole text (the editor is re-filled and re-highlighted).
+        """
+        self._chunks = [code]
+        self.editor.setPlainText(code)
         self._resize()
+
+    def append(self, text: str):
+        """
+        Inserts at the end of the document. The highlighter only re-runs on
+        the touched blocks and the resize is deferred to the event loop.
+        """
+        if not text:
+            return
+        self._chunks.append(text)
+
+        cursor = QTextCursor(self.editor.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(text)
+        self._schedule_resize()
     
     def finalize(self):
         self._resize()
+
+    def _schedule_resize(self):
+        if self._resize_pending:
+            return
+        self._resize_pending = True
+        QTimer.singleShot(0, self, self._resize)
     
     def _resize(self):
-        h = self.editor.document().size().height()
-        self.editor.setFixedHeight(int(h + 16))
+        self._resize_pending = False
+        # QPlainTextEdit reports the document height in lines, not pixels
+        lines = self.editor.document().size().height()
+        line_height = self.editor.fontMetrics().lineSpacing()
+        margin = self.editor.document().documentMargin()
+        self.editor.setFixedHeight(int(lines * line_height + 2 * margin + 16))
     
     def copy(self):
         from PySide6.QtWidgets import QApplication
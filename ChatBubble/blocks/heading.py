@@ -1,11 +1,23 @@
 from PySide6.QtWidgets import QLabel, QVBoxLayout
 from PySide6.QtCore import Qt
+from PySide6.QtGui import QFont
 from .base import Block
 
 
+# level -> (pixel size, weight); the same as components.qss, which overrides it
+HEADING_FONTS = {
+    1: (22, QFont.Bold),
+    2: (18, QFont.DemiBold),
+    3: (15, QFont.DemiBold),
+    4: (13, QFont.Medium),
+}
+
+
 class HeadingBlock(Block):
     """
     Section heading (H1-H4 style).
+    Styled in components.qss through the "level" property; the label font is set
+    from HEADING_FONTS too, so headings keep their size without the theme.
     """
     block_type = "heading"
 
@@ -14,31 +26,16 @@ class HeadingBlock(Block):
         level = max(1, min(level, 4))
 
         label = QLabel(text)
+        label.setObjectName("ChatBubbleHeading")
+        label.setProperty("level", level)
+        size, weight = HEADING_FONTS[level]
+        font = label.font()
+        font.setPixelSize(size)
+        font.setWeight(weight)
+        label.setFont(font)
         label.setWordWrap(True)
         label.setTextInteractionFlags(Qt.TextSelectableByMouse)
 
-        size_map = {
-            1: "22px",
-            2: "18px",
-            3: "15px",
-            4: "13px",
-        }
-
-        weight_map = {
-            1: "700",
-            2: "600",
-            3: "600",
-            4: "500",
-        }
-
-        label.setStyleSheet(f"""
-            color: #e6edf3;
-            font-size: {size_map[level]};
-            font-weight: {weight_map[level]};
-            margin-top: 8px;
-            margin-bottom: 4px;
-        """)
-
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
-        layout.addWidget(label)
\ No newline at end of file
+        layout.addWidget(label)
@@ -7,8 +7,11 @@ import html
 class LinkBlock(Block):
     """
     A clickable hyperlink block.
+    Styled in components.qss (#ChatBubbleLink); without it the link keeps
+    FONT_PX and takes its color from the palette (Link role).
     """
     block_type = "link"
+    FONT_PX = 13
 
     def __init__(self, text: str, url: str):
         super().__init__()
@@ -19,20 +22,15 @@ class LinkBlock(Block):
         label = QLabel(
             f'<a href="{safe_url}">{safe_text}</a>'
         )
-        label.setOpenExternalLinks(True)
+        label.setObjectName("ChatBubbleLink")
+        font = label.font()
+        font.setPixelSize(self.FONT_PX)
+        label.setFont(font)
+        label.linkActivated.connect(self._activate_link)
         label.setTextInteractionFlags(
             Qt.TextSelectableByMouse | Qt.LinksAccessibleByMouse
         )
-        label.setStyleSheet("""
-            QLabel {
-                color: #58a6ff;
-                font-size: 13px;
-            }
-            QLabel:hover {
-                text-decoration: underline;
-            }
-        """)
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 2, 0, 2)
-        layout.addWidget(label)
\ No newline at end of file
+        layout.addWidget(label)
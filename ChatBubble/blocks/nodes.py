@@ -0,0 +1,184 @@
+class BlockNode:
+    """
+    Base class for widget-free block descriptors.
+
+    Nodes are built by BlockParser without touching Qt, so they can be made
+    off the GUI thread, cached and serialized. BlockRenderer turns them into
+    Block widgets on demand.
+    """
+    __slots__ = ()
+    kind = "base"
+
+    # Names fields() reports (the constructor arguments); None: __slots__
+    FIELDS = None
+
+    def append(self, text: str):
+        """
+        Used during streaming (only for streaming-capable nodes).
+        """
+        pass
+
+    def blank(self):
+        """
+        Copy without streamed content, used to open a widget before appends.
+        """
+        return self
+
+    def fields(self) -> dict:
+        return {name: getattr(self, name) for name in self.FIELDS or self.__slots__}
+
+    def to_dict(self) -> dict:
+        return {"kind": self.kind, **self.fields()}
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.fields() == other.fields()
+
+    __hash__ = object.__hash__
+
+    def __repr__(self):
+        args = ", ".join(f"{k}={v!r}" for k, v in self.fields().items())
+        return f"{type(self).__name__}({args})"
+
+
+class TextNode(BlockNode):
+    __slots__ = ("_chunks",)
+    kind = "text"
+    FIELDS = ("text",)
+
+    def __init__(self, text: str = ""):
+        self.text = text
+
+    @property
+    def text(self) -> str:
+        # Streamed chunks are joined on demand, not on every append
+        if len(self._chunks) > 1:
+            self._chunks[:] = ["".join(self._chunks)]
+        return self._chunks[0] if self._chunks else ""
+
+    @text.setter
+    def text(self, text: str):
+        self._chunks = [text] if text else []
+
+    def append(self, text: str):
+        self._chunks.append(text)
+
+    def blank(self):
+        return TextNode()
+
+
+class ParagraphNode(BlockNode):
+    """
+    Consecutive prose lines as (text, url) spans; url is None for plain
+    text and LINE_BREAK separates the original lines.
+    """
+    __slots__ = ("spans",)
+    kind = "paragraph"
+
+    LINE_BREAK = ("\n", None)
+
+    def __init__(self, spans=()):
+        self.spans = [tuple(span) for span in spans]
+
+    def append(self, span: tuple):
+        """
+        Adjacent plain-text spans are merged, so streamed and one-shot
+        parses produce the same spans.
+        """
+        text, url = span
+        spans = self.spans
+        if (
+            url is None and spans and spans[-1][1] is None
+            and text != "\n" and spans[-1][0] != "\n"
+        ):
+            spans[-1] = (spans[-1][0] + text, None)
+        else:
+            spans.append((text, url))
+
+    def retract_line(self):
+        """
+        Drops the last line and the LINE_BREAK before it.
+        """
+        spans = self.spans
+        while spans and spans[-1] != self.LINE_BREAK:
+            spans.pop()
+        if spans:
+            spans.pop()
+
+    def blank(self):
+        return ParagraphNode()
+
+    def plain_text(self) -> str:
+        return "".join(text for text, _ in self.spans)
+
+
+class CodeNode(BlockNode):
+    __slots__ = ("_chunks", "language")
+    kind = "code"
+    FIELDS = ("code", "language")
+
+    def __init__(self, code: str = "", language: str = "text"):
+        self.code = code
+        self.language = language
+
+    @property
+    def code(self) -> str:
+        if len(self._chunks) > 1:
+            self._chunks[:] = ["".join(self._chunks)]
+        return self._chunks[0] if self._chunks else ""
+
+    @code.setter
+    def code(self, code: str):
+        self._chunks = [code] if code else []
+
+    def append(self, text: str):
+        self._chunks.append(text)
+
+    def blank(self):
+        return CodeNode("", self.language)
+
+
+class HeadingNode(BlockNode):
+    __slots__ = ("text", "level")
+    kind = "heading"
+
+    def __init__(self, text: str, level: int = 2):
+        self.text = text
+        self.level = level
+
+
+class LinkNode(BlockNode):
+    __slots__ = ("text", "url")
+    kind = "link"
+
+    def __init__(self, text: str, url: str):
+        self.text = text
+        self.url = url
+
+
+class ButtonNode(BlockNode):
+    __slots__ = ("label", "payload")
+    kind = "button"
+
+    def __init__(self, label: str, payload: dict | None = None):
+        self.label = label
+        self.payload = payload or {}
+
+
+class DividerNode(BlockNode):
+    __slots__ = ()
+    kind = "divider"
+
+
+NODE_TYPES = {
+    cls.kind: cls
+    for cls in (
+        TextNode, ParagraphNode, CodeNode, HeadingNode,
+        LinkNode, ButtonNode, DividerNode,
+    )
+}
+
+
+def node_from_dict(data: dict) -> BlockNode:
+    data = dict(data)
+    cls = NODE_TYPES[data.pop("kind")]
+    return cls(**data)
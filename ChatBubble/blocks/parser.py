@@ -1,24 +1,41 @@
 import re
 import json
-from typing import List
 
-from .text import TextBlock
-from .code import CodeBlock
-from .divider import DividerBlock
-from .heading import HeadingBlock
-from .link import LinkBlock
-from .button import ButtonBlock
+from .nodes import (
+    BlockNode, ParagraphNode, CodeNode, DividerNode, HeadingNode, ButtonNode,
+)
+
+
+# Stream events: (op, node, text)
+ADD = "add"         # complete node
+OPEN = "open"       # node that will receive APPEND events
+APPEND = "append"   # text appended to an open node
+CLOSE = "close"     # open node is complete
+RETRACT = "retract" # the unfinished last line of an open node is withdrawn;
+                    # a node left empty is removed and gets no CLOSE
+
+
+# Line separators, the same set str.splitlines() uses. Both parsers split
+# on these (and only these), so a streamed message matches its one-shot parse.
+LINE_BREAK = re.compile("\r\n|[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]")
+
+
+class ParseCancelled(Exception):
+    """
+    Raised by BlockParser.parse when its cancel event is set.
+    """
 
 
 class BlockParser:
     """
     Deterministic, non-LLM parser for ChatBubble blocks.
+    Produces widget-free BlockNode descriptors.
     """
 
-    CODE_PATTERN = re.compile(
-        r"```(\w+)?\n(.*?)```",
-        re.S
-    )
+    # Part of ParseCache keys; bump when the output for some input changes
+    VERSION = 5
+
+    FENCE = "```"
 
     HEADING_PATTERN = re.compile(
         r"^(#{1,4})\s+(.*)$",
@@ -38,64 +55,412 @@ class BlockParser:
         re.M
     )
 
-    def parse(self, text: str) -> List:
+    LANGUAGE_PATTERN = re.compile(r"\w*")
+
+    def __init__(self, cache=None):
+        """
+        :param cache: Optional ParseCache shared between parsers.
+        """
+        self.cache = cache
+
+    def parse(self, text: str, cancel=None) -> list[BlockNode]:
+        """
+        Returns the (possibly cached) nodes for text. Cached nodes are
+        shared, so callers must not modify them.
+        """
+        if self.cache is None:
+            return self._parse(text, cancel)
+
+        key = self.cache.key(text, self.VERSION)
+        nodes = self.cache.get(key)
+        if nodes is None:
+            nodes = self._parse(text, cancel)
+            self.cache.put(key, nodes)
+        return list(nodes)
+
+    def _parse(self, text: str, cancel=None) -> list[BlockNode]:
+        """
+        Single pass over the lines; fences are tracked with explicit state,
+        so any input parses in O(n). A fence that is never closed runs to
+        the end of the text (as it does while streaming).
+
+        :param cancel: Optional threading.Event, checked every 256 lines
+                       so worker-thread parses can be abandoned early.
+        """
         blocks = []
-        cursor = 0
+        para = None         # open paragraph
+        code = None         # lines of the open fence
+        lang = "text"
 
-        # Step 1: extract code blocks first
-        for match in self.CODE_PATTERN.finditer(text):
-            if match.start() > cursor:
-                blocks.extend(self._parse_inline(text[cursor:match.start()]))
-            
-            lang = match.group(1) or "text"
-            code = match.group(2).strip()
-            blocks.append(CodeBlock(code, lang))
+        for number, line in enumerate(LINE_BREAK.split(text)):
+            if cancel is not None and not number & 0xFF and cancel.is_set():
+                raise ParseCancelled()
+
+            # A line may close a fence and continue with text / a new fence
+            while line is not None:
+                if code is not None:
+                    end = line.find(self.FENCE)
+                    if end < 0:
+                        code.append(line)
+                        break
+
+                    code.append(line[:end])
+                    blocks.append(CodeNode(self._code_text(code), lang))
+                    code = None
+                    line = line[end + len(self.FENCE):]
+                    continue
+
+                opener = self._find_opener(line)
+                if opener is None:
+                    para = self._scan_line(line, blocks, para)
+                    break
+
+                start, lang = opener
+                if start:
+                    self._scan_line(line[:start], blocks, para)
+                para = None
+                code = []
+                line = None
+
+        if code is not None:
+            blocks.append(CodeNode(self._code_text(code), lang))
 
-            cursor = match.end()
-        
-        if cursor < len(text):
-            blocks.extend(self._parse_inline(text[cursor:]))
-        
         return blocks
+
+    @staticmethod
+    def _code_text(lines: list) -> str:
+        """
+        Fence body without its blank leading / trailing lines; indentation
+        and trailing spaces are kept (StreamParser can't take them back).
+        """
+        start, end = 0, len(lines)
+        while start < end and not lines[start].strip():
+            start += 1
+        while end > start and not lines[end - 1].strip():
+            end -= 1
+        return "\n".join(lines[start:end])
+
+    def _find_opener(self, line: str):
+        """
+        Returns (index, language) if the line opens a fence: ``` followed
+        only by an optional language word.
+        """
+        start = line.find(self.FENCE)
+        if start < 0:
+            return None
+
+        tail = line[start + len(self.FENCE):].rstrip("\r")
+        if not self.LANGUAGE_PATTERN.fullmatch(tail):
+            return None
+        return start, tail or "text"
     
-    def _parse_inline(self, text: str) -> List:
-        blocks = []
-        lines = text.splitlines()
+    def _scan_line(self, line: str, blocks: list, para: ParagraphNode | None = None):
+        """
+        Consecutive prose lines are merged into one ParagraphNode; blank
+        lines and block-level lines end it. Returns the still-open paragraph.
+        """
+        item = self._classify(line)
+
+        if isinstance(item, list):
+            if para is None:
+                para = ParagraphNode()
+                blocks.append(para)
+            else:
+                para.append(ParagraphNode.LINE_BREAK)
+            for span in item:
+                para.append(span)
+            return para
+
+        if item is not None:
+            blocks.append(item)
+        return None
 
-        for line in lines:
-            # Divider
-            if self.DIVIDER_PATTERN.match(line):
-                blocks.append(DividerBlock())
-                continue
+    def _classify(self, line: str):
+        """
+        Classifies a line once; each pattern only runs when the line
+        can actually match it. Returns a block-level node, a list of
+        inline spans for prose, or None for a blank line.
+        """
+        stripped = line.strip()
+        if not stripped:
+            return None
 
-            # Heading
+        first = stripped[0]
+
+        # Divider
+        if first == "-" and stripped == "---":
+            return DividerNode()
+
+        # Heading
+        if first == "#" and line[0] == "#":
             h = self.HEADING_PATTERN.match(line)
             if h:
                 level = len(h.group(1))
-                blocks.append(HeadingBlock(h.group(2), level))
-                continue
+                return HeadingNode(h.group(2), level)
 
-            # Button
+        # Button
+        if "[[button:" in line:
             btn = self.BUTTON_PATTERN.search(line)
             if btn:
-                label = btn.group(1).strip()
-                try:
-                    payload = json.loads(btn.group(2))
-                except Exception:
-                    payload = {}
-                blocks.append(ButtonBlock(label, payload))
-                continue
-
-            # Links (inline replacement)
-            last = 0
-            for lm in self.LINK_PATTERN.finditer(line):
-                if lm.start() > last:
-                    blocks.append(TextBlock(line[last:lm.start()]))
-                
-                blocks.append(LinkBlock(lm.group(1), lm.group(2)))
-                last = lm.end()
+                return self._make_button(btn)
+
+        # Prose with inline links
+        return self._inline_spans(line)
+
+    def _inline_spans(self, line: str) -> list:
+        """
+        Splits a line into (text, url) spans. url is None for plain text.
+        """
+        if "](" not in line:
+            return [(line, None)] if line else []
+
+        spans = []
+        last = 0
+        for lm in self.LINK_PATTERN.finditer(line):
+            if lm.start() > last:
+                spans.append((line[last:lm.start()], None))
             
-            if last < len(line):
-                blocks.append(TextBlock(line[last:]))
+            spans.append((lm.group(1), lm.group(2)))
+            last = lm.end()
         
-        return blocks
\ No newline at end of file
+        if last < len(line):
+            spans.append((line[last:], None))
+        
+        return spans
+
+    def _make_button(self, match) -> ButtonNode:
+        label = match.group(1).strip()
+        try:
+            payload = json.loads(match.group(2))
+        except Exception:
+            payload = {}
+        return ButtonNode(label, payload)
+
+
+class StreamParser:
+    """
+    Incremental, resumable parser used while a message is streaming.
+
+    Only the unterminated tail of the current line and the open nodes are
+    kept between chunks, so fences, headings and links may be split across
+    chunk boundaries. feed() never re-parses earlier text; it returns
+    (op, node, text) events that BlockRenderer.apply() turns into
+    Block.append / Block.retract_line / Block.finalize calls.
+    """
+
+    FENCE = BlockParser.FENCE
+
+    # First characters that may turn a line into something other than text
+    MARKUP_STARTS = "#-`["
+
+    # Text from here on may still become a link, button or fence
+    HOLD_PATTERN = re.compile(r"[\[`]")
+
+    def __init__(self, parser: BlockParser | None = None):
+        self.parser = parser or BlockParser()
+        self.reset()
+
+    def reset(self):
+        """
+        Drops all state without finalizing open blocks.
+        """
+        self._pending = ""      # current line, not yet written to a block
+        self._streamed = False  # part of the current line is already shown
+        self._para = None       # ParagraphNode receiving prose lines
+        self._code = None       # CodeNode while inside a fence
+        self._code_lines = 0
+        self._code_blank = []   # blank code lines not written yet
+
+    def feed(self, chunk: str) -> list:
+        """
+        Consume a chunk of raw text.
+        Returns the stream events produced by this chunk, in order.
+        """
+        events = []
+
+        # A \r held back from the previous chunk: the line break is \r or \r\n
+        if self._pending.endswith("\r"):
+            self._pending = self._pending[:-1]
+            chunk = "\r" + chunk
+
+        # and one at the end of this chunk is held back the same way
+        held = "\r" if chunk.endswith("\r") else ""
+        lines = LINE_BREAK.split(chunk[:-1] if held else chunk)
+
+        for line in lines[:-1]:
+            self._pending += line
+            self._end_line(events)
+
+        self._pending += lines[-1] + held
+        self._stream_pending(events)
+        return events
+
+    def close(self) -> list:
+        """
+        Flush the last line and close any open node.
+        The parser can be reused afterwards.
+        """
+        events = []
+        if self._pending or self._streamed:
+            self._end_line(events)
+
+        self._close_para(events)
+        if self._code is not None:
+            self._close_code(events)
+        return events
+
+    # ---------------------------------
+    # LINE HANDLING
+    # ---------------------------------
+    def _end_line(self, events: list):
+        line = self._pending
+        if line.endswith("\r"):
+            line = line[:-1]
+        self._pending = ""
+
+        # Same fence rules as BlockParser.parse: ``` closes anywhere in a
+        # line, and the rest of that line is parsed as regular text.
+        if self._code is not None:
+            end = line.find(self.FENCE)
+            if end < 0:
+                self._write_code(line, events)
+                self._streamed = False
+                return
+
+            if self._streamed or line[:end].strip():
+                self._write_code(line[:end], events)
+            self._close_code(events)
+            self._streamed = False
+            line = line[end + len(self.FENCE):]
+
+        opener = self.parser._find_opener(line)
+        head = line if opener is None else line[:opener[0]]
+
+        if self._streamed:
+            self._end_prose(head, events)
+        else:
+            self._add_line(head, events)
+
+        if opener is not None:
+            self._close_para(events)
+            self._code = CodeNode("", opener[1])
+            events.append((OPEN, self._code, None))
+
+        self._streamed = False
+
+    def _add_line(self, line: str, events: list):
+        item = self.parser._classify(line)
+
+        if isinstance(item, list):
+            self._start_prose_line(events)
+            for span in item:
+                self._append(self._para, span, events)
+        else:
+            self._close_para(events)
+            if item is not None:
+                events.append((ADD, item, None))
+
+    def _stream_pending(self, events: list):
+        """
+        Show as much of the unterminated line as can no longer change meaning.
+        """
+        pending = self._pending
+        # A trailing \r may be the first half of a \r\n line break
+        if pending.endswith("\r"):
+            pending = pending[:-1]
+        if not pending:
+            return
+
+        if self._code is not None:
+            if not self._streamed:
+                stripped = pending.lstrip()
+                # Might still become the closing fence
+                if self.FENCE.startswith(stripped) or stripped.startswith(self.FENCE):
+                    return
+
+            # Hold from the first backtick: it may start the closing fence
+            stop = pending.find("`")
+            code = pending if stop < 0 else pending[:stop]
+            if not self._streamed and not code.strip():
+                return      # may still be a blank line
+            if code:
+                self._write_code(code, events)
+                self._pending = self._pending[len(code):]
+            return
+
+        if not self._streamed:
+            stripped = pending.lstrip()
+            if not stripped or stripped[0] in self.MARKUP_STARTS:
+                return
+
+        # Hold everything from a possible link / button / fence onwards
+        hold = self.HOLD_PATTERN.search(pending)
+        text = pending if hold is None else pending[:hold.start()]
+        if text:
+            if not self._streamed:
+                self._start_prose_line(events)
+                self._streamed = True
+            self._append(self._para, (text, None), events)
+            self._pending = self._pending[len(text):]
+
+    # ---------------------------------
+    # OPEN NODES
+    # ---------------------------------
+    def _append(self, node: BlockNode, text, events: list):
+        node.append(text)
+        events.append((APPEND, node, text))
+
+    def _start_prose_line(self, events: list):
+        if self._para is None:
+            self._para = ParagraphNode()
+            events.append((OPEN, self._para, None))
+        else:
+            self._append(self._para, ParagraphNode.LINE_BREAK, events)
+
+    def _end_prose(self, rest: str, events: list):
+        """
+        Finishes a prose line whose beginning is already shown.
+        """
+        btn = self.parser.BUTTON_PATTERN.search(rest)
+        if btn:
+            # The whole line is a button (as in BlockParser.parse), so the
+            # part already shown is withdrawn
+            self._para.retract_line()
+            events.append((RETRACT, self._para, None))
+            if self._para.spans:
+                self._close_para(events)
+            else:
+                self._para = None
+            events.append((ADD, self.parser._make_button(btn), None))
+            return
+
+        for span in self.parser._inline_spans(rest):
+            self._append(self._para, span, events)
+
+    def _close_para(self, events: list):
+        if self._para is not None:
+            events.append((CLOSE, self._para, None))
+            self._para = None
+
+    def _write_code(self, text: str, events: list):
+        if not self._streamed:
+            # Blank lines wait for a line with code, so leading and trailing
+            # ones are dropped like BlockParser.parse does
+            if not text.strip():
+                if self._code_lines:
+                    self._code_blank.append(text)
+                return
+            if self._code_lines:
+                text = "\n" + "".join(line + "\n" for line in self._code_blank) + text
+                self._code_blank = []
+            self._code_lines += 1
+            self._streamed = True
+
+        if text:
+            self._append(self._code, text, events)
+
+    def _close_code(self, events: list):
+        events.append((CLOSE, self._code, None))
+        self._code = None
+        self._code_lines = 0
+        self._code_blank = []
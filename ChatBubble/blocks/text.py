@@ -1,6 +1,8 @@
 from PySide6.QtWidgets import QLabel
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from .base import Block
+from .nodes import ParagraphNode
+import html
 
 
 class TextBlock(Block):
@@ -15,7 +17,8 @@ class TextBlock(Block):
             Qt.TextSelectableByMouse | Qt.LinksAccessibleByMouse
         )
         self.label.setTextFormat(Qt.RichText)
-        self._text = text
+        self._parts = [text]
+        self._update_pending = False
 
         layout = self.layout() or self._init_layout()
         layout.addWidget(self.label)
@@ -27,6 +30,63 @@ class TextBlock(Block):
         return layout
     
     def append(self, text: str):
-        self._text += text
-        self.label.setText(self._text)
-        self.label.adjustSize()
\ No newline at end of file
+        """
+        The label text is joined and set once per event loop pass, not per
+        append (all appends of one StreamBatcher flush share one setText).
+        """
+        self._parts.append(text)
+        self._schedule_update()
+
+    def finalize(self):
+        self._update()
+
+    def _schedule_update(self):
+        if self._update_pending:
+            return
+        self._update_pending = True
+        QTimer.singleShot(0, self, self._update)
+
+    def _update(self):
+        self._update_pending = False
+        self.label.setText("".join(self._parts))
+        self.label.adjustSize()
+
+
+class ParagraphBlock(TextBlock):
+    """
+    A whole paragraph in one label; links are rich-text anchors and take
+    their color from the palette (Link role).
+    """
+    block_type = "paragraph"
+
+    LINK_STYLE = "text-decoration: none;"
+
+    def __init__(self, spans=()):
+        super().__init__("")
+        self.label.linkActivated.connect(self._activate_link)
+        self._parts = []        # span HTML
+        self._line_start = 0    # index in _parts where the last line starts
+        for span in spans:
+            self._add_span(span)
+        if spans:
+            self._update()
+
+    def append(self, span: tuple):
+        self._add_span(span)
+        self._schedule_update()
+
+    def retract_line(self) -> bool:
+        del self._parts[self._line_start:]
+        self._schedule_update()
+        return not self._parts
+
+    def _add_span(self, span: tuple):
+        text, url = span
+        if (text, url) == ParagraphNode.LINE_BREAK:
+            self._line_start = len(self._parts)
+        self._parts.append(self._span_html(text, url))
+
+    def _span_html(self, text: str, url: str | None) -> str:
+        if url is None:
+            return html.escape(text).replace("\n", "<br>")
+        return f'<a href="{html.escape(url)}" style="{self.LINK_STYLE}">{html.escape(text)}</a>'
@@ -1,51 +1,118 @@
 from PySide6.QtWidgets import QFrame, QHBoxLayout
-from PySide6.QtCore import QEasingCurve, QPropertyAnimation
+from PySide6.QtCore import QEasingCurve, QPropertyAnimation, Signal
 
-from .blocks.parser import BlockParser
-from .renderer import BlockRenderer
+from .blocks.base import Block
+from .blocks.cache import PARSE_CACHE
+from .blocks.parser import BlockParser, StreamParser
+from .renderer import BlockRenderer, StreamBatcher
 
 
 class ChatBubble(QFrame):
-    def __init__(self, role="assistant"):
+    # Forwarded from the blocks / PaintedBody
+    buttonClicked = Signal(dict)    # emits payload
+    linkActivated = Signal(str)
+
+    def __init__(self, role="assistant", stream_interval_ms=StreamBatcher.FRAME_MS, painted=False):
+        """
+        :param painted: Draw the body with a single PaintedBody widget instead
+                        of one Block widget per block (code blocks and custom
+                        blocks are still embedded as widgets).
+        """
         super().__init__()
-        self._stream_buffer = ""
+        self._stream_chunks = []
+        self.role = role
 
         self.setObjectName("ChatBubbleUser" if role == "user" else "ChatBubbleAI")
 
         layout = QHBoxLayout(self)
         layout.setContentsMargins(12, 8, 12, 8)
 
-        self.body = QFrame()
-        self.body.setObjectName("ChatBubbleBody")
-        self.body.setFrameShape(QFrame.NoFrame)
-        self.renderer = BlockRenderer(self.body)
+        if painted:
+            # The body is its own renderer
+            from .painted import PaintedBody
+            self.body = PaintedBody()
+            self.body.buttonClicked.connect(self.buttonClicked)
+            self.body.linkActivated.connect(self.linkActivated)
+            self.renderer = self.body
+        else:
+            self.body = QFrame()
+            self.body.setObjectName("ChatBubbleBody")
+            self.body.setFrameShape(QFrame.NoFrame)
+            self.renderer = BlockRenderer(self.body, on_block=self._connect_block)
         layout.addWidget(self.body)
 
-        self.parser = BlockParser()  
+        self.parser = BlockParser(cache=PARSE_CACHE)  
+        self.stream = StreamParser(self.parser)
+        self.batcher = StreamBatcher(
+            self.renderer, self.stream, stream_interval_ms, parent=self
+        )
+        self.loader = None
         self._fade_in()
 
     # ---------------------------------
     # BLOCK-BASED API (NEW, STABLE)
     # ---------------------------------
     def add_block(self, block):
+        """
+        Accepts a Block widget or a BlockNode from BlockParser.
+        """
         self.renderer.add_block(block)
     
     def add_blocks(self, blocks):
         for block in blocks:
             self.add_block(block)
 
+    def add_text_async(self, text: str):
+        """
+        For large messages: parses on a worker thread and adds the blocks
+        in small batches, so the GUI thread never blocks on the parse.
+        """
+        if self.loader is None:
+            from .loader import AsyncBlockLoader
+            self.loader = AsyncBlockLoader(self.renderer, self.parser, parent=self)
+        self.loader.load(text)
+        return self.loader
+
     # ---------------------------------
     # STREAMING TEXT API (LEGACY / LIVE)
     # ---------------------------------
     def append_stream(self, text: str):
         """
         Streaming-safe: accepts RAW TEXT ONLY.
+        Chunks may split markup anywhere; open blocks are extended in place.
+        Rendering is coalesced by the batcher (at most once per interval).
         """
-        self._stream_buffer += text
-        blocks = self.parser.parse(text)
-        for block in blocks:
-            self.renderer.add_block(block)
+        self._stream_chunks.append(text)
+        self.batcher.push(text)
+
+    def finish_stream(self):
+        """
+        Flushes the last partial line and finalizes open blocks.
+        """
+        self.batcher.close()
+
+    def clear(self):
+        """
+        Removes all blocks and resets streaming state, so the bubble can be reused.
+        """
+        self.batcher.reset()
+        self.stream.reset()
+        if self.loader is not None:
+            self.loader.cancel()
+        self._stream_chunks = []
+        self.renderer.clear()
+
+    @property
+    def stream_text(self) -> str:
+        return "".join(self._stream_chunks)
     
+    def _connect_block(self, block):
+        if not isinstance(block, Block):
+            return
+        block.linkActivated.connect(self.linkActivated)
+        if block.block_type == "button":
+            block.clicked.connect(self.buttonClicked)
+
     def _fade_in(self):
         anim = QPropertyAnimation(self, b"windowOpacity")
 
@@ -0,0 +1,266 @@
+import re
+import threading
+
+
+class Grammar:
+    """
+    Token rules for one language, compiled into a single alternation.
+
+    tokenize() makes one left-to-right pass over a line and returns
+    (start, length, kind) tuples plus the state to carry into the next line.
+    State 0 means "nothing open"; state N means span N-1 (triple-quoted
+    string, block comment, ...) is still open at the end of the line.
+    """
+    __slots__ = ("name", "pattern", "kinds", "spans")
+
+    def __init__(self, name: str, rules: list, spans: list = ()):
+        """
+        :param rules: [(kind, regex)] single-line tokens, in priority order.
+        :param spans: [(kind, start_regex, end_regex)] tokens that may span lines.
+                      Spans are tried before rules.
+        """
+        self.name = name
+        self.kinds = {}
+        self.spans = []
+        parts = []
+
+        for i, (kind, start, end) in enumerate(spans):
+            parts.append(f"(?P<s{i}>{start})")
+            self.spans.append((kind, re.compile(end)))
+
+        for i, (kind, regex) in enumerate(rules):
+            parts.append(f"(?P<t{i}>{regex})")
+            self.kinds[f"t{i}"] = kind
+
+        self.pattern = re.compile("|".join(parts)) if parts else None
+
+    def tokenize(self, line: str, state: int = 0):
+        tokens = []
+        pos = 0
+
+        # A state from before register_grammar() replaced this language
+        # may not exist any more; restart from "nothing open"
+        if state > len(self.spans):
+            state = 0
+
+        # Continue a span left open by the previous line
+        if state > 0:
+            kind, end = self.spans[state - 1]
+            m = end.search(line)
+            if m is None:
+                if line:
+                    tokens.append((0, len(line), kind))
+                return tokens, state
+            tokens.append((0, m.end(), kind))
+            pos = m.end()
+
+        if self.pattern is None:
+            return tokens, 0
+
+        search = self.pattern.search
+        while True:
+            m = search(line, pos)
+            if m is None:
+                break
+
+            name = m.lastgroup
+            start = m.start()
+
+            if name[0] == "s":
+                index = int(name[1:])
+                kind, end = self.spans[index]
+                e = end.search(line, m.end())
+                if e is None:
+                    tokens.append((start, len(line) - start, kind))
+                    return tokens, index + 1
+                pos = e.end()
+            else:
+                kind = self.kinds[name]
+                pos = m.end()
+
+            if pos > start:
+                tokens.append((start, pos - start, kind))
+            else:
+                pos += 1
+
+        return tokens, 0
+
+
+def _words(words, ignore_case=False) -> str:
+    alternation = "|".join(sorted(words, key=len, reverse=True))
+    flags = "(?i:" if ignore_case else "(?:"
+    return rf"\b{flags}{alternation})\b"
+
+
+# Shared pieces
+DOUBLE_STRING = r'"(?:[^"\\]|\\.)*"?'
+SINGLE_STRING = r"'(?:[^'\\]|\\.)*'?"
+NUMBER = r"\b(?:0[xX][0-9a-fA-F_]+|\d[\d_]*(?:\.\d[\d_]*)?(?:[eE][+-]?\d+)?)\b"
+BLOCK_COMMENT = ("comment", r"/\*", r"\*/")
+
+
+# -----------------------------
+# LANGUAGE SPECS
+# -----------------------------
+_SPECS = {
+    # Fallback used for unknown languages (strings and # comments)
+    "text": {
+        "rules": [
+            ("comment", r"#.*"),
+            ("string", DOUBLE_STRING),
+            ("string", SINGLE_STRING),
+        ],
+    },
+    "python": {
+        "aliases": ("py", "python3"),
+        "spans": [
+            ("string", r'[rRbBuUfF]{0,2}"""', r'"""'),
+            ("string", r"[rRbBuUfF]{0,2}'''", r"'''"),
+        ],
+        "rules": [
+            ("comment", r"#.*"),
+            ("string", r"[rRbBuUfF]{0,2}" + DOUBLE_STRING),
+            ("string", r"[rRbBuUfF]{0,2}" + SINGLE_STRING),
+            ("number", NUMBER),
+            ("keyword", _words([
+                "def", "class", "import", "from", "return", "if", "else",
+                "elif", "for", "while", "in", "None", "True", "False", "and",
+                "or", "not", "is", "as", "with", "try", "except", "finally",
+                "raise", "lambda", "yield", "await", "async", "pass", "break",
+                "continue", "global", "nonlocal", "del", "assert", "match", "case",
+            ])),
+        ],
+    },
+    "javascript": {
+        "aliases": ("js", "jsx", "ts", "tsx", "typescript", "mjs"),
+        "spans": [
+            BLOCK_COMMENT,
+            ("string", r"`", r"(?<!\\)`"),
+        ],
+        "rules": [
+            ("comment", r"//.*"),
+            ("string", DOUBLE_STRING),
+            ("string", SINGLE_STRING),
+            ("number", NUMBER),
+            ("keyword", _words([
+                "var", "let", "const", "function", "return", "if", "else",
+                "for", "while", "do", "switch", "case", "default", "break",
+                "continue", "new", "delete", "typeof", "instanceof", "in", "of",
+                "class", "extends", "super", "this", "import", "export", "from",
+                "async", "await", "yield", "try", "catch", "finally", "throw",
+                "null", "undefined", "true", "false", "interface", "type", "enum",
+            ])),
+        ],
+    },
+    "json": {
+        "aliases": ("jsonc", "json5"),
+        "rules": [
+            ("string", DOUBLE_STRING),
+            ("number", r"-?" + NUMBER),
+            ("keyword", _words(["true", "false", "null"])),
+        ],
+    },
+    "bash": {
+        "aliases": ("sh", "shell", "zsh", "console"),
+        "rules": [
+            ("comment", r"(?<![^\s;])#.*"),
+            ("string", DOUBLE_STRING),
+            ("string", r"'[^']*'?"),
+            ("number", NUMBER),
+            ("keyword", _words([
+                "if", "then", "else", "elif", "fi", "for", "while", "until",
+                "do", "done", "case", "esac", "in", "function", "return",
+                "export", "local", "readonly", "source", "echo", "exit",
+            ])),
+        ],
+    },
+    "c": {
+        "aliases": (
+            "h", "cpp", "c++", "cc", "hpp", "cxx", "java", "cs", "csharp",
+            "go", "rust", "rs", "kotlin", "kt", "swift", "objc",
+        ),
+        "spans": [BLOCK_COMMENT],
+        "rules": [
+            ("comment", r"//.*"),
+            ("string", DOUBLE_STRING),
+            ("string", SINGLE_STRING),
+            ("number", NUMBER + r"[uUlLfF]*"),
+            ("keyword", _words([
+                "auto", "break", "case", "char", "const", "continue", "default",
+                "do", "double", "else", "enum", "extern", "float", "for", "goto",
+                "if", "int", "long", "return", "short", "signed", "sizeof",
+                "static", "struct", "switch", "typedef", "union", "unsigned",
+                "void", "volatile", "while", "class", "public", "private",
+                "protected", "namespace", "template", "new", "delete", "this",
+                "true", "false", "null", "nullptr", "bool", "package", "import",
+                "func", "fn", "let", "mut", "var", "impl", "pub", "use", "match",
+                "interface", "extends", "implements", "final", "try", "catch",
+                "throw", "throws", "virtual", "override", "string",
+            ])),
+        ],
+    },
+    "sql": {
+        "aliases": ("mysql", "postgresql", "postgres", "sqlite", "plsql"),
+        "spans": [BLOCK_COMMENT],
+        "rules": [
+            ("comment", r"--.*"),
+            ("string", r"'(?:[^']|'')*'?"),
+            ("string", r'"[^"]*"?'),
+            ("number", NUMBER),
+            ("keyword", _words([
+                "select", "from", "where", "and", "or", "not", "insert", "into",
+                "values", "update", "set", "delete", "create", "table", "drop",
+                "alter", "index", "view", "join", "inner", "left", "right",
+                "outer", "full", "on", "as", "group", "by", "order", "having",
+                "limit", "offset", "union", "all", "distinct", "null", "is",
+                "in", "like", "between", "case", "when", "then", "else", "end",
+                "primary", "key", "foreign", "references", "default", "exists",
+                "with", "asc", "desc", "count", "sum", "avg", "min", "max",
+            ], ignore_case=True)),
+        ],
+    },
+}
+
+_ALIASES = {
+    alias: name
+    for name, spec in _SPECS.items()
+    for alias in spec.get("aliases", ())
+}
+
+_compiled: dict[str, Grammar] = {}
+_lock = threading.Lock()
+
+
+def register_grammar(name: str, rules: list, spans: list = (), aliases: tuple = ()):
+    """
+    Adds (or replaces) a language. Compiled lazily on first use.
+    """
+    name = name.lower()
+    with _lock:
+        _SPECS[name] = {"rules": list(rules), "spans": list(spans), "aliases": tuple(aliases)}
+        for alias in aliases:
+            _ALIASES[alias.lower()] = name
+        _compiled.pop(name, None)
+
+
+def resolve_language(language: str) -> str:
+    language = (language or "text").lower()
+    language = _ALIASES.get(language, language)
+    return language if language in _SPECS else "text"
+
+
+def get_grammar(language: str) -> Grammar:
+    """
+    Returns the process-wide compiled grammar for a language (or alias).
+    Unknown languages fall back to the "text" grammar.
+    """
+    name = resolve_language(language)
+    grammar = _compiled.get(name)
+    if grammar is None:
+        with _lock:
+            grammar = _compiled.get(name)
+            if grammar is None:
+                spec = _SPECS[name]
+                grammar = Grammar(name, spec["rules"], spec.get("spans", ()))
+                _compiled[name] = grammar
+    return grammar
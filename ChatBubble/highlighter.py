@@ -1,33 +1,153 @@
-from PySide6.QtCore import *
-from PySide6.QtGui import *
+import threading
+import weakref
+from types import MappingProxyType
+
+from PySide6.QtGui import QColor, QFont, QSyntaxHighlighter, QTextCharFormat
+
+from . import styles
+from .grammars import Grammar, get_grammar, resolve_language
+
+
+# Theme value -> token kind -> (color, bold)
+HIGHLIGHT_THEMES = {
+    "dark": {
+        "keyword": ("#ff7b72", True),
+        "string": ("#a5d6ff", False),
+        "number": ("#79c0ff", False),
+        "comment": ("#8b949e", False),
+    },
+    "light": {
+        "keyword": ("#cf222e", True),
+        "string": ("#0a3069", False),
+        "number": ("#0550ae", False),
+        "comment": ("#6e7781", False),
+    },
+}
+
+# Colors in use. Replace through set_highlight_theme() /
+# invalidate_highlighter_cache().
+HIGHLIGHT_COLORS = dict(HIGHLIGHT_THEMES[styles.current_theme])
+
+
+class HighlightRules:
+    """
+    Char formats for one language, shared by every highlighter of that
+    language; treat as read-only. The grammar is not cached here but read
+    from the grammars registry, so register_grammar() replacements apply.
+    """
+    __slots__ = ("language", "formats")
+
+    def __init__(self, language: str, formats):
+        self.language = language
+        self.formats = formats
+
+    @property
+    def grammar(self) -> Grammar:
+        return get_grammar(self.language)
+
+
+_rules: dict[str, HighlightRules] = {}
+_formats = None
+_lock = threading.Lock()
+_live_highlighters = weakref.WeakSet()
+
+
+def _build_formats():
+    formats = {}
+    for kind, (color, bold) in HIGHLIGHT_COLORS.items():
+        fmt = QTextCharFormat()
+        fmt.setForeground(QColor(color))
+        if bold:
+            fmt.setFontWeight(QFont.Bold)
+        formats[kind] = fmt
+    return MappingProxyType(formats)
+
+
+def get_highlight_rules(language: str) -> HighlightRules:
+    """
+    Process-wide registry: the formats for a language are built on first
+    request and reused afterwards.
+    """
+    global _formats
+
+    name = resolve_language(language)
+    rules = _rules.get(name)
+    if rules is None:
+        with _lock:
+            rules = _rules.get(name)
+            if rules is None:
+                if _formats is None:
+                    _formats = _build_formats()
+                rules = HighlightRules(name, _formats)
+                _rules[name] = rules
+    return rules
+
+
+def invalidate_highlighter_cache(colors: dict | None = None):
+    """
+    Theme hook: drops the cached rules/formats (optionally replacing
+    HIGHLIGHT_COLORS) and re-highlights every live highlighter.
+    """
+    global _formats
+
+    with _lock:
+        if colors:
+            HIGHLIGHT_COLORS.update(colors)
+        _rules.clear()
+        _formats = None
+
+    for highlighter in list(_live_highlighters):
+        try:
+            highlighter.rules = get_highlight_rules(highlighter.language)
+            highlighter.rehighlight()
+        except RuntimeError:
+            # Underlying document already deleted
+            _live_highlighters.discard(highlighter)
+
+
+def set_highlight_theme(theme: str):
+    """
+    Switches to HIGHLIGHT_THEMES[theme] (called from ChatBubble.styles when
+    utils.theme applies a theme).
+    """
+    invalidate_highlighter_cache(HIGHLIGHT_THEMES[theme])
 
 
 class CodeHighlighter(QSyntaxHighlighter):
     def __init__(self, document, language=""):
         super().__init__(document)
         self.language = language
-        self.rules = []
+        self.rules = get_highlight_rules(language)
+        _live_highlighters.add(self)
+    
+    def highlightBlock(self, text):
+        # One pass per line; multi-line spans carry over via the block state
+        rules = self.rules
+        tokens, state = rules.grammar.tokenize(text, max(self.previousBlockState(), 0))
+        self.setCurrentBlockState(state)
 
-        keyword_format = QTextCharFormat()
-        keyword_format.setForeground(QColor("#ff7b72"))
-        keyword_format.setFontWeight(QFont.Bold)
+        if not tokens:
+            return
 
-        if language == "python":
-            keywords = ["def", "class", "import", "from", "return", "if", "else", "elif", "for", "while", "in", "None", "True", "False"]
-            for word in keywords:
-                self.rules.append((QRegularExpression(rf"\b{word}\b"), keyword_format))
+        formats = rules.formats
+        offsets = _utf16_offsets(text)
+        for start, length, kind in tokens:
+            if offsets is not None:
+                start, length = offsets[start], offsets[start + length] - offsets[start]
+            self.setFormat(start, length, formats[kind])
 
-        string_format = QTextCharFormat()
-        string_format.setForeground(QColor("#a5d6ff"))
-        self.rules.append((QRegularExpression(r'".*?"|\'.*?\''), string_format))
 
-        comment_format = QTextCharFormat()
-        comment_format.setForeground(QColor("#8b949e"))
-        self.rules.append((QRegularExpression(r"#.*"), comment_format))
-    
-    def highlightBlock(self, text):
-        for pattern, fmt in self.rules:
-            it = pattern.globalMatch(text)
-            while it.hasNext():
-                match = it.next()
-                self.setFormat(match.capturedStart(), match.capturedLength(), fmt)
\ No newline at end of file
+def _utf16_offsets(text: str):
+    """
+    Qt positions are UTF-16 code units. Returns a str-index -> UTF-16 map,
+    or None when the two agree (no characters outside the BMP).
+    """
+    if text.isascii() or all(ord(ch) <= 0xFFFF for ch in text):
+        return None
+
+    offsets = [0]
+    pos = 0
+    for ch in text:
+        pos += 2 if ord(ch) > 0xFFFF else 1
+        offsets.append(pos)
+    return offsets
@@ -0,0 +1,150 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6.QtCore import QObject, QTimer, Signal, Slot
+
+from .blocks.parser import BlockParser, ParseCancelled
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def parse_executor() -> ThreadPoolExecutor:
+    """
+    Shared worker pool for background parsing (created on first use).
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=2, thread_name_prefix="ChatBubbleParse"
+            )
+    return _executor
+
+
+def parse_async(text: str, parser: BlockParser | None = None, cancel=None):
+    """
+    Parses on a worker thread. Returns a Future of BlockNode descriptors.
+    """
+    parser = parser or BlockParser()
+    return parse_executor().submit(parser.parse, text, cancel)
+
+
+class _ParseJobs:
+    """
+    Futures of one loader, in submission order, plus their cancel event.
+    Pure Python on purpose: cancel() is also called from QObject.destroyed.
+    """
+    __slots__ = ("event", "futures", "__weakref__")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.futures = deque()
+
+    def cancel(self, *_):
+        self.event.set()
+        for future in self.futures:
+            future.cancel()
+        self.futures.clear()
+        self.event = threading.Event()
+
+
+class _Relay(QObject):
+    """
+    Emitted from worker threads; delivered queued to the GUI thread.
+    """
+    parsed = Signal()
+
+
+class AsyncBlockLoader(QObject):
+    """
+    Parses text off the GUI thread and renders the resulting blocks on the
+    GUI thread in time-sliced batches. Pending work is cancelled when the
+    owning widget is destroyed.
+
+    A text whose parse raises is skipped; failed is emitted with the
+    exception and the texts loaded after it still render.
+    """
+    finished = Signal()
+    failed = Signal(object)     # exception raised by the parser
+
+    SLICE_MS = 8
+
+    def __init__(self, renderer, parser: BlockParser | None = None, parent=None):
+        super().__init__(parent)
+        self.renderer = renderer
+        self.parser = parser or BlockParser()
+
+        self._jobs = _ParseJobs()
+        self._nodes = deque()       # parsed, waiting to be rendered
+
+        self._relay = _Relay()
+        self._relay.parsed.connect(self._on_parsed)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._render_slice)
+
+        if parent is not None:
+            parent.destroyed.connect(self._jobs.cancel)
+
+    def load(self, text: str):
+        """
+        Queues text for parsing. Results render in the order loaded.
+        """
+        future = parse_async(text, self.parser, self._jobs.event)
+        self._jobs.futures.append(future)
+
+        relay = self._relay
+        def done(f):
+            if f.cancelled():
+                return
+            try:
+                relay.parsed.emit()
+            except RuntimeError:
+                pass  # loader already deleted
+        future.add_done_callback(done)
+
+    def is_busy(self) -> bool:
+        return bool(self._jobs.futures or self._nodes)
+
+    def cancel(self):
+        self._jobs.cancel()
+        self._nodes.clear()
+        self._timer.stop()
+
+    @Slot()
+    def _on_parsed(self):
+        # Keep message order: only take finished futures from the front
+        futures = self._jobs.futures
+        while futures and futures[0].done():
+            future = futures.popleft()
+            if future.cancelled():
+                continue
+            error = future.exception()
+            if error is None:
+                self._nodes.extend(future.result())
+            elif not isinstance(error, ParseCancelled):
+                print(f"[WARNING] ChatBubble parse failed: {error!r}")
+                self.failed.emit(error)
+
+        if self._nodes and not self._timer.isActive():
+            self._timer.start()
+        elif not self.is_busy():
+            self.finished.emit()
+
+    def _render_slice(self):
+        deadline = time.perf_counter() + self.SLICE_MS / 1000
+        nodes = self._nodes
+
+        while nodes:
+            self.renderer.add_block(nodes.popleft())
+            if time.perf_counter() >= deadline:
+                return
+
+        self._timer.stop()
+        if not self._jobs.futures:
+            self.finished.emit()
@@ -0,0 +1,676 @@
+from PySide6.QtWidgets import QApplication, QFrame, QMenu, QSizePolicy, QWidget
+from PySide6.QtCore import QEvent, QPointF, QRectF, Qt, QUrl, Signal
+from PySide6.QtGui import (
+    QDesktopServices, QFont, QFontMetrics, QKeySequence, QPainter,
+    QPalette, QPen, QTextCharFormat, QTextLayout, QTextLine, QTextOption,
+)
+
+from .blocks.base import Block
+from .blocks.nodes import BlockNode, ParagraphNode
+from .blocks.parser import ADD, OPEN, APPEND, CLOSE, RETRACT
+from .renderer import BLOCK_FACTORIES
+
+
+# QTextLayout only breaks on the Unicode line separator; same length as "\n",
+# so offsets into the laid-out text and the original text stay equal.
+LINE_SEPARATOR = "\u2028"
+
+# Colors come from the widget palette at paint time: links use Link,
+# buttons Button / ButtonText, borders and dividers Mid, a hovered button
+# border Link and a pressed button Window.
+
+# level -> (size relative to the body font, weight); with the 14px theme
+# font these are HeadingBlock's 22 / 18 / 15 / 13px
+HEADING_SCALES = {
+    1: (22 / 14, QFont.Bold),
+    2: (18 / 14, QFont.DemiBold),
+    3: (15 / 14, QFont.DemiBold),
+    4: (13 / 14, QFont.Medium),
+}
+
+
+# -----------------------------
+# ITEMS
+# -----------------------------
+class _TextItem:
+    """
+    Text, paragraph, heading and link nodes as one QTextLayout.
+    Spans are (text, url) like ParagraphNode.
+    """
+    __slots__ = (
+        "spans", "font", "margin_top", "links", "layout", "height",
+        "_parts", "_length", "_width",
+    )
+
+    selectable = True
+
+    def __init__(self, spans, font: QFont, margin_top: int = 0):
+        self.spans = []
+        self.font = font
+        self.margin_top = margin_top
+        self._rebuild(spans)
+
+    @property
+    def text(self) -> str:
+        # Appended parts are joined on demand (once per layout), not per append
+        if len(self._parts) > 1:
+            self._parts[:] = ["".join(self._parts)]
+        return self._parts[0] if self._parts else ""
+
+    def append(self, text):
+        span = (text, None) if isinstance(text, str) else tuple(text)
+        self._add(span)
+        self.layout = None
+        self._width = None
+
+    def retract_line(self) -> bool:
+        """
+        Drops the last line; True if nothing is left.
+        """
+        spans = self.spans
+        while spans and spans[-1] != ParagraphNode.LINE_BREAK:
+            spans.pop()
+        if spans:
+            spans.pop()
+        self._rebuild(spans)
+        return not spans
+
+    def finalize(self):
+        pass
+
+    def plain_text(self, start: int = 0, end: int | None = None) -> str:
+        return self.text[start:end]
+
+    def _add(self, span: tuple):
+        text, url = span
+        self.spans.append(span)
+        self._parts.append(text)
+        if url is not None:
+            self.links.append((self._length, self._length + len(text), url))
+        self._length += len(text)
+
+    def _rebuild(self, spans):
+        spans = list(spans)
+        self.spans = []
+        self._parts = []
+        self._length = 0
+        self.links = []     # (start, end, url)
+        for span in spans:
+            self._add(tuple(span))
+        self.layout = None
+        self._width = None
+        self.height = 0
+
+    def measure(self, width: int) -> int:
+        if self._width == width and self.layout is not None:
+            return self.height
+
+        layout = QTextLayout(self.text.replace("\n", LINE_SEPARATOR), self.font)
+        option = QTextOption()
+        option.setWrapMode(QTextOption.WrapAtWordBoundaryOrAnywhere)
+        layout.setTextOption(option)
+
+        y = float(self.margin_top)
+        layout.beginLayout()
+        while True:
+            line = layout.createLine()
+            if not line.isValid():
+                break
+            line.setLineWidth(max(width, 1))
+            line.setPosition(QPointF(0, y))
+            y += line.height()
+        layout.endLayout()
+
+        self.layout = layout
+        self._width = width
+        self.height = int(y + 0.999)
+        return self.height
+
+    def cursor_at(self, pos: QPointF) -> int:
+        """
+        Character offset nearest to pos (item coordinates).
+        """
+        layout = self.layout
+        if layout is None or layout.lineCount() == 0:
+            return 0
+        for i in range(layout.lineCount()):
+            line = layout.lineAt(i)
+            if pos.y() < line.y() + line.height() or i == layout.lineCount() - 1:
+                return line.xToCursor(pos.x())
+        return len(self.text)
+
+    def link_at(self, pos: QPointF):
+        if not self.links or self.layout is None:
+            return None
+        for i in range(self.layout.lineCount()):
+            line = self.layout.lineAt(i)
+            if not line.rect().contains(pos):
+                continue
+            if pos.x() > line.naturalTextWidth():
+                return None
+            offset = line.xToCursor(pos.x(), QTextLine.CursorOnCharacter)
+            for start, end, url in self.links:
+                if start <= offset < end:
+                    return url
+        return None
+
+    def paint(self, painter: QPainter, origin: QPointF, selection, palette: QPalette, hover_url):
+        formats = []
+        # Link colors are applied here, so a palette switch needs no relayout
+        for start, end, _ in self.links:
+            r = QTextLayout.FormatRange()
+            r.start, r.length = start, end - start
+            r.format = QTextCharFormat()
+            r.format.setForeground(palette.color(QPalette.Link))
+            formats.append(r)
+        if selection is not None:
+            start, end = selection
+            r = QTextLayout.FormatRange()
+            r.start, r.length = start, end - start
+            r.format = QTextCharFormat()
+            r.format.setBackground(palette.color(QPalette.Highlight))
+            r.format.setForeground(palette.color(QPalette.HighlightedText))
+            formats.append(r)
+        if hover_url is not None:
+            for start, end, url in self.links:
+                if url == hover_url:
+                    r = QTextLayout.FormatRange()
+                    r.start, r.length = start, end - start
+                    r.format = QTextCharFormat()
+                    r.format.setFontUnderline(True)
+                    formats.append(r)
+
+        painter.setPen(palette.color(QPalette.WindowText))
+        self.layout.draw(painter, origin, formats)
+
+
+class _ButtonItem:
+    __slots__ = ("label", "payload", "font", "rect", "height")
+
+    selectable = False
+    PADDING = (14, 6)
+    MARGIN = 4
+
+    def __init__(self, label: str, payload: dict, font: QFont):
+        self.label = label
+        self.payload = payload
+        self.font = QFont(font)
+        self.font.setWeight(QFont.DemiBold)
+
+        metrics = QFontMetrics(self.font)
+        px, py = self.PADDING
+        self.rect = QRectF(
+            0, self.MARGIN,
+            metrics.horizontalAdvance(label) + 2 * px,
+            metrics.height() + 2 * py,
+        )
+        self.height = int(self.rect.height()) + 2 * self.MARGIN
+
+    def measure(self, width: int) -> int:
+        return self.height
+
+    def plain_text(self, start: int = 0, end: int | None = None) -> str:
+        return ""
+
+    def hit(self, pos: QPointF) -> bool:
+        return self.rect.contains(pos)
+
+    def paint(self, painter: QPainter, origin: QPointF, palette: QPalette, hovered: bool, pressed: bool):
+        rect = self.rect.translated(origin)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(QPen(palette.color(QPalette.Link if hovered else QPalette.Mid), 1))
+        painter.setBrush(palette.color(QPalette.Window if pressed else QPalette.Button))
+        painter.drawRoundedRect(rect.adjusted(0.5, 0.5, -0.5, -0.5), 6, 6)
+
+        painter.setFont(self.font)
+        painter.setPen(palette.color(QPalette.ButtonText))
+        painter.drawText(rect, Qt.AlignCenter, self.label)
+
+
+class _DividerItem:
+    __slots__ = ()
+
+    selectable = False
+    MARGIN = 8
+    height = 2 * MARGIN + 1
+
+    def measure(self, width: int) -> int:
+        return self.height
+
+    def plain_text(self, start: int = 0, end: int | None = None) -> str:
+        return ""
+
+    def paint(self, painter: QPainter, origin: QPointF, palette: QPalette, width: int):
+        painter.fillRect(
+            QRectF(origin.x(), origin.y() + self.MARGIN, width, 1),
+            palette.color(QPalette.Mid),
+        )
+
+
+class _WidgetItem:
+    """
+    Compatibility path: any Block widget (code blocks, custom kinds and
+    blocks added directly) is embedded as a child widget.
+    """
+    __slots__ = ("widget",)
+
+    selectable = False
+
+    def __init__(self, widget: QWidget):
+        self.widget = widget
+
+    @property
+    def height(self) -> int:
+        return self.widget.height()
+
+    def append(self, text):
+        self.widget.append(text)
+
+    def retract_line(self) -> bool:
+        return self.widget.retract_line()
+
+    def finalize(self):
+        self.widget.finalize()
+
+    def measure(self, width: int) -> int:
+        if self.widget.hasHeightForWidth():
+            return self.widget.heightForWidth(width)
+        return self.widget.sizeHint().height()
+
+    def plain_text(self, start: int = 0, end: int | None = None) -> str:
+        return getattr(self.widget, "code", "")
+
+
+
+# -----------------------------
+# BODY
+# -----------------------------
+class PaintedBody(QFrame):
+    """
+    Lightweight bubble body: text, headings, links, buttons and dividers
+    are laid out with QTextLayout and drawn by this one widget, with its
+    own hit-testing for links, buttons and text selection.
+
+    Implements the BlockRenderer interface (add_block / apply / clear), so
+    ChatBubble, StreamBatcher and AsyncBlockLoader work with either.
+    Other nodes and Block widgets are embedded as child widgets.
+    """
+    SPACING = 8
+
+    linkActivated = Signal(str)
+    buttonClicked = Signal(dict)    # emits payload
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName("ChatBubbleBody")
+        self.setFrameShape(QFrame.NoFrame)
+        self.setMouseTracking(True)
+        self.setFocusPolicy(Qt.ClickFocus)
+        self.setContextMenuPolicy(Qt.DefaultContextMenu)
+
+        policy = QSizePolicy(QSizePolicy.Preferred, QSizePolicy.Preferred)
+        policy.setHeightForWidth(True)
+        self.setSizePolicy(policy)
+
+        self.open_external_links = True
+
+        self._items = []
+        self._tops = []         # item top offsets for _laid_out_width
+        self._laid_out_width = None
+        self._height = 0
+        self._open = {}         # id(node) -> item while streaming
+
+        self._hover = None      # (index, url | None) under the mouse
+        self._pressed = None    # index of a pressed button
+        self._anchor = None     # selection (index, offset)
+        self._focus = None
+
+    # ---------------------------------
+    # RENDERER INTERFACE
+    # ---------------------------------
+    def build(self, node: BlockNode):
+        """
+        Creates the painted item for a node (or a widget item as fallback).
+        """
+        # Pick up the stylesheet font before the first show
+        self.ensurePolished()
+        font = self.font()
+        kind = node.kind
+
+        if kind == "text":
+            return _TextItem([(node.text, None)], font)
+        if kind == "paragraph":
+            return _TextItem(node.spans, font)
+        if kind == "link":
+            return _TextItem([(node.text, node.url)], font)
+        if kind == "heading":
+            scale, weight = HEADING_SCALES[max(1, min(node.level, 4))]
+            heading = QFont(font)
+            if font.pixelSize() > 0:
+                heading.setPixelSize(round(font.pixelSize() * scale))
+            else:
+                heading.setPointSizeF(font.pointSizeF() * scale)
+            heading.setWeight(weight)
+            return _TextItem([(node.text, None)], heading, margin_top=8)
+        if kind == "button":
+            return _ButtonItem(node.label, node.payload, font)
+        if kind == "divider":
+            return _DividerItem()
+        return self._embed(BLOCK_FACTORIES[kind](node))
+
+    def add_block(self, block):
+        """
+        Accepts a BlockNode or a Block widget; returns the item.
+        """
+        if isinstance(block, BlockNode):
+            item = self.build(block)
+        elif isinstance(block, Block):
+            item = self._embed(block)
+        else:
+            item = block
+        self._items.append(item)
+        self._invalidate()
+        return item
+
+    def apply(self, events):
+        """
+        Applies StreamParser events.
+        """
+        for op, node, text in events:
+            if op == ADD:
+                self.add_block(node)
+            elif op == OPEN:
+                self._open[id(node)] = self.add_block(node.blank())
+            elif op == APPEND:
+                item = self._open[id(node)]
+                item.append(text)
+                if not isinstance(item, _WidgetItem):
+                    self._invalidate()
+            elif op == CLOSE:
+                self._open.pop(id(node)).finalize()
+            elif op == RETRACT:
+                self._retract(self._open[id(node)], node)
+
+    def _retract(self, item, node: BlockNode):
+        index = self._items.index(item)
+        # Selection / hover offsets may point into the withdrawn text
+        if self._anchor is not None and index in (self._anchor[0], self._focus[0]):
+            self._anchor = self._focus = None
+        if self._hover is not None and self._hover[0] == index:
+            self._hover = None
+
+        if item.retract_line():
+            del self._open[id(node)]
+            del self._items[index]
+            if isinstance(item, _WidgetItem):
+                item.widget.deleteLater()
+        self._invalidate()
+
+    def clear(self):
+        for item in self._items:
+            if isinstance(item, _WidgetItem):
+                item.widget.deleteLater()
+        self._items = []
+        self._open.clear()
+        self._hover = self._pressed = self._anchor = self._focus = None
+        self._invalidate()
+
+    def _embed(self, widget: QWidget) -> _WidgetItem:
+        widget.setParent(self)
+        widget.show()
+        return _WidgetItem(widget)
+
+    # ---------------------------------
+    # LAYOUT
+    # ---------------------------------
+    def _invalidate(self):
+        self._laid_out_width = None
+        self.updateGeometry()
+        self.update()
+
+    def _content_width(self, width: int) -> int:
+        margins = self.contentsMargins()
+        return max(width - margins.left() - margins.right(), 1)
+
+    def _layout(self, width: int) -> int:
+        """
+        Lays out items for a content width; returns the content height.
+        """
+        if width == self._laid_out_width:
+            return self._height
+
+        y = 0
+        tops = []
+        for item in self._items:
+            if tops:
+                y += self.SPACING
+            tops.append(y)
+            y += item.measure(width)
+
+        self._tops = tops
+        self._height = y
+        self._laid_out_width = width
+        return y
+
+    def _place_widgets(self):
+        rect = self.contentsRect()
+        self._layout(rect.width())
+        for item, top in zip(self._items, self._tops):
+            if isinstance(item, _WidgetItem):
+                item.widget.setGeometry(
+                    rect.left(), rect.top() + top, rect.width(), item.measure(rect.width())
+                )
+
+    def hasHeightForWidth(self) -> bool:
+        return True
+
+    def heightForWidth(self, width: int) -> int:
+        margins = self.contentsMargins()
+        return self._layout(self._content_width(width)) + margins.top() + margins.bottom()
+
+    def sizeHint(self):
+        size = super().sizeHint()
+        width = self.width() if self.width() > 0 else 400
+        size.setHeight(self.heightForWidth(width))
+        return size
+
+    def event(self, event):
+        # Embedded widgets post LayoutRequest when their size hint changes
+        if event.type() == QEvent.LayoutRequest:
+            self._invalidate()
+            self._place_widgets()
+        return super().event(event)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._place_widgets()
+
+    # ---------------------------------
+    # PAINTING
+    # ---------------------------------
+    def paintEvent(self, event):
+        super().paintEvent(event)   # stylesheet background
+
+        rect = self.contentsRect()
+        width = rect.width()
+        self._layout(width)
+        clip = event.rect()
+        selection = self._selection()
+        palette = self.palette()
+
+        painter = QPainter(self)
+        for index, (item, top) in enumerate(zip(self._items, self._tops)):
+            y = rect.top() + top
+            if y > clip.bottom() or y + item.height < clip.top():
+                continue
+            origin = QPointF(rect.left(), y)
+
+            if isinstance(item, _TextItem):
+                hover_url = self._hover[1] if self._hover and self._hover[0] == index else None
+                item.paint(painter, origin, self._item_selection(index, selection), palette, hover_url)
+            elif isinstance(item, _ButtonItem):
+                hovered = self._hover is not None and self._hover[0] == index
+                item.paint(painter, origin, palette, hovered, self._pressed == index)
+            elif isinstance(item, _DividerItem):
+                item.paint(painter, origin, palette, width)
+        painter.end()
+
+    # ---------------------------------
+    # HIT-TESTING
+    # ---------------------------------
+    def _item_at(self, pos) -> tuple:
+        """
+        (index, position in item coordinates) of the item under or nearest
+        above pos; (-1, None) when there are no items.
+        """
+        rect = self.contentsRect()
+        self._layout(rect.width())
+        if not self._items:
+            return -1, None
+
+        y = pos.y() - rect.top()
+        index = 0
+        for i, top in enumerate(self._tops):
+            if top > y:
+                break
+            index = i
+        local = QPointF(pos.x() - rect.left(), y - self._tops[index])
+        return index, local
+
+    def _hit(self, pos):
+        """
+        (index, url) for a link, (index, None) for a button, else None.
+        """
+        index, local = self._item_at(pos)
+        if index < 0:
+            return None
+        item = self._items[index]
+        if isinstance(item, _TextItem):
+            url = item.link_at(local)
+            return (index, url) if url is not None else None
+        if isinstance(item, _ButtonItem) and item.hit(local):
+            return index, None
+        return None
+
+    def _selection_point(self, pos):
+        index, local = self._item_at(pos)
+        if index < 0:
+            return None
+        item = self._items[index]
+        if not isinstance(item, _TextItem):
+            return index, 0
+        if local.y() > item.height:
+            return index, len(item.text)
+        return index, item.cursor_at(local)
+
+    def mousePressEvent(self, event):
+        if event.button() != Qt.LeftButton:
+            return super().mousePressEvent(event)
+
+        hit = self._hit(event.position())
+        if hit is not None and hit[1] is None:
+            self._pressed = hit[0]
+        else:
+            self._anchor = self._focus = self._selection_point(event.position())
+        self.update()
+
+    def mouseMoveEvent(self, event):
+        pos = event.position()
+        if event.buttons() & Qt.LeftButton and self._anchor is not None:
+            self._focus = self._selection_point(pos)
+            self.update()
+            return
+
+        hit = self._hit(pos)
+        if hit != self._hover:
+            self._hover = hit
+            self.setCursor(Qt.PointingHandCursor if hit else Qt.IBeamCursor)
+            self.update()
+
+    def mouseReleaseEvent(self, event):
+        if event.button() != Qt.LeftButton:
+            return super().mouseReleaseEvent(event)
+
+        hit = self._hit(event.position())
+        if self._pressed is not None:
+            pressed, self._pressed = self._pressed, None
+            if hit == (pressed, None):
+                self.buttonClicked.emit(self._items[pressed].payload)
+        elif hit is not None and self._anchor == self._focus:
+            self._activate_link(hit[1])
+        self.update()
+
+    def leaveEvent(self, event):
+        self._hover = None
+        self.update()
+        super().leaveEvent(event)
+
+    def _activate_link(self, url: str):
+        self.linkActivated.emit(url)
+        if self.open_external_links:
+            QDesktopServices.openUrl(QUrl(url))
+
+    # ---------------------------------
+    # SELECTION / COPY
+    # ---------------------------------
+    def _selection(self):
+        if self._anchor is None or self._focus is None or self._anchor == self._focus:
+            return None
+        return min(self._anchor, self._focus), max(self._anchor, self._focus)
+
+    def _item_selection(self, index: int, selection):
+        if selection is None:
+            return None
+        (first, start), (last, end) = selection
+        if not first <= index <= last:
+            return None
+        item = self._items[index]
+        start = start if index == first else 0
+        end = end if index == last else len(item.text)
+        return (start, end) if end > start else None
+
+    def selected_text(self) -> str:
+        selection = self._selection()
+        if selection is None:
+            return ""
+        (first, start), (last, end) = selection
+        parts = []
+        for index in range(first, last + 1):
+            item = self._items[index]
+            text = item.plain_text(
+                start if index == first and item.selectable else 0,
+                end if index == last and item.selectable else None,
+            )
+            if text:
+                parts.append(text)
+        return "\n".join(parts)
+
+    def plain_text(self) -> str:
+        return "\n".join(filter(None, (item.plain_text() for item in self._items)))
+
+    def copy(self, text: str | None = None):
+        QApplication.clipboard().setText(self.selected_text() if text is None else text)
+
+    def keyPressEvent(self, event):
+        if event.matches(QKeySequence.Copy):
+            self.copy()
+        elif event.matches(QKeySequence.SelectAll):
+            if self._items:
+                last = len(self._items) - 1
+                self._anchor = (0, 0)
+                self._focus = (last, len(getattr(self._items[last], "text", "")))
+                self.update()
+        else:
+            super().keyPressEvent(event)
+
+    def contextMenuEvent(self, event):
+        menu = QMenu(self)
+        selected = self.selected_text()
+        if selected:
+            menu.addAction("Copy", lambda: self.copy(selected))
+        hit = self._hit(event.pos())
+        if hit is not None and hit[1] is not None:
+            url = hit[1]
+            menu.addAction("Copy Link", lambda: self.copy(url))
+        menu.addAction("Copy All", lambda: self.copy(self.plain_text()))
+        menu.exec(event.globalPos())
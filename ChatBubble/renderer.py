@@ -1,11 +1,185 @@
+from importlib import import_module
+
 from PySide6.QtWidgets import QVBoxLayout
+from PySide6.QtCore import QTimer
+
+from .blocks.nodes import BlockNode
+from .blocks.parser import ADD, OPEN, APPEND, CLOSE, RETRACT
+
+
+def _lazy_block(path: str, build):
+    """
+    Factory that imports the Block class ("module:Class", relative to this
+    package) on first use, so unused blocks (and their dependencies, like
+    the code highlighter) are never imported.
+    """
+    module, name = path.split(":")
+    cls = None
+
+    def factory(node):
+        nonlocal cls
+        if cls is None:
+            cls = getattr(import_module(module, __package__), name)
+        return build(cls, node)
+
+    return factory
+
+
+# node.kind -> callable(node) -> Block
+BLOCK_FACTORIES = {
+    "text": _lazy_block(".blocks.text:TextBlock", lambda cls, node: cls(node.text)),
+    "paragraph": _lazy_block(".blocks.text:ParagraphBlock", lambda cls, node: cls(node.spans)),
+    "code": _lazy_block(".blocks.code:CodeBlock", lambda cls, node: cls(node.code, node.language)),
+    "heading": _lazy_block(".blocks.heading:HeadingBlock", lambda cls, node: cls(node.text, node.level)),
+    "link": _lazy_block(".blocks.link:LinkBlock", lambda cls, node: cls(node.text, node.url)),
+    "button": _lazy_block(".blocks.button:ButtonBlock", lambda cls, node: cls(node.label, node.payload)),
+    "divider": _lazy_block(".blocks.divider:DividerBlock", lambda cls, node: cls()),
+}
+
+
+def register_block(kind: str, factory):
+    """
+    Maps a node kind to a widget factory (for custom blocks).
+    """
+    BLOCK_FACTORIES[kind] = factory
 
 
 class BlockRenderer:
-    def __init__(self, container):
+    def __init__(self, container, on_block=None):
+        """
+        :param on_block: Called with every block widget added (e.g. to
+                         connect its signals).
+        """
         self.layout = QVBoxLayout(container)
         self.layout.setSpacing(8)
         self.layout.setContentsMargins(0, 0, 0, 0)
+        self.on_block = on_block
+        self._open = {}     # id(node) -> (node, Block) while streaming
+
+    def build(self, node: BlockNode):
+        """
+        Creates the widget for a block descriptor.
+        """
+        return BLOCK_FACTORIES[node.kind](node)
     
     def add_block(self, block):
-        self.layout.addWidget(block)
\ No newline at end of file
+        """
+        Accepts a Block widget or a BlockNode descriptor.
+        """
+        if isinstance(block, BlockNode):
+            block = self.build(block)
+        self.layout.addWidget(block)
+        if self.on_block is not None:
+            self.on_block(block)
+        return block
+
+    def apply(self, events):
+        """
+        Applies StreamParser events to the widgets.
+        """
+        for op, node, text in events:
+            if op == ADD:
+                self.add_block(node)
+
+            elif op == OPEN:
+                # Streamed content arrives through APPEND events
+                block = self.add_block(self.build(node.blank()))
+                self._open[id(node)] = (node, block)
+
+            elif op == APPEND:
+                self._open[id(node)][1].append(text)
+
+            elif op == CLOSE:
+                self._open.pop(id(node))[1].finalize()
+
+            elif op == RETRACT:
+                block = self._open[id(node)][1]
+                if block.retract_line():
+                    del self._open[id(node)]
+                    self.layout.removeWidget(block)
+                    block.deleteLater()
+
+    def clear(self):
+        """
+        Removes and deletes every rendered block.
+        """
+        while self.layout.count():
+            item = self.layout.takeAt(0)
+            widget = item.widget()
+            if widget is not None:
+                widget.deleteLater()
+        self._open.clear()
+
+
+class StreamBatcher:
+    """
+    Buffers streamed text between ChatBubble and BlockRenderer.
+
+    Chunks are joined and parsed at most once per interval (one frame by
+    default), so a burst of tokens costs a single append / relayout.
+    """
+    FRAME_MS = 16
+
+    def __init__(self, renderer: BlockRenderer, stream, interval_ms: int = FRAME_MS, parent=None):
+        self.renderer = renderer
+        self.stream = stream
+        self._chunks = []
+
+        self._timer = QTimer(parent)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.flush)
+
+        # Counters
+        self.chunks_received = 0
+        self.chunks_coalesced = 0
+        self.flushes = 0
+
+    def set_interval(self, interval_ms: int):
+        """
+        0 flushes on the next event loop pass.
+        """
+        self._timer.setInterval(interval_ms)
+
+    def push(self, text: str):
+        if not text:
+            return
+        self._chunks.append(text)
+        self.chunks_received += 1
+
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self):
+        self._timer.stop()
+        if not self._chunks:
+            return
+
+        text = "".join(self._chunks)
+        self.chunks_coalesced += len(self._chunks) - 1
+        self.flushes += 1
+        self._chunks.clear()
+
+        self.renderer.apply(self.stream.feed(text))
+
+    def reset(self):
+        """
+        Drops pending text without parsing it.
+        """
+        self._timer.stop()
+        self._chunks.clear()
+
+    def close(self):
+        """
+        Flushes pending text and finalizes the stream.
+        """
+        self.flush()
+        self.renderer.apply(self.stream.close())
+
+    def stats(self) -> dict:
+        return {
+            "chunks_received": self.chunks_received,
+            "chunks_coalesced": self.chunks_coalesced,
+            "flushes": self.flushes,
+            "pending": len(self._chunks),
+        }
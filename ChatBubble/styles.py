@@ -0,0 +1,54 @@
+"""
+ChatBubble stylesheets (paths relative to the source root).
+
+components.qss holds sizes, spacing and fonts; the colors come from
+dark.qss / light.qss, or from the QPalette through palette.qss.
+theme.qss is components.qss + dark.qss in one file for
+load_stylesheet(app, "ChatBubble/theme.qss").
+"""
+import sys
+
+COMPONENT_QSS = "ChatBubble/components.qss"
+
+COLOR_QSS = {
+    "dark": "ChatBubble/dark.qss",
+    "light": "ChatBubble/light.qss",
+}
+
+PALETTE_QSS = "ChatBubble/palette.qss"
+
+COMBINED_QSS = "ChatBubble/theme.qss"
+
+# Theme value last applied (the highlighter starts from it)
+current_theme = "dark"
+
+
+def _on_theme(theme: str):
+    """
+    Syntax colors aren't QSS; switch them with the theme. The highlighter
+    is left unimported until a code block needs it.
+    """
+    global current_theme
+    if theme == current_theme:
+        return
+    current_theme = theme
+
+    highlighter = sys.modules.get(f"{__package__}.highlighter")
+    if highlighter is not None:
+        highlighter.set_highlight_theme(theme)
+
+
+def register_theme_layers():
+    """
+    Adds the ChatBubble sheets to utils.theme's apply_theme /
+    apply_palette_theme.
+    """
+    from utils.theme import StyleLayer, register_style_layer
+
+    register_style_layer(StyleLayer(
+        "ChatBubble",
+        component=[COMPONENT_QSS],
+        colors=COLOR_QSS,
+        palette=PALETTE_QSS,
+        on_theme=_on_theme,
+    ))
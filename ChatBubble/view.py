@@ -0,0 +1,352 @@
+from bisect import bisect_right
+from itertools import accumulate
+
+from PySide6.QtWidgets import QAbstractScrollArea
+from PySide6.QtCore import QEvent, QObject, Qt, QTimer, Signal
+
+from .blocks.cache import PARSE_CACHE
+from .blocks.parser import BlockParser
+from .bubble import ChatBubble
+
+
+class ChatMessage:
+    __slots__ = ("role", "_chunks", "blocks", "streaming")
+
+    def __init__(self, role: str, content: str = ""):
+        self.role = role
+        self._chunks = [content] if content else []
+        self.blocks = None      # parsed BlockNodes, filled on demand
+        self.streaming = False  # text is still being appended
+
+    @property
+    def content(self) -> str:
+        # Streamed chunks are joined on demand, not on every token
+        if len(self._chunks) > 1:
+            self._chunks[:] = ["".join(self._chunks)]
+        return self._chunks[0] if self._chunks else ""
+
+    @content.setter
+    def content(self, text: str):
+        self._chunks = [text] if text else []
+        self.blocks = None
+
+    def append(self, text: str):
+        self._chunks.append(text)
+        self.blocks = None
+
+
+class ChatModel(QObject):
+    """
+    List of messages and their parsed block descriptors.
+    Views only hold widgets for what they show.
+    """
+    messagesInserted = Signal(int, int)     # first, last
+    messageAppended = Signal(int, str)      # index, streamed text
+    messageFinished = Signal(int)           # index, stream complete
+    modelReset = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._messages = []
+
+    def __len__(self):
+        return len(self._messages)
+
+    def message(self, index: int) -> ChatMessage:
+        return self._messages[index]
+
+    def blocks(self, index: int, parser: BlockParser) -> list:
+        """
+        Parsed block descriptors for a message, cached until it changes.
+        """
+        message = self._messages[index]
+        if message.blocks is None:
+            message.blocks = parser.parse(message.content)
+        return message.blocks
+
+    def append_message(self, role: str, content: str = "") -> int:
+        self._messages.append(ChatMessage(role, content))
+        index = len(self._messages) - 1
+        self.messagesInserted.emit(index, index)
+        return index
+
+    def extend(self, messages):
+        """
+        Adds many (role, content) pairs with a single notification.
+        """
+        first = len(self._messages)
+        self._messages.extend(ChatMessage(role, content) for role, content in messages)
+        if len(self._messages) > first:
+            self.messagesInserted.emit(first, len(self._messages) - 1)
+
+    def append_text(self, index: int, text: str):
+        """
+        Streams text into an existing message.
+        Call finish_stream() once the message is complete.
+        """
+        message = self._messages[index]
+        message.append(text)
+        message.streaming = True
+        self.messageAppended.emit(index, text)
+
+    def finish_stream(self, index: int):
+        """
+        Marks a streamed message as complete, so its last held-back line
+        (e.g. a final heading or a line ending in "[") is rendered.
+        """
+        message = self._messages[index]
+        message.streaming = False
+        message.blocks = None
+        self.messageFinished.emit(index)
+
+    def clear(self):
+        self._messages = []
+        self.modelReset.emit()
+
+
+class ChatView(QAbstractScrollArea):
+    """
+    Virtualized transcript.
+
+    Only bubbles within OVERSCAN pixels of the viewport exist as widgets;
+    the rest are represented by a cached height. Bubbles that scroll away
+    are cleared and kept in a per-role pool for reuse.
+
+    Bubbles use the single-widget PaintedBody unless painted=False.
+    Their buttonClicked / linkActivated are forwarded while they are live.
+    """
+    buttonClicked = Signal(int, dict)   # message index, payload
+    linkActivated = Signal(str)
+
+    OVERSCAN = 600
+    ESTIMATED_HEIGHT = 120
+    SPACING = 14
+    POOL_SIZE = 24
+
+    def __init__(self, model: ChatModel | None = None, parent=None, painted: bool = True):
+        super().__init__(parent)
+        self.painted = painted
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.verticalScrollBar().setSingleStep(40)
+
+        self.parser = BlockParser(cache=PARSE_CACHE)
+        self.model = model if model is not None else ChatModel(self)
+
+        self._heights = []      # last measured (or estimated) height per message
+        self._tops = None       # cumulative tops, rebuilt lazily
+        self._live = {}         # index -> ChatBubble
+        self._pool = {}         # role -> [ChatBubble]
+        self._stick_to_bottom = True
+
+        # Relayout at most once per event loop pass
+        self._relayout = QTimer(self)
+        self._relayout.setSingleShot(True)
+        self._relayout.setInterval(0)
+        self._relayout.timeout.connect(self._layout_visible)
+
+        # Child bubbles post LayoutRequest here when their size hint changes
+        self.viewport().installEventFilter(self)
+
+        self.model.messagesInserted.connect(self._on_inserted)
+        self.model.messageAppended.connect(self._on_appended)
+        self.model.messageFinished.connect(self._on_finished)
+        self.model.modelReset.connect(self._on_reset)
+        self._on_inserted(0, len(self.model) - 1)
+
+    # ---------------------------------
+    # MODEL EVENTS
+    # ---------------------------------
+    def _on_inserted(self, first: int, last: int):
+        count = last - first + 1
+        if count <= 0:
+            return
+        self._heights[first:first] = [self.ESTIMATED_HEIGHT] * count
+
+        # Indexes after the insertion point shift
+        if first < len(self._heights) - count:
+            self._live = {
+                (i + count if i >= first else i): bubble
+                for i, bubble in self._live.items()
+            }
+        self._tops = None
+        self._relayout.start()
+
+    def _on_appended(self, index: int, text: str):
+        bubble = self._live.get(index)
+        if bubble is not None:
+            bubble.append_stream(text)
+            self._relayout.start()
+
+    def _on_finished(self, index: int):
+        # Bubbles that aren't materialized re-parse the complete content
+        bubble = self._live.get(index)
+        if bubble is not None:
+            bubble.finish_stream()
+            self._relayout.start()
+
+    def _on_reset(self):
+        for index in list(self._live):
+            self._release(index)
+        self._heights = []
+        self._tops = None
+        self._stick_to_bottom = True
+        self._on_inserted(0, len(self.model) - 1)
+        self._relayout.start()
+
+    # ---------------------------------
+    # QT OVERRIDES
+    # ---------------------------------
+    def eventFilter(self, obj, event):
+        if obj is self.viewport() and event.type() == QEvent.LayoutRequest:
+            self._relayout.start()
+        return super().eventFilter(obj, event)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._layout_visible()
+
+    def scrollContentsBy(self, dx, dy):
+        bar = self.verticalScrollBar()
+        self._stick_to_bottom = bar.value() >= bar.maximum()
+        self._layout_visible()
+
+    # ---------------------------------
+    # VIRTUALIZATION
+    # ---------------------------------
+    def _top_offsets(self) -> list:
+        if self._tops is None:
+            step = self.SPACING
+            self._tops = [0, *accumulate(h + step for h in self._heights)]
+        return self._tops
+
+    def _layout_visible(self):
+        self._relayout.stop()
+        # Measuring can move the scroll position (anchoring / stick to bottom),
+        # which may bring other messages into range; settle in a few passes.
+        for _ in range(3):
+            if not self._layout_pass():
+                break
+
+    def _layout_pass(self) -> bool:
+        """
+        Materializes, measures and positions the visible range.
+        Returns True if the scroll position had to move.
+        """
+        count = len(self._heights)
+        viewport = self.viewport()
+        width = viewport.width()
+        view_h = viewport.height()
+        bar = self.verticalScrollBar()
+
+        tops = self._top_offsets()
+        top = bar.value()
+
+        # Anchor the first visible message so measuring doesn't jump the view
+        anchor = max(bisect_right(tops, top) - 1, 0)
+        anchor_delta = top - tops[anchor] if count else 0
+
+        # Walk down from the first message in range, measuring as we go,
+        # so estimated heights never materialize more than needed.
+        first = max(bisect_right(tops, top - self.OVERSCAN) - 1, 0)
+        limit = top + view_h + self.OVERSCAN
+        y = tops[first] if count else 0
+        index = first
+        changed = False
+
+        while index < count and y < limit:
+            bubble = self._live.get(index)
+            if bubble is None:
+                bubble = self._materialize(index)
+            # Layouts cache heightForWidth, so re-measuring is cheap
+            height = self._measure(bubble, width)
+            if height != self._heights[index]:
+                self._heights[index] = height
+                changed = True
+            y += height + self.SPACING
+            index += 1
+
+        visible = range(first, index)
+        for stale in [i for i in self._live if i not in visible]:
+            self._release(stale)
+
+        if changed:
+            self._tops = None
+            tops = self._top_offsets()
+
+        total = tops[-1] - self.SPACING if count else 0
+        bar.blockSignals(True)
+        bar.setPageStep(view_h)
+        bar.setRange(0, max(0, total - view_h))
+        if self._stick_to_bottom:
+            bar.setValue(bar.maximum())
+        elif changed and count:
+            bar.setValue(tops[anchor] + anchor_delta)
+        bar.blockSignals(False)
+
+        moved = bar.value() != top
+        top = bar.value()
+        for index, bubble in self._live.items():
+            bubble.setGeometry(0, tops[index] - top, width, self._heights[index])
+        return moved
+
+    def _measure(self, bubble: ChatBubble, width: int) -> int:
+        height = bubble.heightForWidth(width)
+        if height < 0:
+            height = bubble.sizeHint().height()
+        return height
+
+    def _materialize(self, index: int) -> ChatBubble:
+        message = self.model.message(index)
+        pool = self._pool.get(message.role)
+        if pool:
+            bubble = pool.pop()
+        else:
+            bubble = ChatBubble(role=message.role, painted=self.painted)
+            bubble.setParent(self.viewport())
+        bubble.buttonClicked.connect(self._on_button_clicked)
+        bubble.linkActivated.connect(self.linkActivated)
+
+        if message.streaming:
+            # Rebuild through the bubble's StreamParser, so later chunks
+            # continue its state (a split line, an open fence)
+            bubble.append_stream(message.content)
+            bubble.batcher.flush()
+        else:
+            bubble.add_blocks(self.model.blocks(index, self.parser))
+        bubble.show()
+        self._live[index] = bubble
+        return bubble
+
+    def _release(self, index: int):
+        bubble = self._live.pop(index)
+        bubble.buttonClicked.disconnect(self._on_button_clicked)
+        bubble.linkActivated.disconnect(self.linkActivated)
+        bubble.hide()
+        bubble.clear()
+
+        pool = self._pool.setdefault(bubble.role, [])
+        if len(pool) < self.POOL_SIZE:
+            pool.append(bubble)
+        else:
+            bubble.deleteLater()
+
+    def _on_button_clicked(self, payload: dict):
+        # Indexes shift on insertion, so look the sender up when it fires
+        bubble = self.sender()
+        for index, live in self._live.items():
+            if live is bubble:
+                self.buttonClicked.emit(index, payload)
+                return
+
+    # ---------------------------------
+    # PUBLIC HELPERS
+    # ---------------------------------
+    def live_count(self) -> int:
+        """
+        Number of materialized bubbles (useful for diagnostics).
+        """
+        return len(self._live)
+
+    def scroll_to_bottom(self):
+        self._stick_to_bottom = True
+        self._layout_visible()
@@ -1,6 +1,6 @@
-from PySide6.QtWidgets import *
-from PySide6.QtGui import *
-from PySide6.QtCore import *
+from PySide6.QtWidgets import QApplication, QFrame, QPushButton, QVBoxLayout, QWidget
+from PySide6.QtGui import QIcon
+from PySide6.QtCore import QPoint, Qt
 
 
 class PopupMenu(QFrame):
@@ -45,17 +45,24 @@ class PopupMenu(QFrame):
 
         self.actions = []
     
-    def add_action(self, text: str, callback=None, icon: str = "", submenu=None):
+    def add_action(self, text: str, callback=None, icon: str | QIcon = "", submenu=None):
         """
         Adds a new button to the popup menu.
         :param text: Text of the button
         :param callback: Function to call when clicked
-        :param icon: Optional icon
+        :param icon: Optional icon: text (e.g. an emoji) or a QIcon
+                     (e.g. from load_icon or an IconAtlas)
         :param submenu: Optional ToolPopup instance for a submenu
         """
 
-        btn_text = f"{icon} {text}" if icon else text
+        is_qicon = isinstance(icon, QIcon)
+        btn_text = f"{icon} {text}" if not is_qicon and icon else text
         btn = QPushButton(btn_text)
+        if is_qicon:
+            btn.setIcon(icon)
+            sizes = icon.availableSizes()
+            if sizes:
+                btn.setIconSize(sizes[0])
         btn.setCursor(Qt.PointingHandCursor)
         
         # Handle submenu
@@ -0,0 +1,121 @@
+"""
+Benchmark: building heading / link blocks with per-widget stylesheets
+(the previous HeadingBlock / LinkBlock, frozen below) vs. selectors in
+ChatBubble/theme.qss.
+
+Each block is created, parented and polished (which is when Qt resolves
+its style), with the theme loaded as the application stylesheet.
+Run from the repository root:
+
+    python benchmarks/block_styles.py [--blocks 10000]
+"""
+import argparse
+import html
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from PySide6.QtWidgets import QApplication, QLabel, QVBoxLayout, QWidget
+from PySide6.QtCore import Qt
+
+from ChatBubble.blocks.base import Block
+from ChatBubble.blocks.heading import HeadingBlock
+from ChatBubble.blocks.link import LinkBlock
+from utils.style import load_stylesheet
+
+
+# -----------------------------
+# REFERENCE (inline stylesheets)
+# -----------------------------
+class LegacyHeadingBlock(Block):
+    def __init__(self, text: str, level: int = 2):
+        super().__init__()
+        level = max(1, min(level, 4))
+        label = QLabel(text)
+        label.setWordWrap(True)
+        label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        size_map = {1: "22px", 2: "18px", 3: "15px", 4: "13px"}
+        weight_map = {1: "700", 2: "600", 3: "600", 4: "500"}
+        label.setStyleSheet(f"""
+            color: #e6edf3;
+            font-size: {size_map[level]};
+            font-weight: {weight_map[level]};
+            margin-top: 8px;
+            margin-bottom: 4px;
+        """)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(label)
+
+
+class LegacyLinkBlock(Block):
+    def __init__(self, text: str, url: str):
+        super().__init__()
+        label = QLabel(f'<a href="{html.escape(url)}">{html.escape(text)}</a>')
+        label.setOpenExternalLinks(True)
+        label.setTextInteractionFlags(Qt.TextSelectableByMouse | Qt.LinksAccessibleByMouse)
+        label.setStyleSheet("""
+            QLabel {
+                color: #58a6ff;
+                font-size: 13px;
+            }
+            QLabel:hover {
+                text-decoration: underline;
+            }
+        """)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 2, 0, 2)
+        layout.addWidget(label)
+
+
+# -----------------------------
+# BENCHMARK
+# -----------------------------
+def build(heading_cls, link_cls, count: int) -> float:
+    container = QWidget()
+    start = time.perf_counter()
+    for i in range(count):
+        if i % 2:
+            block = link_cls(f"link {i}", f"https://example.com/{i}")
+        else:
+            block = heading_cls(f"Heading {i}", i % 4 + 1)
+        block.setParent(container)
+        for label in block.findChildren(QLabel):
+            label.ensurePolished()
+    elapsed = time.perf_counter() - start
+    container.deleteLater()
+    QApplication.processEvents()
+    return elapsed
+
+
+def check_styles():
+    """
+    The theme must give the new blocks the fonts the inline styles did.
+    """
+    for level, size in ((1, 22), (2, 18), (3, 15), (4, 13)):
+        blocks = HeadingBlock("x", level), LegacyHeadingBlock("x", level)
+        new, old = (block.findChild(QLabel) for block in blocks)
+        new.ensurePolished()
+        old.ensurePolished()
+        assert new.font().pixelSize() == old.font().pixelSize() == size, level
+        assert new.font().weight() == old.font().weight(), level
+
+
+if __name__ == "__main__":
+    args = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    args.add_argument("--blocks", type=int, default=10_000)
+    opts = args.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    load_stylesheet(app, "ChatBubble/theme.qss")
+    check_styles()
+
+    # Warm-up (font database, style plugins)
+    build(HeadingBlock, LinkBlock, 200)
+
+    t_old = build(LegacyHeadingBlock, LegacyLinkBlock, opts.blocks)
+    t_new = build(HeadingBlock, LinkBlock, opts.blocks)
+    print(f"{opts.blocks} blocks  inline setStyleSheet: {t_old * 1000:.0f} ms  "
+          f"theme.qss selectors: {t_new * 1000:.0f} ms  ({t_old / t_new:.1f}x)")
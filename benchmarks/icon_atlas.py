@@ -0,0 +1,137 @@
+"""
+Benchmark: PopupMenu with many icon actions, per-icon pixmaps vs an IconAtlas.
+
+"icons" gives every action its own load_icon() SVG icon (one cached pixmap
+and one parsed SVG per icon); "atlas" hands out sub-rect icons of a single
+IconAtlas sheet. Each variant runs in its own process so the resident
+memory deltas are comparable. Paint time is the mean of full menu grabs
+after a first (warm-up) paint.
+Run from the repository root:
+
+    python benchmarks/icon_atlas.py [--actions 150] [--paints 20] [--scale 2]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+SHAPES = [
+    '<circle cx="12" cy="12" r="{r}" fill="{color}"/>',
+    '<rect x="{o}" y="{o}" width="{s}" height="{s}" rx="3" fill="{color}"/>',
+    '<path d="M12 {o} L{e} {e} L{o} {e} Z" fill="{color}" stroke="#222" stroke-width="1"/>',
+]
+
+
+def write_icons(directory: Path, count: int) -> list:
+    paths = []
+    for i in range(count):
+        color = f"#{(i * 2654435761) & 0xFFFFFF:06x}"
+        shape = SHAPES[i % len(SHAPES)].format(
+            r=6 + i % 5, o=3 + i % 4, s=18 - 2 * (i % 4), e=21 - i % 4, color=color,
+        )
+        path = directory / f"icon_{i}.svg"
+        path.write_text(
+            f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24">{shape}</svg>',
+            encoding="utf-8",
+        )
+        paths.append(str(path))
+    return paths
+
+
+def rss() -> int:
+    try:
+        import psutil
+    except ImportError:
+        return 0
+    return psutil.Process().memory_info().rss
+
+
+def run(mode: str, paths: list, paints: int, scale: float) -> dict:
+    os.environ["QT_SCALE_FACTOR"] = str(scale)
+
+    from PySide6.QtWidgets import QApplication
+    from PySide6.QtCore import QSize
+
+    from PopupMenu.popup_menu import PopupMenu
+    from utils.icons import ICON_CACHE, IconAtlas, load_icon
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    size = QSize(24, 24)
+    base = rss()
+
+    start = time.perf_counter()
+    if mode == "atlas":
+        atlas = IconAtlas(paths, size)
+        icons = [atlas.icon(p) for p in paths]
+    else:
+        icons = [load_icon(p, size) for p in paths]
+
+    menu = PopupMenu()
+    for i, icon in enumerate(icons):
+        menu.add_action(f"Action {i}", icon=icon)
+    menu.adjustSize()
+    menu.grab()
+    first = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(paints):
+        menu.grab()
+    paint = (time.perf_counter() - start) / paints
+
+    # Atlas pixmap() copies are kept in ICON_CACHE as well
+    stats = ICON_CACHE.stats()
+    pixel_bytes, pixmaps = stats["bytes"], stats["pixmaps"]
+    if mode == "atlas":
+        pixel_bytes += atlas.stats()["bytes"]
+        pixmaps += atlas.stats()["sheets"]
+    return {
+        "dpr": app.devicePixelRatio(),
+        "first": first,
+        "paint": paint,
+        "pixel_bytes": pixel_bytes,
+        "pixmaps": pixmaps,
+        "rss": rss() - base,
+    }
+
+
+if __name__ == "__main__":
+    args = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    args.add_argument("--actions", type=int, default=150)
+    args.add_argument("--paints", type=int, default=20)
+    args.add_argument("--scale", type=float, default=1.0, help="devicePixelRatio (QT_SCALE_FACTOR)")
+    args.add_argument("--mode", choices=("icons", "atlas"), help=argparse.SUPPRESS)
+    args.add_argument("--icons", help=argparse.SUPPRESS)
+    opts = args.parse_args()
+
+    if opts.mode:
+        paths = json.loads(Path(opts.icons).read_text(encoding="utf-8"))
+        print(json.dumps(run(opts.mode, paths, opts.paints, opts.scale)))
+        sys.exit(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        listing = Path(tmp) / "icons.json"
+        listing.write_text(json.dumps(write_icons(Path(tmp), opts.actions)), encoding="utf-8")
+
+        results = {}
+        for mode in ("icons", "atlas"):
+            output = subprocess.run(
+                [sys.executable, __file__, "--mode", mode, "--icons", str(listing),
+                 "--paints", str(opts.paints), "--scale", str(opts.scale)],
+                capture_output=True, text=True, check=True,
+            ).stdout
+            results[mode] = json.loads(output.strip().splitlines()[-1])
+
+    dpr = results["icons"]["dpr"]
+    print(f"PopupMenu with {opts.actions} icon actions, DPR {dpr:g}, mean of {opts.paints} paints")
+    for mode, r in results.items():
+        print(
+            f"  {mode:<6} first paint {r['first'] * 1000:7.1f} ms   paint {r['paint'] * 1000:6.2f} ms"
+            f"   pixmaps {r['pixmaps']:4}  pixels {r['pixel_bytes'] / 1024:7.0f} KiB"
+            f"   RSS +{r['rss'] / 1024 / 1024:5.1f} MiB"
+        )
@@ -0,0 +1,101 @@
+"""
+Startup import budget for the ChatBubble / PopupMenu / utils packages.
+
+Runs `python -X importtime -c "import <module>"` in fresh interpreters and
+checks, per module, that
+  - the import time excluding the Qt bindings themselves (PySide6 /
+    shiboken6 extension loading, which no code here can avoid) stays
+    within its budget, and
+  - modules that must load lazily (psutil, the code block / highlighter)
+    were not imported.
+Exits 1 if any budget is exceeded. Run from the repository root:
+
+    python benchmarks/import_time.py [--runs 5]
+"""
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+BINDINGS = ("PySide6", "shiboken6")
+
+# module -> (budget in ms excluding bindings, modules that must not be imported)
+# Budgets are about 1.5x the measured minimum; the Qt type/enum objects a
+# module touches first are still charged to it.
+BUDGETS = {
+    "ChatBubble.blocks.parser": (25, ("PySide6", "psutil")),
+    "ChatBubble.view": (70, (
+        "ChatBubble.blocks.code", "ChatBubble.highlighter",
+        "ChatBubble.loader", "psutil",
+    )),
+    "PopupMenu.popup_menu": (40, ("psutil",)),
+    "utils.theme": (70, ("psutil",)),
+}
+
+
+def _is_binding(name: str) -> bool:
+    return name.split(".")[0] in BINDINGS
+
+
+def measure(module: str) -> tuple:
+    """
+    (total ms, ms excluding bindings, imported module names) for one fresh import.
+    """
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=ROOT, env=env, check=True,
+    )
+
+    entries = []    # (depth, cumulative us, name), in importtime's post-order
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((depth, int(cumulative), name.strip()))
+
+    # Walk parents-first; count bindings only where their parent isn't one
+    bindings_us = 0
+    stack = []
+    for depth, cumulative, name in reversed(entries):
+        while stack and stack[-1][0] >= depth:
+            stack.pop()
+        parent = stack[-1][1] if stack else ""
+        if _is_binding(name) and not _is_binding(parent):
+            bindings_us += cumulative
+        stack.append((depth, name))
+
+    total_us = next(c for d, c, n in reversed(entries) if n == module)
+    names = {n for _, _, n in entries}
+    return total_us / 1000, (total_us - bindings_us) / 1000, names
+
+
+def main(runs: int) -> int:
+    failures = 0
+    print(f"{'module':<28}{'total ms':>10}{'own ms':>10}{'budget':>8}")
+    for module, (budget, forbidden) in BUDGETS.items():
+        samples = [measure(module) for _ in range(runs)]
+        total = min(s[0] for s in samples)
+        own = min(s[1] for s in samples)
+        names = samples[0][2]
+
+        status = "ok"
+        if own > budget:
+            status = "OVER BUDGET"
+        loaded = [f for f in forbidden if f in names or any(n.startswith(f + ".") for n in names)]
+        if loaded:
+            status = f"eagerly imports {', '.join(loaded)}"
+        failures += status != "ok"
+        print(f"{module:<28}{total:>10.1f}{own:>10.1f}{budget:>8}  {status}")
+    return failures
+
+
+if __name__ == "__main__":
+    args = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    args.add_argument("--runs", type=int, default=5)
+    opts = args.parse_args()
+    sys.exit(1 if main(opts.runs) else 0)
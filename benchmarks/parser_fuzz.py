@@ -0,0 +1,271 @@
+"""
+Fuzz + benchmark harness for ChatBubble's BlockParser.
+
+Compares the single-pass scanner against a frozen copy of the previous
+regex-based parser (LegacyBlockParser below, one node per line fragment;
+paragraphs are flattened before comparing), checks that StreamParser
+produces the same nodes as a one-shot parse under random chunking (also
+on messier input: indentation, trailing spaces, mixed line breaks, inline
+buttons), and times both parsers on large and pathological inputs.
+
+Headless (no Qt needed). Run from the repository root:
+
+    python benchmarks/parser_fuzz.py [--docs 2000] [--seed 1] [--size 200000]
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from ChatBubble.blocks.nodes import (
+    TextNode, ParagraphNode, CodeNode, DividerNode, HeadingNode, LinkNode, ButtonNode,
+)
+from ChatBubble.blocks.cache import ParseCache
+from ChatBubble.blocks.parser import BlockParser, StreamParser, ADD, OPEN, RETRACT
+
+
+# -----------------------------
+# REFERENCE (previous parser)
+# -----------------------------
+class LegacyBlockParser:
+    """
+    The regex-per-line parser the scanner replaced, producing nodes.
+    """
+    CODE_PATTERN = re.compile(r"```(\w+)?\n(.*?)```", re.S)
+    HEADING_PATTERN = re.compile(r"^(#{1,4})\s+(.*)$", re.M)
+    LINK_PATTERN = re.compile(r"\[([^\]]+)\]\(([^)]+)\)")
+    BUTTON_PATTERN = re.compile(r"\[\[button:(.*?)\|(.*?)\]\]")
+    DIVIDER_PATTERN = re.compile(r"^\s*---\s*$", re.M)
+
+    def parse(self, text):
+        blocks = []
+        cursor = 0
+        for match in self.CODE_PATTERN.finditer(text):
+            if match.start() > cursor:
+                blocks.extend(self._parse_inline(text[cursor:match.start()]))
+            blocks.append(CodeNode(match.group(2).strip(), match.group(1) or "text"))
+            cursor = match.end()
+        if cursor < len(text):
+            blocks.extend(self._parse_inline(text[cursor:]))
+        return blocks
+
+    def _parse_inline(self, text):
+        blocks = []
+        for line in text.splitlines():
+            if self.DIVIDER_PATTERN.match(line):
+                blocks.append(DividerNode())
+                continue
+            h = self.HEADING_PATTERN.match(line)
+            if h:
+                blocks.append(HeadingNode(h.group(2), len(h.group(1))))
+                continue
+            btn = self.BUTTON_PATTERN.search(line)
+            if btn:
+                try:
+                    payload = json.loads(btn.group(2))
+                except Exception:
+                    payload = {}
+                blocks.append(ButtonNode(btn.group(1).strip(), payload))
+                continue
+            last = 0
+            for lm in self.LINK_PATTERN.finditer(line):
+                if lm.start() > last:
+                    blocks.append(TextNode(line[last:lm.start()]))
+                blocks.append(LinkNode(lm.group(1), lm.group(2)))
+                last = lm.end()
+            if last < len(line):
+                blocks.append(TextNode(line[last:]))
+        return blocks
+
+
+# -----------------------------
+# INPUT GENERATION
+# -----------------------------
+WORDS = ["alpha", "beta", "gamma", "x", "42", "*bold*", "#tag", "a-b", "`tick`", "(p)", "[b]"]
+
+
+def _words(rng, lo=1, hi=8):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(lo, hi)))
+
+
+def random_document(rng: random.Random, lines: int = 40) -> str:
+    """
+    Well-formed documents: fences are closed and start a line.
+    Both parsers must agree on these.
+    """
+    out = []
+    for _ in range(lines):
+        kind = rng.randrange(10)
+        if kind == 0:
+            out.append("#" * rng.randint(1, 5) + " " + _words(rng))
+        elif kind == 1:
+            out.append(rng.choice(["---", "  ---  ", "----", "- --"]))
+        elif kind == 2:
+            out.append(f"{_words(rng)} [{_words(rng, 1, 2)}](https://e.x/{rng.randint(0, 99)}) {_words(rng, 0, 3)}")
+        elif kind == 3:
+            out.append(f'[[button:{_words(rng, 1, 2)}|{{"n": {rng.randint(0, 9)}}}]]')
+        elif kind == 4:
+            lang = rng.choice(["", "python", "js", "sql"])
+            body = [_words(rng).replace("`", "'") for _ in range(rng.randint(0, 5))]
+            out.append("```" + lang)
+            out.extend(body)
+            out.append("```")
+        elif kind == 5:
+            out.append("")
+        else:
+            out.append(_words(rng))
+    return "\n".join(out) + rng.choice(["", "\n"])
+
+
+def messy_document(rng: random.Random, lines: int = 40) -> str:
+    """
+    Whitespace the legacy parser strips differently: indentation, trailing
+    spaces, blank lines around code, CRLF (or a mix of every line break
+    str.splitlines() knows, lone \r included), and [[button: after prose.
+    Only the stream and one-shot parses are compared on these.
+    """
+    out = []
+    for _ in range(lines):
+        kind = rng.randrange(8)
+        indent = rng.choice(["", "", "  ", "    ", "\t"])
+        trail = rng.choice(["", "", " ", "  \t"])
+        if kind == 0:
+            lang = rng.choice(["", "python"])
+            out.append(indent + "```" + lang)
+            for _ in range(rng.randint(0, 6)):
+                body = rng.choice(["", " ", _words(rng).replace("`", "'")])
+                out.append(rng.choice(["", "  ", "\t"]) + body + rng.choice(["", " "]))
+            out.append(indent + "```" + trail)
+        elif kind == 1:
+            label = _words(rng, 1, 2)
+            out.append(f'{indent}{_words(rng, 0, 3)} [[button:{label}|{{"n": 1}}]]{trail}')
+        elif kind == 2:
+            out.append(f"{_words(rng)} [[not a button{trail}")
+        elif kind == 3:
+            out.append(rng.choice(["", " ", "\t"]))
+        else:
+            out.append(indent + _words(rng) + trail)
+
+    eols = rng.choice([["\n"], ["\r\n"], ["\n", "\r\n", "\r", "\f", "\u2028"]])
+    seps = [rng.choice(eols) for _ in out]
+    text = "".join(line + sep for line, sep in zip(out, seps))
+    return text if rng.randrange(2) else text[:-len(seps[-1])]
+
+
+def flatten(nodes):
+    """
+    Splits paragraphs back into the per-line Text/Link nodes of the old parser.
+    """
+    flat = []
+    for node in nodes:
+        if not isinstance(node, ParagraphNode):
+            flat.append(node)
+            continue
+        for text, url in node.spans:
+            if url is not None:
+                flat.append(LinkNode(text, url))
+            elif text != "\n":
+                flat.append(TextNode(text))
+    return flat
+
+
+def random_chunks(rng: random.Random, text: str):
+    i = 0
+    while i < len(text):
+        n = rng.choice([1, 1, 2, 3, 5, 8, 20])
+        yield text[i:i + n]
+        i += n
+
+
+def stream_nodes(text: str, rng: random.Random):
+    stream = StreamParser()
+    events = []
+    for chunk in random_chunks(rng, text):
+        events.extend(stream.feed(chunk))
+    events.extend(stream.close())
+    # Nodes emptied by a RETRACT are removed by the renderers
+    removed = {id(node) for op, node, _ in events if op == RETRACT and not node.spans}
+    return [node for op, node, _ in events if op in (ADD, OPEN) and id(node) not in removed]
+
+
+# -----------------------------
+# CHECKS
+# -----------------------------
+def fuzz(docs: int, seed: int) -> int:
+    rng = random.Random(seed)
+    legacy, scanner = LegacyBlockParser(), BlockParser()
+    failures = 0
+
+    for i in range(docs):
+        text = random_document(rng)
+        parsed = scanner.parse(text)
+        checks = (
+            ("scanner", flatten(parsed), legacy.parse(text)),
+            ("stream", stream_nodes(text, rng), parsed),
+        )
+
+        messy = messy_document(rng)
+        checks += (("messy stream", stream_nodes(messy, rng), scanner.parse(messy)),)
+
+        for label, result, expected in checks:
+            if result != expected:
+                failures += 1
+                if failures <= 3:
+                    source = messy if label == "messy stream" else text
+                    print(f"[MISMATCH] {label} doc #{i}\n{source!r}")
+                    print(f"  expected: {expected}\n  got:      {result}")
+
+    print(f"fuzz: {docs} documents, {failures} mismatches")
+    return failures
+
+
+def _time(fn, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark(size: int, seed: int):
+    rng = random.Random(seed)
+    legacy, scanner = LegacyBlockParser(), BlockParser()
+
+    doc = ""
+    while len(doc) < size:
+        doc += random_document(rng, 200) + "\n"
+
+    # A fence that never closes: the old parser falls back to text for it,
+    # the scanner treats the rest as code. Only the timing is comparable.
+    unclosed = "```py\n" + doc.replace("```", "~~~")
+
+    print(f"{'input':<16}{'bytes':>10}{'legacy ms':>12}{'scanner ms':>12}")
+    for name, text in (("markdown", doc), ("unclosed fence", unclosed)):
+        t_old = _time(legacy.parse, text)
+        t_new = _time(scanner.parse, text)
+        print(f"{name:<16}{len(text):>10}{t_old * 1000:>12.1f}{t_new * 1000:>12.1f}")
+
+    # Re-parsing unchanged content (scroll-back, re-render) hits the cache
+    cache = ParseCache()
+    cached = BlockParser(cache=cache)
+    assert cached.parse(doc) == scanner.parse(doc)
+    t_hit = _time(cached.parse, doc)
+    print(f"{'cached re-parse':<16}{len(doc):>10}{'':>12}{t_hit * 1000:>12.1f}  {cache.stats()}")
+
+
+if __name__ == "__main__":
+    args = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    args.add_argument("--docs", type=int, default=2000)
+    args.add_argument("--seed", type=int, default=1)
+    args.add_argument("--size", type=int, default=200_000)
+    opts = args.parse_args()
+
+    failed = fuzz(opts.docs, opts.seed)
+    benchmark(opts.size, opts.seed)
+    sys.exit(1 if failed else 0)
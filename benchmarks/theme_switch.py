@@ -0,0 +1,104 @@
+"""
+Benchmark: theme switch latency with many live chat blocks.
+
+"stylesheet" uses apply_theme, which swaps the whole application stylesheet
+(component QSS + ChatBubble/dark.qss or light.qss); "palette" uses
+apply_palette_theme, which keeps the same component QSS and only swaps the
+QPalette and re-polishes the widgets its few palette() rules target. Times
+include the event loop pass that repaints the window.
+Run from the repository root:
+
+    python benchmarks/theme_switch.py [--blocks 5000] [--switches 4]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from PySide6.QtWidgets import QApplication, QLabel, QScrollArea, QVBoxLayout, QWidget
+from PySide6.QtGui import QPalette
+
+from ChatBubble.blocks.nodes import DividerNode, HeadingNode, LinkNode, ParagraphNode
+from ChatBubble.renderer import BLOCK_FACTORIES
+from ChatBubble.styles import register_theme_layers
+from utils.theme import Theme, apply_palette_theme, apply_theme
+
+
+def build_window(count: int) -> QScrollArea:
+    nodes = [
+        HeadingNode("Section", 2),
+        ParagraphNode([("Some text with a ", None), ("link", "https://example.com")]),
+        LinkNode("docs", "https://example.com/docs"),
+        DividerNode(),
+    ]
+    content = QWidget()
+    layout = QVBoxLayout(content)
+    for i in range(count):
+        node = nodes[i % len(nodes)]
+        layout.addWidget(BLOCK_FACTORIES[node.kind](node))
+
+    area = QScrollArea()
+    area.setWidgetResizable(True)
+    area.setWidget(content)
+    area.resize(800, 600)
+    area.show()
+    return area
+
+
+def heading_size(window) -> int:
+    """
+    Pixel size of the first heading; both modes must apply components.qss.
+    """
+    return window.widget().findChild(QLabel, "ChatBubbleHeading").font().pixelSize()
+
+
+def switch(app, apply, themes, switches: int) -> float:
+    times = []
+    for i in range(switches):
+        start = time.perf_counter()
+        apply(themes[i % 2])
+        app.processEvents()
+        times.append(time.perf_counter() - start)
+    return sum(times) / len(times)
+
+
+if __name__ == "__main__":
+    args = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    args.add_argument("--blocks", type=int, default=5000)
+    args.add_argument("--switches", type=int, default=4)
+    opts = args.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    register_theme_layers()
+
+    # Stylesheet mode
+    apply_theme(app, Theme.DARK, animate=False)
+    window = build_window(opts.blocks)
+    app.processEvents()
+    t_qss = switch(
+        app, lambda theme: apply_theme(app, theme, animate=False),
+        (Theme.LIGHT, Theme.DARK), opts.switches,
+    )
+    assert heading_size(window) == 18, heading_size(window)
+    window.close()
+    window.deleteLater()
+    app.processEvents()
+
+    # Palette mode
+    apply_palette_theme(app, Theme.DARK)
+    window = build_window(opts.blocks)
+    app.processEvents()
+    t_palette = switch(
+        app, lambda theme: apply_palette_theme(app, theme),
+        (Theme.LIGHT, Theme.DARK), opts.switches,
+    )
+    text = window.widget().findChildren(QWidget)[-1].palette().color(QPalette.WindowText)
+    assert text.name() == "#e6edf3", text.name()
+    assert heading_size(window) == 18, heading_size(window)
+
+    widgets = len(window.widget().findChildren(QWidget))
+    print(f"{opts.blocks} blocks ({widgets} widgets), mean of {opts.switches} switches")
+    print(f"  stylesheet swap: {t_qss * 1000:8.0f} ms")
+    print(f"  palette swap:    {t_palette * 1000:8.0f} ms  ({t_qss / t_palette:.1f}x)")
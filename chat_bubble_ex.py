@@ -1,10 +1,7 @@
-from PySide6.QtWidgets import *
-from PySide6.QtGui import *
-from PySide6.QtCore import *
+from PySide6.QtWidgets import QApplication, QVBoxLayout, QWidget
 import sys
 
-from ChatBubble.bubble import ChatBubble
-from ChatBubble.blocks.parser import BlockParser
+from ChatBubble.view import ChatView
 
 from utils.style import load_stylesheet
 
@@ -17,22 +14,13 @@ class ChatBubbleDemo(QWidget):
 
         layout = QVBoxLayout(self)
 
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-
-        container = QWidget()
-        self.chat_layout = QVBoxLayout(container)
-        self.chat_layout.setAlignment(Qt.AlignTop)
-        self.chat_layout.setSpacing(14)
-
-        scroll.setWidget(container)
-        layout.addWidget(scroll)
+        # Only bubbles near the viewport are created as widgets
+        self.chat_view = ChatView()
+        layout.addWidget(self.chat_view)
 
         self._add_demo_messages()
 
     def _add_demo_messages(self):
-        parser = BlockParser()
-
         content = """
 ## Welcome to the ChatBubble API
 
@@ -56,12 +44,9 @@ Check out [Qt for Python](https://doc.qt.io/qtforpython-6/)
 [[button:Run Code|{"action":"run"}]]
 [[button:Open Docs|{"action":"docs"}]]
 """
-        blocks = parser.parse(content)
-
-        bubble = ChatBubble(role="assistant")
-        bubble.add_blocks(blocks)
-        
-        self.chat_layout.addWidget(bubble)
+        model = self.chat_view.model
+        model.append_message("user", "Show me what ChatBubble can do.")
+        model.append_message("assistant", content)
 
 
 # -----------------------------
@@ -0,0 +1,25 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+from PySide6.QtWidgets import QApplication
+
+from ChatBubble.blocks.code import CodeBlock
+
+
+@pytest.fixture
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def test_code_setter_replaces_streamed_chunks(app):
+    block = CodeBlock("a = 1", "python")
+    block.append("\nb = 2")
+
+    block.code = "x = 3"
+    assert block.code == "x = 3"
+    assert block.editor.toPlainText() == "x = 3"
+
+    block.append("\ny = 4")
+    assert block.code == "x = 3\ny = 4"
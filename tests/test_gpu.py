@@ -0,0 +1,239 @@
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+import utils.gpu as gpu
+from utils.gpu import GpuMonitor, _SmiStream
+from utils.system_checker import HardwareInfo
+
+FAKE_SMI = str(Path(__file__).parent / "fixtures" / "nvidia-smi")
+MIB = 1024 ** 2
+
+
+@pytest.fixture
+def smi(monkeypatch):
+    """
+    Factory for monitors running the fake nvidia-smi (NVML disabled).
+    """
+    monitors = []
+
+    def make(interval_ms=20, **env):
+        for name, value in env.items():
+            monkeypatch.setenv(name, str(value))
+        monitor = GpuMonitor(FAKE_SMI, interval_ms=interval_ms, use_nvml=False)
+        monitors.append(monitor)
+        return monitor
+
+    yield make
+    for monitor in monitors:
+        monitor.stop()
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+# ---------------------------------
+# NVIDIA-SMI STREAMS
+# ---------------------------------
+def test_reads_gpus_and_processes(smi):
+    monitor = smi()
+    gpus = monitor.sample(timeout=5)
+    assert monitor.backend == "nvidia-smi"
+    assert [g.index for g in gpus] == [0, 1]
+
+    first = gpus[0]
+    assert first.name == "NVIDIA GeForce RTX 4090"
+    assert first.driver == "550.54"
+    assert first.memory_total == 24564 * MIB
+    assert first.utilization == 37
+    assert first.memory_utilization == 5
+
+    # Process rows arrive on their own stream
+    wait_for(lambda: monitor.sample()[0].processes)
+    processes = {p.pid: p for g in monitor.sample() for p in g.processes}
+    assert processes[4242].name == "python"
+    assert processes[4242].memory_used == 900 * MIB
+    assert [p.pid for p in monitor.sample()[1].processes] == [4343]
+
+
+def test_not_available_fields_are_none(smi):
+    monitor = smi()
+    wait_for(lambda: (monitor.sample(timeout=5) or [None])[-1].processes)
+    second = monitor.sample()[1]
+    assert second.utilization is None
+    assert second.memory_utilization is None
+    assert second.memory_used == 200 * MIB
+    assert second.processes[0].memory_used is None
+    assert second.formatted()["Processes"][0]["Memory Used"] == "N/A"
+
+
+def test_rows_split_across_writes(smi):
+    monitor = smi(FAKE_SMI_MODE="split")
+    gpus = monitor.sample(timeout=5)
+    assert [g.name for g in gpus] == ["NVIDIA GeForce RTX 4090", "NVIDIA A100"]
+    assert gpus[0].memory_total == 24564 * MIB
+
+
+def test_rows_with_bad_ids_are_skipped(smi):
+    monitor = smi(FAKE_SMI_MODE="bad-ids")
+    wait_for(lambda: (monitor.sample(timeout=5) or [None])[0].processes)
+    gpus = monitor.sample()
+    assert [g.index for g in gpus] == [0, 1]
+    assert [p.pid for p in gpus[0].processes] == [4242]
+
+
+def test_frames_are_delimited_by_headers():
+    frames = []
+    stream = _SmiStream([], "index", frames.append)
+    lines = ["index, name", "0, a", "1, b", "", "index, name", "0, c", "1, d"]
+    stream._read(SimpleNamespace(stdout=iter(line + "\n" for line in lines),
+                                 wait=lambda: 0))
+    assert frames == [[["0", "a"], ["1", "b"]], [["0", "c"], ["1", "d"]]]
+
+
+def test_fixed_rows_deliver_without_waiting_for_next_header():
+    frames = []
+    before_eof = []
+    stream = _SmiStream([], "index", frames.append, fixed_rows=True)
+
+    def stdout():
+        yield from (line + "\n" for line in ["index", "0", "1", "index", "0", "1"])
+        # Runs after the last row was handled, before the reader sees EOF
+        before_eof.append(len(frames))
+
+    stream._read(SimpleNamespace(stdout=stdout(), wait=lambda: 0))
+    assert before_eof == [2]
+    assert len(frames) == 2
+
+
+def test_no_devices(smi):
+    monitor = smi(FAKE_SMI_MODE="no-devices")
+    assert monitor.sample(timeout=5) == []
+    assert HardwareInfo(gpu_monitor=monitor).get_gpu_info() == "No NVIDIA GPU detected."
+
+
+def test_missing_executable():
+    monitor = GpuMonitor("/nonexistent/nvidia-smi", use_nvml=False)
+    assert monitor.start() is False
+    assert monitor.sample() is None
+    assert (HardwareInfo(gpu_monitor=monitor).get_gpu_info()
+            == "No NVIDIA GPU or 'nvidia-smi' not found.")
+
+
+def test_exited_stream_restarts_after_delay(smi, tmp_path, monkeypatch):
+    log = tmp_path / "starts.log"
+    monkeypatch.setattr(_SmiStream, "RESTART_S", 0.3)
+    monitor = smi(FAKE_SMI_FRAMES=1, FAKE_SMI_LOG=log)
+
+    def starts():
+        return log.read_text().split().count("gpu") if log.exists() else 0
+
+    assert len(monitor.sample(timeout=5)) == 2
+    wait_for(lambda: not monitor._streams[0].is_running())
+
+    # Within RESTART_S: the last frame is kept, nothing is spawned
+    for _ in range(20):
+        assert len(monitor.sample()) == 2
+    assert starts() == 1
+
+    time.sleep(0.35)
+    monitor.sample()
+    wait_for(lambda: starts() == 2)
+
+
+def test_polling_does_not_spawn(smi, tmp_path):
+    log = tmp_path / "starts.log"
+    monitor = smi(FAKE_SMI_LOG=log)
+    monitor.sample(timeout=5)
+    for _ in range(50):
+        monitor.sample()
+    assert sorted(log.read_text().split()) == ["apps", "gpu"]
+
+
+# ---------------------------------
+# NVML
+# ---------------------------------
+class FakeNVMLError(Exception):
+    pass
+
+
+def fake_pynvml(broken=()):
+    """
+    Two devices; methods named in broken raise NVMLError for device 1.
+    """
+    def device(name, value):
+        def call(handle):
+            if handle == 1 and name in broken:
+                raise FakeNVMLError(name)
+            return value
+        return call
+
+    return SimpleNamespace(
+        NVMLError=FakeNVMLError,
+        nvmlInit=lambda: None,
+        nvmlShutdown=lambda: None,
+        nvmlSystemGetDriverVersion=lambda: b"550.54",
+        nvmlDeviceGetCount=lambda: 2,
+        nvmlDeviceGetHandleByIndex=lambda index: index,
+        nvmlDeviceGetName=device("name", b"Fake GPU"),
+        nvmlDeviceGetMemoryInfo=device("memory", SimpleNamespace(total=8 * MIB, used=MIB)),
+        nvmlDeviceGetUtilizationRates=device("rates", SimpleNamespace(gpu=40, memory=10)),
+        nvmlDeviceGetComputeRunningProcesses=device(
+            "processes", [SimpleNamespace(pid=99999999, usedGpuMemory=None)]
+        ),
+    )
+
+
+def test_nvml_backend(monkeypatch):
+    monkeypatch.setitem(sys.modules, "pynvml", fake_pynvml())
+    monitor = GpuMonitor("/nonexistent/nvidia-smi")
+    gpus = monitor.sample()
+    assert monitor.backend == "nvml"
+    assert [(g.name, g.memory_total, g.utilization) for g in gpus] == [("Fake GPU", 8 * MIB, 40)] * 2
+    assert gpus[0].processes[0].pid == 99999999
+
+
+def test_nvml_device_errors_are_per_device(monkeypatch):
+    broken = ("name", "memory", "rates", "processes")
+    monkeypatch.setitem(sys.modules, "pynvml", fake_pynvml(broken))
+    monitor = GpuMonitor("/nonexistent/nvidia-smi")
+
+    healthy, failing = monitor.sample()
+    assert healthy.memory_total == 8 * MIB
+    assert failing.name == "GPU 1"
+    assert failing.memory_total is None and failing.memory_used is None
+    assert failing.utilization is None and failing.processes == []
+    assert HardwareInfo(gpu_monitor=monitor).get_gpu_info()[1]["Memory"] == "N/A"
+
+
+# ---------------------------------
+# SINGLETON
+# ---------------------------------
+def test_gpu_monitor_is_created_once(monkeypatch):
+    monkeypatch.setattr(gpu, "_monitor", None)
+    created = []
+
+    class Counting(GpuMonitor):
+        def __init__(self):
+            time.sleep(0.01)    # widen the race window
+            created.append(self)
+            super().__init__()
+
+    monkeypatch.setattr(gpu, "GpuMonitor", Counting)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(gpu.gpu_monitor())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 1
+    assert all(result is created[0] for result in results)
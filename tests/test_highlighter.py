@@ -0,0 +1,59 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+from PySide6.QtGui import QTextCursor, QTextDocument
+from PySide6.QtWidgets import QApplication
+
+import ChatBubble.highlighter as highlighter
+from ChatBubble.grammars import Grammar, register_grammar
+from ChatBubble.styles import register_theme_layers
+from utils.theme import Theme, apply_palette_theme, apply_theme
+
+
+@pytest.fixture(scope="module")
+def app():
+    app = QApplication.instance() or QApplication([])
+    register_theme_layers()
+    yield app
+    apply_theme(app, Theme.DARK, animate=False)
+    app.setStyleSheet("")
+
+
+def test_stale_span_state_restarts():
+    """
+    A block state from a grammar with more spans (before register_grammar
+    replaced it) must not index past the new spans.
+    """
+    grammar = Grammar("test", [("number", r"\d+")], [("string", '"""', '"""')])
+    tokens, state = grammar.tokenize("x = 1", 3)
+    assert tokens == [(4, 1, "number")]
+    assert state == 0
+
+
+def test_register_grammar_keeps_highlighting(app):
+    register_grammar("stale", [("keyword", r"\bdef\b")], [("string", '"""', '"""')])
+    document = QTextDocument('s = """open\nstill open')
+    document.documentLayout()  # edits reach the highlighter through the layout
+    code = highlighter.CodeHighlighter(document, "stale")
+    code.rehighlight()
+    assert document.lastBlock().userState() == 1
+
+    # Editing the last line re-highlights it from the first line's old state
+    register_grammar("stale", [("keyword", r"\bdef\b")])
+    cursor = QTextCursor(document.lastBlock())
+    cursor.insertText("def ")
+    assert document.lastBlock().userState() == 0
+
+
+@pytest.mark.parametrize("apply", [
+    lambda app, theme: apply_theme(app, theme, animate=False),
+    apply_palette_theme,
+])
+def test_token_colors_follow_theme(app, apply):
+    for theme in (Theme.LIGHT, Theme.DARK):
+        apply(app, theme)
+        assert highlighter.HIGHLIGHT_COLORS == highlighter.HIGHLIGHT_THEMES[theme.value]
+        keyword = highlighter.get_highlight_rules("python").formats["keyword"]
+        assert keyword.foreground().color().name() == highlighter.HIGHLIGHT_THEMES[theme.value]["keyword"][0]
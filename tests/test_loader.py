@@ -0,0 +1,53 @@
+import os
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+from PySide6.QtWidgets import QApplication
+
+from ChatBubble.blocks.parser import BlockParser
+from ChatBubble.loader import AsyncBlockLoader
+
+
+class FailingParser(BlockParser):
+    """
+    Raises for texts containing "boom".
+    """
+    def parse(self, text: str, cancel=None):
+        if "boom" in text:
+            raise ValueError("boom")
+        return super().parse(text, cancel)
+
+
+class Renderer:
+    def __init__(self):
+        self.blocks = []
+
+    def add_block(self, block):
+        self.blocks.append(block)
+
+
+@pytest.fixture
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def test_failed_parse_is_reported(app):
+    renderer = Renderer()
+    loader = AsyncBlockLoader(renderer, FailingParser())
+    errors, done = [], []
+    loader.failed.connect(errors.append)
+    loader.finished.connect(lambda: done.append(True))
+
+    loader.load("first")
+    loader.load("boom")
+    loader.load("last")
+
+    deadline = time.monotonic() + 5
+    while not done:
+        assert time.monotonic() < deadline, "timed out"
+        app.processEvents()
+
+    assert [type(e) for e in errors] == [ValueError]
+    assert [block.spans for block in renderer.blocks] == [[("first", None)], [("last", None)]]
@@ -0,0 +1,23 @@
+import pytest
+
+from utils.metrics import RingBuffer
+
+
+@pytest.mark.parametrize("appended", [0, 3, 5, 7, 12])
+def test_count_from_matches_a_scan(appended):
+    buffer = RingBuffer(5)
+    for value in range(appended):
+        buffer.append(value)
+
+    values = list(buffer.values())
+    for threshold in (-1, 0, 2.5, 4, 7, 11, 12, 20):
+        expected = sum(1 for value in values if value >= threshold)
+        assert buffer.count_from(threshold) == expected, (appended, threshold)
+
+
+def test_count_from_counts_equal_values():
+    buffer = RingBuffer(4)
+    for value in (1, 2, 2, 2, 3):
+        buffer.append(value)
+    assert buffer.count_from(2) == 4
+    assert buffer.count_from(2.5) == 1
@@ -0,0 +1,53 @@
+import os
+import re
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+from PySide6.QtWidgets import QApplication
+
+from ChatBubble.styles import COLOR_QSS, COMBINED_QSS, COMPONENT_QSS, PALETTE_QSS, register_theme_layers
+from utils.theme import Theme, apply_palette_theme, apply_theme
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def read(path: str) -> str:
+    return (ROOT / path).read_text(encoding="utf-8")
+
+
+@pytest.fixture(scope="module")
+def app():
+    app = QApplication.instance() or QApplication([])
+    register_theme_layers()
+    yield app
+    app.setStyleSheet("")
+
+
+def test_combined_sheet_matches_layers():
+    combined = read(COMBINED_QSS)
+    body = combined[combined.index("*/") + 2:].lstrip("\n")
+    assert body == read(COMPONENT_QSS) + "\n" + read(COLOR_QSS["dark"])
+
+
+@pytest.mark.parametrize("theme", sorted(COLOR_QSS))
+def test_color_sheets_are_scoped(theme):
+    """
+    Color sheets style ChatBubble widgets only, not every QLabel in the app.
+    """
+    for selectors in re.findall(r"([^{}]+)\{", re.sub(r"/\*.*?\*/", "", read(COLOR_QSS[theme]), flags=re.S)):
+        for selector in selectors.split(","):
+            assert "#ChatBubble" in selector or selector.strip() == "PaintedBody", selector.strip()
+
+
+def test_layers_apply_in_both_modes(app):
+    heading = '#ChatBubbleHeading[level="1"]'
+    for theme in (Theme.DARK, Theme.LIGHT):
+        apply_theme(app, theme, animate=False)
+        assert heading in app.styleSheet()
+        assert read(COLOR_QSS[theme.value]).strip() in app.styleSheet()
+
+        apply_palette_theme(app, theme)
+        assert heading in app.styleSheet()
+        assert read(PALETTE_QSS).strip() in app.styleSheet()
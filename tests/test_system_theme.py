@@ -0,0 +1,68 @@
+import os
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+from PySide6.QtWidgets import QApplication
+
+from utils.system_theme import DARK, LIGHT, SystemThemeMonitor
+
+FAKE_SCHEME = str(Path(__file__).parent / "fixtures" / "color-scheme")
+
+
+@pytest.fixture
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def scheme_file(tmp_path):
+    path = tmp_path / "scheme"
+    path.write_text("'default'")
+    return path
+
+
+def wait_for(app, condition, timeout=5.0):
+    # changed is emitted on worker threads and delivered queued
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        app.processEvents()
+        time.sleep(0.01)
+
+
+def test_polling_fallback(app, scheme_file):
+    monitor = SystemThemeMonitor(
+        command=[FAKE_SCHEME, str(scheme_file)], monitor_command=[], poll_interval_ms=20,
+    )
+    changes = []
+    monitor.changed.connect(changes.append)
+    monitor.start()
+    try:
+        wait_for(app, lambda: changes == [LIGHT])
+        scheme_file.write_text("'prefer-dark'")
+        wait_for(app, lambda: changes == [LIGHT, DARK])
+        assert monitor.wait(0) == DARK
+    finally:
+        monitor.stop()
+    assert not monitor.is_running()
+
+
+def test_stop_reaps_monitor_command(app, scheme_file):
+    monitor = SystemThemeMonitor(
+        command=[FAKE_SCHEME, str(scheme_file)],
+        monitor_command=[FAKE_SCHEME, "--monitor", str(scheme_file)],
+    )
+    changes = []
+    monitor.changed.connect(changes.append)
+    monitor.start()
+    process = monitor._process
+    assert process is not None
+
+    scheme_file.write_text("'prefer-dark'")
+    wait_for(app, lambda: changes and changes[-1] == DARK)
+
+    monitor.stop()
+    assert process.returncode is not None
@@ -0,0 +1,56 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+from PySide6.QtWidgets import QApplication
+
+from ChatBubble.blocks.base import Block
+from ChatBubble.blocks.button import ButtonBlock
+from ChatBubble.view import ChatModel, ChatView
+
+
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.setattr(Block, "open_external_links", False)
+    return QApplication.instance() or QApplication([])
+
+
+def make_view(painted: bool):
+    model = ChatModel()
+    view = ChatView(model, painted=painted)
+    view.resize(600, 800)
+    model.append_message("assistant", "See [the docs](https://example.com/docs).")
+    view._layout_visible()
+    return model, view
+
+
+@pytest.mark.parametrize("painted", [False, True])
+def test_bubble_signals_reach_the_view(app, painted):
+    model, view = make_view(painted)
+    events = []
+    view.buttonClicked.connect(lambda index, payload: events.append((index, payload)))
+    view.linkActivated.connect(events.append)
+
+    bubble = view._live[0]
+    if painted:
+        bubble.body.buttonClicked.emit({"id": 1})
+        bubble.body.linkActivated.emit("https://example.com/docs")
+    else:
+        button = ButtonBlock("Run", {"id": 1})
+        bubble.add_block(button)
+        button.button.click()
+        bubble.body.findChild(Block, None).label.linkActivated.emit("https://example.com/docs")
+
+    assert events == [(0, {"id": 1}), "https://example.com/docs"]
+
+
+def test_released_bubbles_are_disconnected(app):
+    model, view = make_view(painted=True)
+    events = []
+    view.linkActivated.connect(events.append)
+
+    bubble = view._live[0]
+    view._release(0)
+    bubble.body.linkActivated.emit("https://example.com/docs")
+    assert events == []
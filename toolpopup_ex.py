@@ -1,6 +1,4 @@
-from PySide6.QtWidgets import *
-from PySide6.QtGui import *
-from PySide6.QtCore import *
+from PySide6.QtWidgets import QApplication, QLabel, QPushButton, QVBoxLayout, QWidget
 import sys
 
 from PopupMenu.popup_menu import PopupMenu
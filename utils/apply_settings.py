@@ -1,4 +1,5 @@
-from utils.theme import apply_theme, Theme
+from utils.theme import apply_theme, apply_palette_theme, Theme
+from ChatBubble.styles import register_theme_layers
 
 def apply_app_settings(app, settings):
     """
@@ -17,7 +18,15 @@ def apply_app_settings(app, settings):
         "system": Theme.SYSTEM,
     }
 
-    apply_theme(app, theme_map.get(theme_mode, Theme.DARK))
+    theme = theme_map.get(theme_mode, Theme.DARK)
+
+    register_theme_layers()
+
+    # Palette mode: later theme switches don't re-polish the whole app
+    if settings.get_setting("ui.theme.palette", False):
+        apply_palette_theme(app, theme)
+    else:
+        apply_theme(app, theme)
 
     # -------------------
     # UI Mode
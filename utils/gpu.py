@@ -0,0 +1,365 @@
+import os
+import shutil
+import subprocess
+import threading
+import time
+
+from utils.system_checker import GpuInfo, GpuProcess, _psutil
+
+
+MIB = 1024 ** 2
+
+# Fields of the two nvidia-smi queries (nvidia-smi can't mix them in one call)
+GPU_FIELDS = (
+    "index", "uuid", "name", "driver_version", "memory.total", "memory.used",
+    "utilization.gpu", "utilization.memory",
+)
+APP_FIELDS = ("gpu_uuid", "pid", "process_name", "used_memory")
+
+
+def _pynvml():
+    """
+    NVML bindings (nvidia-ml-py) are optional; None if not installed.
+    """
+    try:
+        import pynvml
+    except ImportError:
+        return None
+    return pynvml
+
+
+def _number(text: str):
+    """
+    nvidia-smi value as a float, None for "[N/A]" / "[Not Supported]".
+    """
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def _integer(text: str):
+    """
+    nvidia-smi index / pid as an int, None if it isn't a whole number
+    (e.g. "[Insufficient Permissions]").
+    """
+    value = _number(text)
+    return int(value) if value is not None and value.is_integer() else None
+
+
+def _text(value) -> str:
+    # Older pynvml versions return bytes
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class _SmiStream:
+    """
+    One long-running `nvidia-smi --query-... --loop-ms` process, read on a
+    daemon thread. nvidia-smi repeats the CSV header before every sample,
+    which is what delimits them.
+    """
+    RESTART_S = 10      # minimum delay before restarting an exited process
+
+    def __init__(self, command: list, header: str, on_frame, fixed_rows: bool = False):
+        """
+        :param fixed_rows: Every frame has as many rows as the previous one
+                           (one per GPU), so a frame can be delivered as soon
+                           as its last row arrives instead of at the next header.
+        """
+        self.command = command
+        self.header = header
+        self.on_frame = on_frame
+        self.fixed_rows = fixed_rows
+        self.process = None
+        self._started = None
+
+    def start(self) -> bool:
+        if self.is_running():
+            return True
+        now = time.monotonic()
+        if self._started is not None and now - self._started < self.RESTART_S:
+            # Exited recently (e.g. no devices): keep its last frame for now
+            return True
+        self._started = now
+        try:
+            self.process = subprocess.Popen(
+                self.command, stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL, text=True,
+            )
+        except OSError:
+            self.process = None
+            return False
+        threading.Thread(
+            target=self._read, args=(self.process,),
+            name="gpu-monitor", daemon=True,
+        ).start()
+        return True
+
+    def stop(self):
+        process, self.process = self.process, None
+        self._started = None
+        if process is not None and process.poll() is None:
+            process.terminate()
+
+    def is_running(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def _read(self, process):
+        rows = None
+        row_count = None    # rows of the last frame, if fixed_rows
+        delivered = False
+        for line in process.stdout:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith(self.header):
+                if rows is not None:
+                    self.on_frame(rows)
+                    row_count = len(rows) if self.fixed_rows else None
+                    delivered = True
+                rows = []
+            elif rows is not None:
+                rows.append([field.strip() for field in line.split(",")])
+                if len(rows) == row_count:
+                    self.on_frame(rows)
+                    rows = None
+        process.stdout.close()
+        # Otherwise a frame is complete once the next header or EOF arrives
+        if rows is not None:
+            self.on_frame(rows)
+        elif not delivered and process.wait() != 0:
+            # Failed before any output (e.g. "No devices were found")
+            self.on_frame([])
+
+
+class GpuMonitor:
+    """
+    Live NVIDIA GPU telemetry: utilization, memory and per-process usage.
+
+    Uses NVML in-process when the bindings (nvidia-ml-py) are installed.
+    Otherwise it keeps `nvidia-smi --loop-ms` streams running and sample()
+    returns the latest parsed frame, so polling never spawns a process.
+    Dead streams are restarted on the next sample().
+
+    :param executable: nvidia-smi to run (e.g. a fake script in tests).
+    :param interval_ms: nvidia-smi sampling interval.
+    :param use_nvml: False forces the nvidia-smi backend.
+    """
+    INTERVAL_MS = 1000
+
+    def __init__(self, executable: str = "nvidia-smi", interval_ms: int = INTERVAL_MS, use_nvml: bool = True):
+        self.executable = executable
+        self.interval_ms = interval_ms
+        self.use_nvml = use_nvml
+
+        self.backend = None     # "nvml" / "nvidia-smi" once started
+        self._nvml = None
+        self._lock = threading.Lock()
+        self._gpus = None       # latest GPU rows (nvidia-smi)
+        self._apps = []         # latest compute app rows (nvidia-smi)
+        self._ready = threading.Event()
+        self._streams = []
+
+    # ---------------------------------
+    # LIFECYCLE
+    # ---------------------------------
+    def start(self) -> bool:
+        """
+        Picks and starts a backend (idempotent).
+        Returns False if neither NVML nor nvidia-smi is available.
+        """
+        with self._lock:
+            if self.backend == "nvml":
+                return True
+            if self.backend == "nvidia-smi":
+                return all([stream.start() for stream in self._streams])
+
+            if self.use_nvml and self._start_nvml():
+                self.backend = "nvml"
+                return True
+            if self._start_smi():
+                self.backend = "nvidia-smi"
+                return True
+            return False
+
+    def stop(self):
+        with self._lock:
+            for stream in self._streams:
+                stream.stop()
+            self._streams = []
+            if self._nvml is not None:
+                try:
+                    self._nvml.nvmlShutdown()
+                except self._nvml.NVMLError:
+                    pass
+                self._nvml = None
+            self.backend = None
+            self._gpus = None
+            self._apps = []
+            self._ready.clear()
+
+    def _start_nvml(self) -> bool:
+        pynvml = _pynvml()
+        if pynvml is None:
+            return False
+        try:
+            pynvml.nvmlInit()
+        except pynvml.NVMLError:
+            # No driver / no GPU
+            return False
+        self._nvml = pynvml
+        self._ready.set()
+        return True
+
+    def _start_smi(self) -> bool:
+        executable = shutil.which(self.executable) or self.executable
+        if not os.path.isfile(executable):
+            return False
+
+        loop = f"--loop-ms={self.interval_ms}"
+        self._streams = [
+            _SmiStream(
+                [executable, f"--query-gpu={','.join(GPU_FIELDS)}", "--format=csv,nounits", loop],
+                GPU_FIELDS[0], self._on_gpus, fixed_rows=True,
+            ),
+            _SmiStream(
+                [executable, f"--query-compute-apps={','.join(APP_FIELDS)}", "--format=csv,nounits", loop],
+                APP_FIELDS[0], self._on_apps,
+            ),
+        ]
+        return all([stream.start() for stream in self._streams])
+
+    # ---------------------------------
+    # NVIDIA-SMI FRAMES (reader threads)
+    # ---------------------------------
+    def _on_gpus(self, rows):
+        rows = [row for row in rows if len(row) == len(GPU_FIELDS)]
+        with self._lock:
+            if self.backend == "nvml" or not self._streams:
+                return      # late frame from a stopped stream
+            self._gpus = rows
+        self._ready.set()
+
+    def _on_apps(self, rows):
+        rows = [row for row in rows if len(row) == len(APP_FIELDS)]
+        with self._lock:
+            if self.backend == "nvml" or not self._streams:
+                return
+            self._apps = rows
+
+    # ---------------------------------
+    # SAMPLING
+    # ---------------------------------
+    def sample(self, timeout: float = None):
+        """
+        Current GpuInfo list ([] if there are no GPUs), or None if no
+        backend is available or the first nvidia-smi frame didn't arrive
+        within timeout.
+        """
+        if not self.start():
+            return None
+        if self.backend == "nvml":
+            return self._sample_nvml()
+
+        if not self._ready.wait(timeout):
+            return None
+        with self._lock:
+            gpus, apps = self._gpus, self._apps
+
+        processes = {}
+        for uuid, pid, name, used in apps:
+            pid, used = _integer(pid), _number(used)
+            if pid is None:
+                continue
+            processes.setdefault(uuid, []).append(
+                GpuProcess(pid, name, int(used * MIB) if used is not None else None)
+            )
+
+        result = []
+        for index, uuid, name, driver, total, used, util, mem_util in gpus:
+            index = _integer(index)
+            if index is None:
+                continue
+            total, used = _number(total), _number(used)
+            result.append(GpuInfo(
+                name, int(total * MIB) if total is not None else None, driver,
+                index=index,
+                memory_used=int(used * MIB) if used is not None else None,
+                utilization=_number(util),
+                memory_utilization=_number(mem_util),
+                processes=processes.get(uuid, ()),
+            ))
+        return result
+
+    def _sample_nvml(self) -> list:
+        pynvml = self._nvml
+        try:
+            driver = _text(pynvml.nvmlSystemGetDriverVersion())
+            count = pynvml.nvmlDeviceGetCount()
+        except pynvml.NVMLError:
+            return []
+
+        result = []
+        for index in range(count):
+            # A device can fail on its own (e.g. it fell off the bus);
+            # report what it still answers instead of failing the sample
+            try:
+                handle = pynvml.nvmlDeviceGetHandleByIndex(index)
+            except pynvml.NVMLError:
+                continue
+            try:
+                name = _text(pynvml.nvmlDeviceGetName(handle))
+            except pynvml.NVMLError:
+                name = f"GPU {index}"
+            try:
+                memory = pynvml.nvmlDeviceGetMemoryInfo(handle)
+                memory_total, memory_used = memory.total, memory.used
+            except pynvml.NVMLError:
+                memory_total = memory_used = None
+            try:
+                rates = pynvml.nvmlDeviceGetUtilizationRates(handle)
+                utilization, memory_utilization = rates.gpu, rates.memory
+            except pynvml.NVMLError:
+                utilization = memory_utilization = None
+
+            result.append(GpuInfo(
+                name, memory_total, driver,
+                index=index,
+                memory_used=memory_used,
+                utilization=utilization,
+                memory_utilization=memory_utilization,
+                processes=self._nvml_processes(handle),
+            ))
+        return result
+
+    def _nvml_processes(self, handle) -> list:
+        pynvml = self._nvml
+        try:
+            running = pynvml.nvmlDeviceGetComputeRunningProcesses(handle)
+        except pynvml.NVMLError:
+            return []
+
+        processes = []
+        for process in running:
+            try:
+                name = _psutil().Process(process.pid).name()
+            except Exception:
+                name = ""
+            processes.append(GpuProcess(process.pid, name, process.usedGpuMemory))
+        return processes
+
+
+_monitor = None
+_monitor_lock = threading.Lock()
+
+
+def gpu_monitor() -> GpuMonitor:
+    """
+    Process-wide monitor (created on first use, from any thread).
+    """
+    global _monitor
+    if _monitor is None:
+        with _monitor_lock:
+            if _monitor is None:
+                _monitor = GpuMonitor()
+    return _monitor
@@ -1,10 +1,382 @@
-from PySide6.QtGui import QIcon, QPixmap, QPainter
+import json
+import math
+import mmap
+import os
+import struct
+from collections import OrderedDict
+from pathlib import Path
+
+from PySide6.QtGui import QGuiApplication, QIcon, QIconEngine, QImage, QPainter, QPixmap
 from PySide6.QtSvg import QSvgRenderer
-from PySide6.QtCore import QSize, Qt
+from PySide6.QtCore import QRect, QRectF, QSize, QStandardPaths, Qt
 
 from utils.paths import resource_path
 
-_icon_cache: dict[str, QIcon] = {}
+
+class IconCache:
+    """
+    Bounded LRU caches for icons (by path and size) and for the pixmaps
+    rendered from SVGs (by path, size, devicePixelRatio and mode), with
+    the pixmap memory accounted in bytes. GUI thread only.
+    """
+
+    def __init__(self, max_icons: int = 512, max_bytes: int = 32 * 1024 * 1024):
+        self.max_icons = max_icons
+        self.max_bytes = max_bytes
+
+        self._icons = OrderedDict()     # (path, w, h) -> QIcon
+        self._pixmaps = OrderedDict()   # (path, w, h, dpr, mode) -> (QPixmap, bytes)
+        self._bytes = 0
+
+        self.disk = None        # optional DiskIconCache, see enable_disk_cache()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # ---------------------------------
+    # ICONS
+    # ---------------------------------
+    def icon(self, key):
+        icon = self._icons.get(key)
+        if icon is not None:
+            self._icons.move_to_end(key)
+        return icon
+
+    def put_icon(self, key, icon: QIcon):
+        self._icons[key] = icon
+        self._icons.move_to_end(key)
+        while len(self._icons) > self.max_icons:
+            self._icons.popitem(last=False)
+
+    # ---------------------------------
+    # PIXMAPS
+    # ---------------------------------
+    def pixmap(self, key):
+        entry = self._pixmaps.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._pixmaps.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put_pixmap(self, key, pixmap: QPixmap):
+        size = pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+        old = self._pixmaps.pop(key, None)
+        if old is not None:
+            self._bytes -= old[1]
+        self._pixmaps[key] = (pixmap, size)
+        self._bytes += size
+
+        while self._bytes > self.max_bytes and len(self._pixmaps) > 1:
+            _, (_, evicted) = self._pixmaps.popitem(last=False)
+            self._bytes -= evicted
+            self.evictions += 1
+
+    # ---------------------------------
+    # HOUSEKEEPING
+    # ---------------------------------
+    def clear(self):
+        self._icons.clear()
+        self._pixmaps.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict:
+        stats = {
+            "icons": len(self._icons),
+            "pixmaps": len(self._pixmaps),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+        if self.disk is not None:
+            stats["disk"] = self.disk.stats()
+        return stats
+
+
+class DiskIconCache:
+    """
+    Rendered icon pixels persisted in one packed file, so warm starts skip
+    SVG parsing and rendering entirely.
+
+    Layout: MAGIC, uint32 index length, JSON index, then raw
+    ARGB32-premultiplied pixels. Entries are keyed by source path, source
+    mtime, size, devicePixelRatio and mode; a changed source file simply
+    stops matching, and stale entries are dropped on the next save().
+    The file is memory-mapped and only the requested pixels are read.
+    Renders are kept in memory until save(), which also runs on its own
+    once they exceed max_pending_bytes.
+    """
+    MAGIC = b"PYICONS1"
+    HEADER = struct.Struct("<8sI")
+
+    def __init__(self, path, max_pending_bytes: int = 4 * 1024 * 1024):
+        self.path = Path(path)
+        self.max_pending_bytes = max_pending_bytes
+        self._index = {}        # key -> (offset, width, height, bytes_per_line)
+        self._pending = {}      # key -> QImage rendered since the last save
+        self._pending_bytes = 0
+        self._file = None
+        self._map = None
+        self._data_start = 0
+
+        self.hits = 0
+        self.misses = 0
+        self._open()
+
+    @staticmethod
+    def key(source: str, mtime_ns: int, size: QSize, scale: float, disabled: bool) -> tuple:
+        return source, mtime_ns, size.width(), size.height(), scale, disabled
+
+    # ---------------------------------
+    # READ
+    # ---------------------------------
+    def _open(self):
+        try:
+            self._file = self.path.open("rb")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, index_len = self.HEADER.unpack_from(self._map, 0)
+            if magic != self.MAGIC:
+                raise ValueError("not an icon cache")
+            start = self.HEADER.size
+            index = json.loads(self._map[start:start + index_len])
+            self._data_start = start + index_len
+            self._index = {tuple(entry[:6]): self._checked(entry[6:]) for entry in index}
+        except (OSError, ValueError, TypeError, struct.error):
+            # Missing, empty, truncated or corrupt: start over
+            self._close()
+
+    def _checked(self, entry) -> tuple:
+        """
+        Index entry, if its pixels lie within the file (a truncated pack
+        must never make an image read past the map).
+        """
+        offset, width, height, bpl = entry
+        data_size = len(self._map) - self._data_start
+        if (min(offset, width, height) < 0 or bpl < width * 4
+                or offset + height * bpl > data_size):
+            raise ValueError("icon cache entry out of range")
+        return offset, width, height, bpl
+
+    def _close(self):
+        if self._map is not None:
+            self._map.close()
+        if self._file is not None:
+            self._file.close()
+        self._map = self._file = None
+        self._index = {}
+
+    def _read(self, key) -> bytes:
+        offset, _, height, bpl = self._index[key]
+        start = self._data_start + offset
+        return self._map[start:start + height * bpl]
+
+    def image(self, key):
+        """
+        Cached image for key, or None.
+        """
+        image = self._pending.get(key)
+        if image is not None:
+            self.hits += 1
+            return image
+
+        entry = self._index.get(key)
+        if entry is None or self._map is None:
+            self.misses += 1
+            return None
+
+        _, width, height, bpl = entry
+        self.hits += 1
+        # copy() detaches the image from the temporary buffer
+        return QImage(self._read(key), width, height, bpl, QImage.Format_ARGB32_Premultiplied).copy()
+
+    def put(self, key, image: QImage):
+        if image.format() != QImage.Format_ARGB32_Premultiplied:
+            image = image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+
+        old = self._pending.pop(key, None)
+        if old is not None:
+            self._pending_bytes -= old.sizeInBytes()
+        self._pending[key] = image
+        self._pending_bytes += image.sizeInBytes()
+
+        if self._pending_bytes > self.max_pending_bytes:
+            self.save()
+
+    # ---------------------------------
+    # WRITE
+    # ---------------------------------
+    def save(self):
+        """
+        Rewrites the pack with this session's renders plus the previous
+        entries whose source file is unchanged. Written atomically.
+        """
+        if not self._pending and self._map is not None:
+            return
+
+        mtimes = {}
+
+        def current(source):
+            if source not in mtimes:
+                try:
+                    mtimes[source] = os.stat(source).st_mtime_ns
+                except OSError:
+                    mtimes[source] = None
+            return mtimes[source]
+
+        chunks = []     # (key, width, height, bpl, bytes)
+        for key, (_, width, height, bpl) in self._index.items():
+            if key not in self._pending and current(key[0]) == key[1]:
+                chunks.append((key, width, height, bpl, self._read(key)))
+        for key, image in self._pending.items():
+            if current(key[0]) == key[1]:
+                chunks.append((key, image.width(), image.height(), image.bytesPerLine(), bytes(image.constBits())))
+
+        index, offset = [], 0
+        for key, width, height, bpl, data in chunks:
+            index.append([*key, offset, width, height, bpl])
+            offset += len(data)
+        index_bytes = json.dumps(index).encode("utf-8")
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with tmp.open("wb") as f:
+            f.write(self.HEADER.pack(self.MAGIC, len(index_bytes)))
+            f.write(index_bytes)
+            for chunk in chunks:
+                f.write(chunk[4])
+
+        # The map must be closed before the file can be replaced on Windows
+        self._close()
+        os.replace(tmp, self.path)
+        self._pending.clear()
+        self._pending_bytes = 0
+        self._open()
+
+    def clear(self):
+        self._close()
+        self._pending.clear()
+        self._pending_bytes = 0
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._index),
+            "pending": len(self._pending),
+            "pending_bytes": self._pending_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+ICON_CACHE = IconCache()
+
+
+class SvgIconEngine(QIconEngine):
+    """
+    Renders an SVG lazily at each requested size and devicePixelRatio
+    (sharp on HiDPI screens). Pixmaps are kept in ICON_CACHE, so icons of
+    the same file share them.
+    """
+    DISABLED_OPACITY = 0.4
+
+    def __init__(self, path: str, size: QSize = QSize(24, 24), cache: IconCache = ICON_CACHE):
+        super().__init__()
+        self.path = path
+        self.size = QSize(size)
+        self.cache = cache
+        self._renderer = None   # parsed on first render
+        self._mtime = None
+
+    def _get_renderer(self) -> QSvgRenderer:
+        if self._renderer is None:
+            self._renderer = QSvgRenderer(self.path)
+            self._renderer.setAspectRatioMode(Qt.KeepAspectRatio)
+        return self._renderer
+
+    # ---------------------------------
+    # QIconEngine
+    # ---------------------------------
+    def paint(self, painter: QPainter, rect, mode, state):
+        device = painter.device()
+        scale = device.devicePixelRatioF() if device is not None else 1.0
+        painter.drawPixmap(rect, self.scaledPixmap(rect.size(), mode, state, scale))
+
+    def pixmap(self, size: QSize, mode, state) -> QPixmap:
+        return self.scaledPixmap(size, mode, state, 1.0)
+
+    def scaledPixmap(self, size: QSize, mode, state, scale: float) -> QPixmap:
+        scale = round(scale, 2) or 1.0
+        key = (self.path, size.width(), size.height(), scale, mode == QIcon.Disabled)
+
+        pixmap = self.cache.pixmap(key)
+        if pixmap is None:
+            pixmap = self._load(size, scale, mode == QIcon.Disabled)
+            self.cache.put_pixmap(key, pixmap)
+        return pixmap
+
+    def actualSize(self, size: QSize, mode, state) -> QSize:
+        return size
+
+    def availableSizes(self, mode=QIcon.Normal, state=QIcon.Off):
+        return [QSize(self.size)]
+
+    def isNull(self) -> bool:
+        # Checked by widgets on setIcon(); don't parse the SVG for it
+        return not os.path.isfile(self.path)
+
+    def key(self) -> str:
+        return "SvgIconEngine"
+
+    def clone(self):
+        return SvgIconEngine(self.path, self.size, self.cache)
+
+    # ---------------------------------
+    # RENDERING
+    # ---------------------------------
+    def _load(self, size: QSize, scale: float, disabled: bool) -> QPixmap:
+        """
+        Pixels from the disk cache if enabled and current, else rendered.
+        """
+        disk = self.cache.disk
+        if disk is None:
+            image = self._render(size, scale, disabled)
+        else:
+            if self._mtime is None:
+                try:
+                    self._mtime = os.stat(self.path).st_mtime_ns
+                except OSError:
+                    self._mtime = 0
+            key = disk.key(self.path, self._mtime, size, scale, disabled)
+            image = disk.image(key)
+            if image is None:
+                image = self._render(size, scale, disabled)
+                disk.put(key, image)
+
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(scale)
+        return pixmap
+
+    def _render(self, size: QSize, scale: float, disabled: bool) -> QImage:
+        width = max(1, math.ceil(size.width() * scale))
+        height = max(1, math.ceil(size.height() * scale))
+
+        image = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+        image.fill(Qt.transparent)
+
+        painter = QPainter(image)
+        if disabled:
+            painter.setOpacity(self.DISABLED_OPACITY)
+        self._get_renderer().render(painter, QRectF(0, 0, width, height))
+        painter.end()
+        return image
+
 
 def load_icon(
         relative_path: str,
@@ -12,32 +384,239 @@ def load_icon(
 ) -> QIcon:
     """
     Load and cache icons.
-    Supports PNG/JPG/etc natively and SVG via QSvgRenderer.
+    Supports PNG/JPG/etc natively and SVG via SvgIconEngine
+    (rendered on demand for each size / devicePixelRatio).
     """
 
-    cache_key = f"{relative_path}:{size.width()}x{size.height()}"
-    if cache_key in _icon_cache:
-        return _icon_cache[cache_key]
-    
+    cache_key = (relative_path, size.width(), size.height())
+    icon = ICON_CACHE.icon(cache_key)
+    if icon is not None:
+        return icon
+
     path = resource_path(relative_path)
-    icon = QIcon()
 
     if path.suffix.lower() == ".svg":
-        # Render SVG -> Pixmap
-        renderer = QSvgRenderer(str(path))
+        icon = QIcon(SvgIconEngine(str(path), size))
+    else:
+        # PNG, JPG, ICO, etc
+        icon = QIcon(str(path))
+
+    ICON_CACHE.put_icon(cache_key, icon)
+    return icon
+
+
+def enable_disk_cache(path=None) -> DiskIconCache:
+    """
+    Persists rendered SVG icons between runs (saved when the app quits).
+    Default location: <cache dir>/icons.pack.
+    """
+    if path is None:
+        cache_dir = QStandardPaths.writableLocation(QStandardPaths.CacheLocation)
+        path = Path(cache_dir) / "icons.pack"
+
+    disk = DiskIconCache(path)
+    ICON_CACHE.disk = disk
+
+    app = QGuiApplication.instance()
+    if app is not None:
+        app.aboutToQuit.connect(disk.save)
+    return disk
+
+
+def _screen_ratios() -> list:
+    app = QGuiApplication.instance()
+    if app is None:
+        return [1.0]
+    return sorted({screen.devicePixelRatio() for screen in app.screens()}) or [1.0]
+
+
+def warm_icons(relative_paths, sizes=(QSize(24, 24),), ratios=None) -> int:
+    """
+    Loads icons and renders their pixmaps ahead of time (e.g. at startup),
+    for every size and devicePixelRatio (default: those of the connected screens).
+    Returns the number of pixmaps rendered or found in the cache.
+    """
+    ratios = ratios or _screen_ratios()
+    count = 0
+    for relative_path in relative_paths:
+        for size in sizes:
+            icon = load_icon(relative_path, size)
+            for ratio in ratios:
+                if not icon.pixmap(size, ratio).isNull():
+                    count += 1
+    return count
+
+
+class IconAtlas:
+    """
+    Packs a set of icons of one size into a single sheet pixmap per
+    devicePixelRatio, so a toolbar or a large menu keeps one pixmap instead
+    of one per icon. Icons handed out by icon() draw sub-rects of the sheet.
+
+    Sheets are rendered on first request for a DPR; the SVGs are parsed
+    once per sheet and not kept.
+
+    :param cache: Holds the pixmap copies of pixmap() requests (see
+                  AtlasIconEngine).
+    """
+    DISABLED_OPACITY = SvgIconEngine.DISABLED_OPACITY
 
-        pixmap = QPixmap(size)
-        pixmap.fill(Qt.transparent)
+    def __init__(self, relative_paths, size: QSize = QSize(24, 24), cache: IconCache = ICON_CACHE):
+        self.size = QSize(size)
+        self.cache = cache
+        self._index = {p: i for i, p in enumerate(dict.fromkeys(relative_paths))}
+        self.paths = [str(resource_path(p)) for p in self._index]
+        self.columns = max(1, math.ceil(math.sqrt(len(self.paths))))
 
-        painter = QPainter(pixmap)
-        renderer.render(painter)
+        self._sheets = {}       # scale -> QPixmap
+        self._icons = {}        # relative path -> QIcon
+
+    def icon(self, relative_path: str) -> QIcon:
+        icon = self._icons.get(relative_path)
+        if icon is None:
+            icon = QIcon(AtlasIconEngine(self, self._index[relative_path]))
+            self._icons[relative_path] = icon
+        return icon
+
+    def __contains__(self, relative_path) -> bool:
+        return relative_path in self._index
+
+    def __len__(self):
+        return len(self.paths)
+
+    # ---------------------------------
+    # SHEETS
+    # ---------------------------------
+    def cell(self, scale: float) -> QSize:
+        return QSize(
+            max(1, math.ceil(self.size.width() * scale)),
+            max(1, math.ceil(self.size.height() * scale)),
+        )
+
+    def source(self, index: int, scale: float):
+        """
+        (sheet, source rect in device pixels) of an icon at a DPR.
+        """
+        scale = round(scale, 2) or 1.0
+        sheet = self._sheets.get(scale)
+        if sheet is None:
+            sheet = self._sheets[scale] = self._build(scale)
+
+        cell = self.cell(scale)
+        row, column = divmod(index, self.columns)
+        return sheet, QRect(column * cell.width(), row * cell.height(), cell.width(), cell.height())
+
+    def _build(self, scale: float) -> QPixmap:
+        cell = self.cell(scale)
+        rows = max(1, math.ceil(len(self.paths) / self.columns))
+        image = QImage(self.columns * cell.width(), rows * cell.height(), QImage.Format_ARGB32_Premultiplied)
+        image.fill(Qt.transparent)
+
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        for index, path in enumerate(self.paths):
+            row, column = divmod(index, self.columns)
+            target = QRectF(column * cell.width(), row * cell.height(), cell.width(), cell.height())
+            if path.lower().endswith(".svg"):
+                renderer = QSvgRenderer(path)
+                renderer.setAspectRatioMode(Qt.KeepAspectRatio)
+                renderer.render(painter, target)
+            else:
+                source = QImage(path)
+                if not source.isNull():
+                    source = source.scaled(cell, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                    painter.drawImage(target.topLeft(), source)
         painter.end()
 
-        icon.addPixmap(pixmap)
-    
-    else:
-        # PNG, JPG, ICO, etc
-        icon = QIcon(str(path))
-    
-    _icon_cache[cache_key] = icon
-    return icon
\ No newline at end of file
+        sheet = QPixmap.fromImage(image)
+        sheet.setDevicePixelRatio(scale)
+        return sheet
+
+    def stats(self) -> dict:
+        return {
+            "icons": len(self.paths),
+            "sheets": len(self._sheets),
+            "bytes": sum(
+                sheet.width() * sheet.height() * max(sheet.depth(), 8) // 8
+                for sheet in self._sheets.values()
+            ),
+        }
+
+
+class AtlasIconEngine(QIconEngine):
+    """
+    One icon of an IconAtlas. paint() draws straight from the sheet;
+    pixmap requests (QPushButton and most styles) get a copy of the
+    sub-rect, kept in the atlas' IconCache so repaints don't copy again.
+    """
+
+    def __init__(self, atlas: IconAtlas, index: int):
+        super().__init__()
+        self.atlas = atlas
+        self.index = index
+
+    def paint(self, painter: QPainter, rect, mode, state):
+        device = painter.device()
+        scale = device.devicePixelRatioF() if device is not None else 1.0
+        sheet, source = self.atlas.source(self.index, scale)
+
+        painter.save()
+        if mode == QIcon.Disabled:
+            painter.setOpacity(painter.opacity() * self.atlas.DISABLED_OPACITY)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        painter.drawPixmap(QRectF(rect), sheet, QRectF(source))
+        painter.restore()
+
+    def pixmap(self, size: QSize, mode, state) -> QPixmap:
+        return self.scaledPixmap(size, mode, state, 1.0)
+
+    def scaledPixmap(self, size: QSize, mode, state, scale: float) -> QPixmap:
+        scale = round(scale, 2) or 1.0
+        atlas = self.atlas
+        key = (
+            "atlas", atlas.paths[self.index], atlas.size.width(), atlas.size.height(),
+            size.width(), size.height(), scale, mode == QIcon.Disabled,
+        )
+
+        pixmap = atlas.cache.pixmap(key)
+        if pixmap is None:
+            pixmap = self._copy(size, mode, scale)
+            atlas.cache.put_pixmap(key, pixmap)
+        return pixmap
+
+    def _copy(self, size: QSize, mode, scale: float) -> QPixmap:
+        sheet, source = self.atlas.source(self.index, scale)
+        pixmap = sheet.copy(source)
+        pixmap.setDevicePixelRatio(sheet.devicePixelRatio())
+
+        if size != self.atlas.size:
+            # Off-size requests are rare (the atlas size is the icon size)
+            target = QSize(max(1, math.ceil(size.width() * scale)), max(1, math.ceil(size.height() * scale)))
+            pixmap = pixmap.scaled(target, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            pixmap.setDevicePixelRatio(sheet.devicePixelRatio())
+
+        if mode == QIcon.Disabled:
+            dimmed = QPixmap(pixmap.size())
+            dimmed.setDevicePixelRatio(pixmap.devicePixelRatio())
+            dimmed.fill(Qt.transparent)
+            painter = QPainter(dimmed)
+            painter.setOpacity(self.atlas.DISABLED_OPACITY)
+            painter.drawPixmap(0, 0, pixmap)
+            painter.end()
+            pixmap = dimmed
+        return pixmap
+
+    def actualSize(self, size: QSize, mode, state) -> QSize:
+        return size
+
+    def availableSizes(self, mode=QIcon.Normal, state=QIcon.Off):
+        return [QSize(self.atlas.size)]
+
+    def isNull(self) -> bool:
+        return False
+
+    def key(self) -> str:
+        return "AtlasIconEngine"
+
+    def clone(self):
+        return AtlasIconEngine(self.atlas, self.index)
@@ -0,0 +1,301 @@
+import math
+import threading
+import time
+from array import array
+from bisect import bisect_left
+
+from utils.system_checker import _psutil
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# -----------------------------
+# RING BUFFER
+# -----------------------------
+class RingBuffer:
+    """
+    Fixed-capacity numeric history. Storage is allocated once (a NumPy
+    array if available, else array.array); append() overwrites the oldest
+    value in place.
+    """
+
+    def __init__(self, capacity: int, typecode: str = "d"):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        if numpy is not None:
+            self._data = numpy.zeros(capacity, dtype=numpy.dtype(typecode))
+        else:
+            self._data = array(typecode, bytes(capacity * array(typecode).itemsize))
+        self._next = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def append(self, value):
+        self._data[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def clear(self):
+        self._next = 0
+        self._count = 0
+
+    def latest(self, default=None):
+        if not self._count:
+            return default
+        return self._data[self._next - 1].item() if numpy is not None else self._data[self._next - 1]
+
+    def values(self, last: int = None):
+        """
+        The last `last` values (default all), oldest first.
+        A NumPy array if NumPy is available, else a list.
+        """
+        count = self._count if last is None else max(0, min(last, self._count))
+        start = self._next - count
+        if numpy is not None:
+            if start >= 0:
+                return self._data[start:self._next].copy()
+            return numpy.concatenate((self._data[start:], self._data[:self._next]))
+        if start >= 0:
+            return self._data[start:self._next].tolist()
+        return self._data[start:].tolist() + self._data[:self._next].tolist()
+
+    def count_from(self, threshold) -> int:
+        """
+        Number of values >= threshold, for contents in ascending order
+        (e.g. timestamps). Binary search on the stored segments; nothing
+        is copied.
+        """
+        if numpy is not None:
+            def below(lo, hi):
+                return int(numpy.searchsorted(self._data[lo:hi], threshold))
+        else:
+            def below(lo, hi):
+                return bisect_left(self._data, threshold, lo, hi) - lo
+
+        if self._count < self.capacity:
+            spans = ((0, self._count),)
+        else:
+            spans = ((self._next, self.capacity), (0, self._next))
+        return self._count - sum(below(lo, hi) for lo, hi in spans)
+
+    # ---------------------------------
+    # AGGREGATES
+    # ---------------------------------
+    def min(self, last: int = None):
+        values = self.values(last)
+        if not len(values):
+            return None
+        return float(values.min()) if numpy is not None else min(values)
+
+    def max(self, last: int = None):
+        values = self.values(last)
+        if not len(values):
+            return None
+        return float(values.max()) if numpy is not None else max(values)
+
+    def mean(self, last: int = None):
+        values = self.values(last)
+        if not len(values):
+            return None
+        if numpy is not None:
+            return float(values.mean())
+        return math.fsum(values) / len(values)
+
+    def percentile(self, q: float, last: int = None):
+        """
+        q-th percentile (0-100), linearly interpolated like numpy.percentile.
+        """
+        values = self.values(last)
+        if not len(values):
+            return None
+        if numpy is not None:
+            return float(numpy.percentile(values, q))
+
+        values = sorted(values)
+        position = (len(values) - 1) * q / 100
+        low = math.floor(position)
+        high = min(low + 1, len(values) - 1)
+        return values[low] + (values[high] - values[low]) * (position - low)
+
+
+# -----------------------------
+# SAMPLER
+# -----------------------------
+class MetricsSampler:
+    """
+    Records system and process usage every `interval` seconds on a daemon
+    thread into one RingBuffer per metric (raw numbers, not strings).
+
+    Metrics (see METRICS): CPU and memory percent, memory used (bytes),
+    disk read/write throughput (bytes/s) and, for the watched process
+    (default: this one), CPU percent and resident memory (bytes).
+    """
+    METRICS = (
+        "cpu_percent",
+        "memory_percent",
+        "memory_used",
+        "disk_read_bps",
+        "disk_write_bps",
+        "process_cpu_percent",
+        "process_rss",
+    )
+
+    def __init__(self, interval: float = 1.0, capacity: int = 3600, pid: int = None):
+        self.interval = interval
+        self.capacity = capacity
+
+        self.timestamps = RingBuffer(capacity)
+        self.buffers = {name: RingBuffer(capacity) for name in self.METRICS}
+
+        self._psutil = _psutil()
+        self._process = self._psutil.Process(pid)
+        self._disk_io = None    # (time, read_bytes, write_bytes) of the previous sample
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.last_error = None  # message of the last failed sample
+        self.failures = 0       # samples skipped because of an error
+
+        # The first cpu_percent(None) calls only set the baseline
+        self._psutil.cpu_percent(None)
+        self._process.cpu_percent(None)
+
+    # ---------------------------------
+    # LIFECYCLE
+    # ---------------------------------
+    def start(self):
+        """
+        Starts sampling (idempotent).
+        """
+        if self.is_running():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="metrics-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self, wait: bool = True):
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if wait and thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        next_time = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                self.sample()
+            except self._psutil.NoSuchProcess as e:
+                # The watched process exited
+                self.last_error = str(e)
+                self._stop.set()
+                break
+            except Exception as e:
+                # Anything else (access denied, a transient OS error):
+                # skip this sample and keep the schedule
+                self.last_error = f"{type(e).__name__}: {e}"
+                self.failures += 1
+            # Fixed schedule, so slow samples don't drift the interval
+            next_time += self.interval
+            self._stop.wait(max(0.0, next_time - time.monotonic()))
+
+    # ---------------------------------
+    # SAMPLING
+    # ---------------------------------
+    def sample(self):
+        """
+        Takes one sample now (also usable without start()).
+        """
+        psutil = self._psutil
+        now = time.time()
+        memory = psutil.virtual_memory()
+
+        read_bps = write_bps = 0.0
+        io = psutil.disk_io_counters()
+        if io is not None:
+            previous = self._disk_io
+            self._disk_io = (now, io.read_bytes, io.write_bytes)
+            if previous is not None and now > previous[0]:
+                elapsed = now - previous[0]
+                read_bps = (io.read_bytes - previous[1]) / elapsed
+                write_bps = (io.write_bytes - previous[2]) / elapsed
+
+        with self._process.oneshot():
+            process_cpu = self._process.cpu_percent(None)
+            process_rss = self._process.memory_info().rss
+
+        values = (
+            psutil.cpu_percent(None),
+            memory.percent,
+            memory.used,
+            read_bps,
+            write_bps,
+            process_cpu,
+            process_rss,
+        )
+        with self._lock:
+            self.timestamps.append(now)
+            for name, value in zip(self.METRICS, values):
+                self.buffers[name].append(value)
+
+    def clear(self):
+        with self._lock:
+            self.timestamps.clear()
+            for buffer in self.buffers.values():
+                buffer.clear()
+            self._disk_io = None
+
+    # ---------------------------------
+    # QUERIES
+    # ---------------------------------
+    def latest(self) -> dict:
+        """
+        Most recent value of every metric (None before the first sample).
+        """
+        with self._lock:
+            return {name: buffer.latest() for name, buffer in self.buffers.items()}
+
+    def _window(self, seconds: float) -> int:
+        """
+        Number of samples taken in the last `seconds` seconds.
+        """
+        if seconds is None:
+            return None
+        return self.timestamps.count_from(time.time() - seconds)
+
+    def series(self, name: str, seconds: float = None):
+        """
+        (timestamps, values) of a metric, oldest first.
+        """
+        with self._lock:
+            last = self._window(seconds)
+            return self.timestamps.values(last), self.buffers[name].values(last)
+
+    def summary(self, name: str, seconds: float = None, percentiles=(50, 95)) -> dict:
+        """
+        min / max / mean and percentiles of a metric, over the last
+        `seconds` seconds (default: the whole history).
+        """
+        with self._lock:
+            last = self._window(seconds)
+            buffer = self.buffers[name]
+            summary = {
+                "count": len(buffer) if last is None else min(last, len(buffer)),
+                "min": buffer.min(last),
+                "max": buffer.max(last),
+                "mean": buffer.mean(last),
+            }
+            for q in percentiles:
+                summary[f"p{q:g}"] = buffer.percentile(q, last)
+        return summary
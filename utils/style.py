@@ -1,12 +1,169 @@
+import os
+import re
+from pathlib import Path
+
 from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QFileSystemWatcher, QTimer
 from utils.paths import resource_path
 
-def load_stylesheet(app: QApplication, filename: str = "assets/styles/theme.qss"):
-    qss_path = resource_path(filename)
 
-    if not qss_path.exists():
-        print(f"[WARNING] QSS file not found {qss_path}")
-        return
-    
-    with qss_path.open("r", encoding="utf-8") as f:
-        app.setStyleSheet(f.read())
\ No newline at end of file
+class StyleSheetService:
+    """
+    Reads, preprocesses and applies QSS.
+
+    - File contents are cached by (mtime, size); unchanged files are never re-read.
+    - Variables are substituted once per distinct set of inputs:
+        @accent: #58a6ff;           (definition, top level of a file)
+        color: @accent;             (reference)
+      Variables passed in by the caller (e.g. palette tokens) override file
+      definitions.
+    - apply() skips app.setStyleSheet() when the result is identical to the
+      stylesheet already applied, since every set re-polishes all widgets.
+    - watch() re-applies when a file changes on disk (theme development).
+    """
+    DEFINITION_PATTERN = re.compile(r"^[ \t]*@([\w-]+)[ \t]*:[ \t]*([^;\n]+);[ \t]*\n?", re.M)
+    REFERENCE_PATTERN = re.compile(r"@([\w-]+)")
+    WATCH_DELAY_MS = 100
+
+    def __init__(self):
+        self._files = {}        # path -> (stamp, text)
+        self._compiled = {}     # (paths, variables) -> (stamps, qss)
+        self._missing = set()
+        self._watchers = {}     # id(app) -> (QFileSystemWatcher, QTimer)
+
+    # ---------------------------------
+    # FILES
+    # ---------------------------------
+    def read(self, path) -> str:
+        """
+        Contents of a QSS file ("" if missing), cached by mtime.
+        """
+        path = Path(path)
+        stamp = self._stamp(path)
+        if stamp is None:
+            if path not in self._missing:
+                self._missing.add(path)
+                print(f"[WARNING] QSS file not found {path}")
+            return ""
+        self._missing.discard(path)
+
+        cached = self._files.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        text = path.read_text(encoding="utf-8")
+        self._files[path] = (stamp, text)
+        return text
+
+    def invalidate(self, path=None):
+        """
+        Forgets cached contents (of one file, or all).
+        """
+        if path is None:
+            self._files.clear()
+            self._compiled.clear()
+        else:
+            self._files.pop(Path(path), None)
+
+    @staticmethod
+    def _stamp(path: Path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    # ---------------------------------
+    # PREPROCESSING
+    # ---------------------------------
+    def compile(self, paths, variables: dict | None = None) -> str:
+        """
+        Concatenates the files and substitutes variables.
+        Recomputed only when a file or the variables change.
+        """
+        paths = tuple(Path(p) for p in paths)
+        key = (paths, frozenset((variables or {}).items()))
+
+        texts = [self.read(path) for path in paths]
+        stamps = tuple(self._files[p][0] if p in self._files else None for p in paths)
+
+        cached = self._compiled.get(key)
+        if cached is not None and cached[0] == stamps:
+            return cached[1]
+
+        qss = self.preprocess("\n".join(texts), variables)
+        self._compiled[key] = (stamps, qss)
+        return qss
+
+    def preprocess(self, qss: str, variables: dict | None = None) -> str:
+        defined = {name: value.strip() for name, value in self.DEFINITION_PATTERN.findall(qss)}
+        if not defined and not variables:
+            return qss
+
+        defined.update(variables or {})
+        qss = self.DEFINITION_PATTERN.sub("", qss)
+        # Unknown names are left alone
+        return self.REFERENCE_PATTERN.sub(
+            lambda m: str(defined.get(m.group(1), m.group(0))), qss
+        )
+
+    # ---------------------------------
+    # APPLYING
+    # ---------------------------------
+    def apply_text(self, app: QApplication, qss: str) -> bool:
+        """
+        Sets the app stylesheet unless it is already exactly qss.
+        Returns True if it was set.
+        """
+        if app.styleSheet() == qss:
+            return False
+        app.setStyleSheet(qss)
+        return True
+
+    def apply(self, app: QApplication, paths, variables: dict | None = None) -> bool:
+        return self.apply_text(app, self.compile(paths, variables))
+
+    def watch(self, app: QApplication, paths, variables: dict | None = None):
+        """
+        Re-applies paths whenever one of them changes on disk.
+        Replaces any previous watch on the same app.
+        """
+        self.unwatch(app)
+        paths = [Path(p) for p in paths]
+
+        watcher = QFileSystemWatcher([str(p) for p in paths if p.exists()], app)
+        timer = QTimer(app)
+        timer.setSingleShot(True)
+        timer.setInterval(self.WATCH_DELAY_MS)
+
+        def on_changed(changed: str):
+            self.invalidate(changed)
+            # Editors that save by rename drop the file from the watcher
+            if changed not in watcher.files() and os.path.exists(changed):
+                watcher.addPath(changed)
+            timer.start()
+
+        watcher.fileChanged.connect(on_changed)
+        timer.timeout.connect(lambda: self.apply(app, paths, variables))
+        self._watchers[id(app)] = (watcher, timer)
+
+    def unwatch(self, app: QApplication):
+        entry = self._watchers.pop(id(app), None)
+        if entry is not None:
+            for obj in entry:
+                obj.deleteLater()
+
+
+STYLESHEETS = StyleSheetService()
+
+
+def load_stylesheet(app: QApplication, filename: str | list = "assets/styles/theme.qss", watch: bool = False):
+    """
+    :param filename: One QSS file, or a list applied in order
+                     (e.g. ChatBubble/components.qss + ChatBubble/dark.qss).
+    """
+    filenames = [filename] if isinstance(filename, str) else filename
+    qss_paths = [resource_path(name) for name in filenames]
+    STYLESHEETS.apply(app, qss_paths)
+    if watch:
+        STYLESHEETS.watch(app, qss_paths)
@@ -1,13 +1,32 @@
+import copy
 import platform
 import sys
-import psutil
-import subprocess
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+
+def _psutil():
+    """
+    psutil is only needed for hardware info; import it on first use.
+    """
+    import psutil
+    return psutil
 
 
 # -----------------------------
 # OS / SOFTWARE INFO
 # -----------------------------
 class OSInfo:
+    """
+    OS facts don't change while the process runs: they are computed once,
+    on first use, and shared by all instances. refresh() recomputes them.
+    Thread-safe.
+    """
+    _info = None
+    _lock = threading.Lock()
+
     def __init__(self):
         pass
 
@@ -16,7 +35,36 @@ class OSInfo:
         Returns a dictionary with normailized
         OS Information & OS-specific details
         """
+        # Copied so callers can't modify the shared facts
+        return copy.deepcopy(self._cached())
+
+    def get_os(self):
+        """
+        Returns only the normaized OS name
+        """
+        return self._cached()["os"]
+
+    def refresh(self):
+        """
+        Recomputes the facts (e.g. after an in-place OS upgrade in a
+        long-running process) and returns them.
+        """
+        info = self._collect_os_info()
+        with OSInfo._lock:
+            OSInfo._info = info
+        return copy.deepcopy(info)
 
+    def _cached(self):
+        info = OSInfo._info
+        if info is None:
+            with OSInfo._lock:
+                # Another thread may have filled it while we waited
+                if OSInfo._info is None:
+                    OSInfo._info = self._collect_os_info()
+                info = OSInfo._info
+        return info
+
+    def _collect_os_info(self):
         system = platform.system().lower()
 
         os_info = {
@@ -46,12 +94,6 @@ class OSInfo:
         
         return os_info
     
-    def get_os(self):
-        """
-        Returns only the normaized OS name
-        """
-        return self.get_os_info()["os"]
-    
     # ---------------- Windows ----------------
     def _get_windows_info(self):
         info = {}
@@ -118,105 +160,388 @@ class OSInfo:
             "12": "Monterey",
             "13": "Ventura",
             "14": "Sonoma",
+            "15": "Sequoia",
         }
 
+        # Compare whole components: "10.15.7" is 10.15, "14.2" is 14
+        parts = version.split(".")
         for key in mapping:
-            if version.startswith(key):
-                return mapping(key)
+            if parts[:key.count(".") + 1] == key.split("."):
+                return mapping[key]
         
         return "Unknown"
 # -----------------------------
 
 
+# -----------------------------
+# RECORDS
+# -----------------------------
+def format_size(bytes, suffix="B"):
+    """Scale bytes to KB, MB, GB, etc."""
+    factor = 1024
+    for unit in ["", "K", "M", "G", "T", "P"]:
+        if bytes < factor:
+            return f"{bytes:.2f}{unit}{suffix}"
+        bytes /= factor
+
+
+def _plain(value):
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    return value
+
+
+class Record(ABC):
+    """
+    Base class for typed hardware readings.
+
+    Fields hold raw numbers (bytes, MHz, percent) so they can be compared
+    and aggregated; formatted() builds the display strings of the
+    get_*_info() dicts only when asked. to_dict() is plain data, ready for
+    json / msgpack, and from_dict() reverses it.
+    """
+    __slots__ = ()
+
+    def fields(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def to_dict(self) -> dict:
+        return {name: _plain(value) for name, value in self.fields().items()}
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(**data)
+
+    @abstractmethod
+    def formatted(self) -> dict:
+        """
+        Display strings, in the shape of the matching get_*_info() dict.
+        """
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.fields() == other.fields()
+
+    __hash__ = object.__hash__
+
+    def __repr__(self):
+        args = ", ".join(f"{k}={v!r}" for k, v in self.fields().items())
+        return f"{type(self).__name__}({args})"
+
+
+class CpuInfo(Record):
+    __slots__ = ("physical_cores", "total_cores", "processor", "max_mhz", "min_mhz", "current_mhz")
+
+    def __init__(self, physical_cores: int | None, total_cores: int | None, processor: str = "",
+                 max_mhz: float | None = None, min_mhz: float | None = None,
+                 current_mhz: float | None = None):
+        self.physical_cores = physical_cores
+        self.total_cores = total_cores
+        self.processor = processor
+        self.max_mhz = max_mhz
+        self.min_mhz = min_mhz
+        self.current_mhz = current_mhz
+
+    def with_current(self, current_mhz: float | None) -> "CpuInfo":
+        return CpuInfo(self.physical_cores, self.total_cores, self.processor,
+                       self.max_mhz, self.min_mhz, current_mhz)
+
+    def formatted(self) -> dict:
+        info = {
+            'Physical Cores': self.physical_cores,
+            'Total Cores': self.total_cores,
+        }
+        if self.max_mhz is not None:
+            info['Max Frequency'] = f"{self.max_mhz:.2f} MHz"
+            info['Min Frequency'] = f"{self.min_mhz:.2f} MHz"
+        if self.current_mhz is not None:
+            info['Current Frequency'] = f"{self.current_mhz:.2f} MHz"
+        info['Processor'] = self.processor
+        return info
+
+
+class MemoryInfo(Record):
+    __slots__ = ("total", "available", "used", "percent")
+
+    def __init__(self, total: int, available: int, used: int, percent: float):
+        self.total = total
+        self.available = available
+        self.used = used
+        self.percent = percent
+
+    def formatted(self) -> dict:
+        return {
+            "Total": format_size(self.total),
+            "Available Memory": format_size(self.available),
+            "Used Memory": format_size(self.used),
+            "Usage": f"{self.percent}%"
+        }
+
+
+class DiskInfo(Record):
+    __slots__ = ("device", "mountpoint", "fstype", "total", "used", "free", "percent")
+
+    def __init__(self, device: str, mountpoint: str, fstype: str,
+                 total: int, used: int, free: int, percent: float):
+        self.device = device
+        self.mountpoint = mountpoint
+        self.fstype = fstype
+        self.total = total
+        self.used = used
+        self.free = free
+        self.percent = percent
+
+    def formatted(self) -> dict:
+        return {
+            "Device": self.device,
+            "Mountpoint": self.mountpoint,
+            "File System": self.fstype,
+            "Total Size": format_size(self.total),
+            "Used": format_size(self.used),
+            "Free": format_size(self.free),
+            "Usage": f"{self.percent}"
+        }
+
+
+class GpuProcess(Record):
+    __slots__ = ("pid", "name", "memory_used")
+
+    def __init__(self, pid: int, name: str, memory_used: int | None):
+        self.pid = pid
+        self.name = name
+        self.memory_used = memory_used          # bytes, None if not reported
+
+    def formatted(self) -> dict:
+        return {
+            "PID": self.pid,
+            "Name": self.name,
+            "Memory Used": format_size(self.memory_used) if self.memory_used is not None else "N/A",
+        }
+
+
+class GpuInfo(Record):
+    """
+    Telemetry fields are None when the driver doesn't report them.
+    """
+    __slots__ = ("name", "memory_total", "driver", "index", "memory_used",
+                 "utilization", "memory_utilization", "processes")
+
+    def __init__(self, name: str, memory_total: int | None, driver: str, index: int = 0,
+                 memory_used: int | None = None, utilization: float | None = None,
+                 memory_utilization: float | None = None, processes: list = ()):
+        self.name = name
+        self.memory_total = memory_total        # bytes
+        self.driver = driver
+        self.index = index
+        self.memory_used = memory_used          # bytes
+        self.utilization = utilization          # percent of time the GPU was busy
+        self.memory_utilization = memory_utilization
+        self.processes = list(processes)        # GpuProcess
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        data = dict(data)
+        data["processes"] = [GpuProcess.from_dict(p) for p in data.get("processes", ())]
+        return cls(**data)
+
+    def formatted(self) -> dict:
+        info = {
+            "Name": self.name,
+            "Memory": f"{self.memory_total // 1024 ** 2} MiB" if self.memory_total is not None else "N/A",
+            "Driver": self.driver
+        }
+        if self.memory_used is not None:
+            info["Memory Used"] = f"{self.memory_used // 1024 ** 2} MiB"
+        if self.utilization is not None:
+            info["Utilization"] = f"{self.utilization:g}%"
+        if self.processes:
+            info["Processes"] = [p.formatted() for p in self.processes]
+        return info
+
+
+class HardwareSnapshot(Record):
+    """
+    All hardware readings at one time. A field is None if its reading
+    wasn't available (see HardwareCollector).
+
+    gpu_message says why gpus is empty (e.g. "'nvidia-smi' not found"),
+    None if the GPUs were read.
+    """
+    __slots__ = ("timestamp", "cpu", "memory", "disks", "gpus", "gpu_message")
+
+    def __init__(self, timestamp: float, cpu: CpuInfo | None, memory: MemoryInfo | None,
+                 disks: list | None, gpus: list | None, gpu_message: str | None = None):
+        self.timestamp = timestamp
+        self.cpu = cpu
+        self.memory = memory
+        self.disks = disks
+        self.gpus = gpus
+        self.gpu_message = gpu_message
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        def build(record, value):
+            return None if value is None else record.from_dict(value)
+
+        def build_list(record, values):
+            return None if values is None else [record.from_dict(v) for v in values]
+
+        return cls(
+            data["timestamp"],
+            build(CpuInfo, data["cpu"]),
+            build(MemoryInfo, data["memory"]),
+            build_list(DiskInfo, data["disks"]),
+            build_list(GpuInfo, data["gpus"]),
+            data.get("gpu_message"),
+        )
+
+    def formatted(self) -> dict:
+        """
+        Same shape as HardwareInfo.get_hardware_info().
+        """
+        if self.gpus is None:
+            gpu = None
+        elif self.gpu_message is not None:
+            gpu = self.gpu_message
+        else:
+            gpu = [g.formatted() for g in self.gpus] or "No NVIDIA GPU detected."
+
+        return {
+            "CPU": self.cpu.formatted() if self.cpu is not None else None,
+            "Memory": self.memory.formatted() if self.memory is not None else None,
+            "Disks": [d.formatted() for d in self.disks] if self.disks is not None else None,
+            "GPU": gpu,
+        }
+# -----------------------------
+
+
 # -----------------------------
 # HARDWARE INFO
 # -----------------------------
 class HardwareInfo:
-    def __init__(self):
-        pass
+    """
+    get_cpu() / get_memory() / ... return typed records (raw numbers);
+    the get_*_info() methods return the same readings as display strings.
+    """
+    GPU_TIMEOUT_S = 5
+
+    def __init__(self, gpu_monitor=None):
+        """
+        :param gpu_monitor: utils.gpu.GpuMonitor to read GPUs from
+                            (default: the shared one)
+        """
+        self.gpu_monitor = gpu_monitor
 
     def get_size(self, bytes, suffix="B"):
         """Scale bytes to KB, MB, GB, etc."""
-        factor = 1024
-        for unit in ["", "K", "M", "G", "T", "P"]:
-            if bytes < factor:
-                return f"{bytes:.2f}{unit}{suffix}"
-            bytes /= factor
+        return format_size(bytes, suffix)
+
+    # ---------------- CPU ----------------
+    def get_cpu(self, static: CpuInfo = None) -> CpuInfo:
+        """
+        :param static: Earlier get_cpu_static() result to reuse; only
+                       the current frequency is read then.
+        """
+        static = static or self.get_cpu_static()
+        cpu_freq = _psutil().cpu_freq()
+        return static.with_current(cpu_freq.current if cpu_freq else None)
+
+    def get_cpu_static(self) -> CpuInfo:
+        """
+        CPU facts that don't change while the process runs
+        """
+        psutil = _psutil()
+        cpu_freq = psutil.cpu_freq()
+        return CpuInfo(
+            physical_cores=psutil.cpu_count(logical=False),
+            total_cores=psutil.cpu_count(logical=True),
+            processor=platform.processor(),
+            max_mhz=cpu_freq.max if cpu_freq else None,
+            min_mhz=cpu_freq.min if cpu_freq else None,
+        )
 
     def get_cpu_info(self):
-        info = {}
+        return self.get_cpu().formatted()
 
-        info['Physical Cores'] = psutil.cpu_count(logical=False)
-        info['Total Cores'] = psutil.cpu_count(logical=True)
+    # ---------------- Memory ----------------
+    def get_memory(self) -> MemoryInfo:
+        svmem = _psutil().virtual_memory()
+        return MemoryInfo(svmem.total, svmem.available, svmem.used, svmem.percent)
 
-        cpu_freq = psutil.cpu_freq()
-        if cpu_freq:
-            info['Max Frequency'] = f"{cpu_freq.max:.2f} MHz"
-            info['Min Frequency'] = f"{cpu_freq.min:.2f} MHz"
-            info['Current Frequency'] = f"{cpu_freq.current:.2f} MHz"
-        
-        info['Processor'] = platform.processor()
-        return info
-    
     def get_memory_info(self):
-        svmem = psutil.virtual_memory()
+        return self.get_memory().formatted()
+
+    # ---------------- Disks ----------------
+    def get_partitions(self):
+        return _psutil().disk_partitions()
+
+    def get_disk(self, partition) -> DiskInfo | None:
+        """
+        Usage of one partition, None if it can't be read.
+        May block for as long as the mount does (e.g. a hung network share).
+        """
+        try:
+            usage = _psutil().disk_usage(partition.mountpoint)
+        except (PermissionError, OSError):
+            return None
+
+        return DiskInfo(
+            partition.device, partition.mountpoint, partition.fstype,
+            usage.total, usage.used, usage.free, usage.percent,
+        )
+
+    def get_disks(self) -> list:
+        disks = (self.get_disk(partition) for partition in self.get_partitions())
+        return [disk for disk in disks if disk is not None]
 
-        return {
-            "Total": self.get_size(svmem.total),
-            "Available Memory": self.get_size(svmem.available),
-            "Used Memory": self.get_size(svmem.used),
-            "Usage": f"{svmem.percent}%"
-        }
-    
     def get_disk_info(self):
-        partitions = psutil.disk_partitions()
-        disk_info = []
+        return [disk.formatted() for disk in self.get_disks()]
+
+    # ---------------- GPU ----------------
+    def query_gpus(self):
+        """
+        (list of GpuInfo, None) or ([], message saying why there are none)
+        """
+        monitor = self.gpu_monitor
+        if monitor is None:
+            from utils.gpu import gpu_monitor
+            monitor = self.gpu_monitor = gpu_monitor()
+
+        if not monitor.start():
+            return [], "No NVIDIA GPU or 'nvidia-smi' not found."
+
+        # Only the first nvidia-smi sample is waited for
+        gpus = monitor.sample(timeout=self.GPU_TIMEOUT_S)
+        if gpus is None:
+            return [], "'nvidia-smi' did not respond."
+        if not gpus:
+            return [], "No NVIDIA GPU detected."
+        return gpus, None
+
+    def get_gpus(self) -> list:
+        """
+        NVIDIA GPUs with utilization, memory and per-process usage
+        ([] if there are none or neither NVML nor nvidia-smi is available).
+        """
+        return self.query_gpus()[0]
 
-        for partition in partitions:
-            try:
-                usage = psutil.disk_usage(partition.mountpoint)
-            except PermissionError:
-                continue
-
-            disk_info.append({
-                "Device": partition.device,
-                "Mountpoint": partition.mountpoint,
-                "File System": partition.fstype,
-                "Total Size": self.get_size(usage.total),
-                "Used": self.get_size(usage.used),
-                "Free": self.get_size(usage.free),
-                "Usage": f"{usage.percent}"
-            })
-        return disk_info
-    
     def get_gpu_info(self):
         """
         Returns NVIDIA GPU Info if available, otherwise a message.
-        """        
-        try:
-            result = subprocess.run(
-                ['nvidia-smi', '--query-gpu=name,memory.total,driver_version', '--format=csv,noheader'],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-
-            if result.returncode == 0:
-                gpus = []
-                for line in result.stdout.strip().split('\n'):
-                    name, mem, driver = [x.strip() for x in line.split(',')]
-                    gpus.append({
-                        "Name": name,
-                        "Memory": mem,
-                        "Driver": driver
-                    })
-                return gpus
-            else:
-                return "No NVIDIA GPU detected."
-            
-        except FileNotFoundError:
-            return "No NVIDIA GPU or 'nvidia-smi' not found."
-    
+        """
+        gpus, message = self.query_gpus()
+        if message is not None:
+            return message
+        return [gpu.formatted() for gpu in gpus]
+
+    # ---------------- All ----------------
+    def get_snapshot(self) -> HardwareSnapshot:
+        gpus, gpu_message = self.query_gpus()
+        return HardwareSnapshot(
+            time.time(), self.get_cpu(), self.get_memory(), self.get_disks(), gpus, gpu_message,
+        )
+
     def get_hardware_info(self):
         """
         Returns all hardware info combined
@@ -230,6 +555,183 @@ class HardwareInfo:
 # -----------------------------
 
 
+# -----------------------------
+# CONCURRENT COLLECTION
+# -----------------------------
+class _TTLCache:
+    """
+    Values recomputed at most once per ttl seconds. Thread-safe.
+    """
+
+    def __init__(self):
+        self._values = {}       # key -> (expires, value)
+        self._lock = threading.Lock()
+
+    def get(self, key, ttl: float, compute):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._values.get(key)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+
+        # Computed outside the lock; concurrent misses may both compute
+        value = compute()
+        with self._lock:
+            self._values[key] = (now + ttl, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+class HardwareCollector:
+    """
+    Non-blocking HardwareInfo snapshots.
+
+    Each probe (CPU, memory, GPU, and the usage of each partition) runs
+    concurrently on its own daemon thread and is waited for at most its
+    timeout. A probe that doesn't finish in time is reported with its last
+    value (None before the first one) and listed by pending(); later calls
+    neither wait for it nor start it again until it returns, so a hung mount
+    or a wedged GPU driver costs one stuck thread, not one per call.
+
+    Slow-changing facts (core counts, CPU model and frequency range, the
+    partition list) are cached for STATIC_TTL / PARTITIONS_TTL seconds.
+    """
+    TIMEOUTS = {"CPU": 1.0, "Memory": 1.0, "Disks": 2.0, "GPU": 3.0}
+    STATIC_TTL = 300.0
+    PARTITIONS_TTL = 60.0
+
+    def __init__(self, hardware: HardwareInfo = None, timeouts: dict = None,
+                 static_ttl: float = STATIC_TTL, partitions_ttl: float = PARTITIONS_TTL):
+        self.hardware = hardware or HardwareInfo()
+        self.timeouts = {**self.TIMEOUTS, **(timeouts or {})}
+        self.static_ttl = static_ttl
+        self.partitions_ttl = partitions_ttl
+
+        self._cache = _TTLCache()
+        self._running = {}      # probe key -> Future
+        self._last = {}         # probe key -> last completed value
+        self._overdue = set()   # probe keys that outlived a caller's timeout
+        self._lock = threading.Lock()
+
+        self.errors = {}        # probe key -> message of its last failure
+
+    # ---------------------------------
+    # PROBES
+    # ---------------------------------
+    def _cpu(self):
+        static = self._cache.get("cpu", self.static_ttl, self.hardware.get_cpu_static)
+        return self.hardware.get_cpu(static)
+
+    def _partitions(self):
+        return self._cache.get("partitions", self.partitions_ttl, self.hardware.get_partitions)
+
+    # ---------------------------------
+    # COLLECTION
+    # ---------------------------------
+    def snapshot(self, timeout: float = None) -> HardwareSnapshot:
+        """
+        Typed readings; fields whose probe hasn't finished yet are None.
+        :param timeout: Caps every probe's wait (0 returns at once with
+                        whatever has already finished).
+        """
+        start = time.monotonic()
+
+        def deadline(name):
+            limit = self.timeouts[name]
+            if timeout is not None:
+                limit = min(limit, timeout)
+            return start + limit
+
+        futures = {
+            "CPU": self._submit("CPU", self._cpu),
+            "Memory": self._submit("Memory", self.hardware.get_memory),
+            "GPU": self._submit("GPU", self.hardware.query_gpus),
+        }
+        partitions = self._wait("Partitions", self._submit("Partitions", self._partitions), deadline("Disks"))
+
+        # One probe per mount, so a single hung mount only loses its own row
+        disks = {}
+        for partition in partitions or []:
+            key = f"Disk:{partition.mountpoint}"
+            disks[key] = self._submit(key, lambda p=partition: self.hardware.get_disk(p))
+
+        values = {name: self._wait(name, future, deadline(name)) for name, future in futures.items()}
+        usages = (self._wait(key, future, deadline("Disks")) for key, future in disks.items())
+        gpus, gpu_message = values["GPU"] or (None, None)
+        return HardwareSnapshot(
+            time.time(), values["CPU"], values["Memory"],
+            [usage for usage in usages if usage is not None] if partitions is not None else None,
+            gpus, gpu_message,
+        )
+
+    def collect(self, timeout: float = None) -> dict:
+        """
+        Snapshot in the shape of HardwareInfo.get_hardware_info().
+        """
+        return self.snapshot(timeout).formatted()
+
+    def pending(self) -> list:
+        """
+        Probes still running (e.g. stuck on a hung mount).
+        """
+        with self._lock:
+            return sorted(key for key, future in self._running.items() if not future.done())
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    def _submit(self, key: str, probe) -> Future:
+        with self._lock:
+            future = self._running.get(key)
+            if future is not None and not future.done():
+                return future
+            future = self._running[key] = Future()
+            self._overdue.discard(key)
+
+        # Also records results that arrive after every caller gave up waiting
+        future.add_done_callback(lambda f: self._on_done(key, f))
+
+        def run():
+            try:
+                future.set_result(probe())
+            except Exception as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, name=f"hardware-probe {key}", daemon=True).start()
+        return future
+
+    def _on_done(self, key: str, future: Future):
+        error = future.exception()
+        with self._lock:
+            self._overdue.discard(key)
+            if error is None:
+                self._last[key] = future.result()
+                self.errors.pop(key, None)
+            else:
+                self.errors[key] = str(error)
+
+    def _wait(self, key: str, future: Future, deadline: float):
+        with self._lock:
+            # Already overdue from an earlier call: don't wait for it again
+            overdue = key in self._overdue
+        wait = 0.0 if overdue else max(0.0, deadline - time.monotonic())
+        try:
+            return future.result(timeout=wait)
+        except FutureTimeout:
+            with self._lock:
+                if not future.done():
+                    self._overdue.add(key)
+                return self._last.get(key)
+        except Exception:
+            # Recorded in errors by _on_done
+            with self._lock:
+                return self._last.get(key)
+# -----------------------------
+
+
 # -----------------------------
 # COMBINED SYSTEM WRAPPER
 # -----------------------------
@@ -237,10 +739,15 @@ class Systeminfo:
     def __init__(self):
         self.os_info = OSInfo()
         self.hardware_info = HardwareInfo()
+        self.collector = HardwareCollector(self.hardware_info)
     
-    def get_full_system_info(self):
+    def get_full_system_info(self, timeout: float = None):
+        """
+        Never blocks longer than the collector's probe timeouts;
+        see HardwareCollector for partial results.
+        """
         return {
             "OS": self.os_info.get_os_info(),
-            "Hardware": self.hardware_info.get_hardware_info()
+            "Hardware": self.collector.collect(timeout)
         }
 # -----------------------------
\ No newline at end of file
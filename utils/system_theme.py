@@ -0,0 +1,253 @@
+import shutil
+import subprocess
+import threading
+
+from PySide6.QtCore import QObject, QTimer, Qt, Signal
+from PySide6.QtGui import QGuiApplication
+
+from utils.system_checker import OSInfo
+
+
+LIGHT = "light"
+DARK = "dark"
+
+# os -> command whose output says whether the OS is in dark mode
+DETECT_COMMANDS = {
+    "linux": ["gsettings", "get", "org.gnome.desktop.interface", "color-scheme"],
+    "macos": ["defaults", "read", "-g", "AppleInterfaceStyle"],
+}
+
+# Long-running commands printing a line per change
+MONITOR_COMMANDS = {
+    "linux": ["gsettings", "monitor", "org.gnome.desktop.interface", "color-scheme"],
+}
+
+
+def _scheme_from_output(text: str) -> str:
+    return DARK if "dark" in text.lower() else LIGHT
+
+
+def _read_windows_scheme() -> str:
+    import winreg
+    with winreg.OpenKey(
+        winreg.HKEY_CURRENT_USER,
+        r"Software\Microsoft\Windows\CurrentVersion\Themes\Personalize",
+    ) as key:
+        value, _ = winreg.QueryValueEx(key, "AppsUseLightTheme")
+        return LIGHT if value == 1 else DARK
+
+
+class SystemThemeMonitor(QObject):
+    """
+    Cached, non-blocking system light/dark detection.
+
+    current() never blocks: it answers from Qt's style hints when the
+    platform reports a color scheme, otherwise from the cache, starting a
+    one-off detection on a worker thread on first use. start() follows OS
+    changes with a monitor command (`gsettings monitor` on Linux), Qt's
+    colorSchemeChanged, or by polling the detect command.
+
+    :param command: Detection command (overrides DETECT_COMMANDS); its output
+                    is "dark" if it contains "dark" (e.g. a stub script in tests).
+    :param monitor_command: Command printing a line per change; None picks
+                            MONITOR_COMMANDS, [] forces polling.
+    """
+    changed = Signal(str)   # "light" / "dark"
+
+    POLL_MS = 5000
+    TIMEOUT_S = 3
+
+    def __init__(self, command=None, monitor_command=None, poll_interval_ms: int = POLL_MS, parent=None):
+        super().__init__(parent)
+        self.os_name = OSInfo().get_os()
+        self.command = command or DETECT_COMMANDS.get(self.os_name)
+        self.monitor_command = (
+            MONITOR_COMMANDS.get(self.os_name) if monitor_command is None else monitor_command
+        )
+
+        self._scheme = None
+        self._lock = threading.Lock()
+        self._detecting = False
+        self._detected = threading.Event()
+        self._process = None
+        self._running = False
+
+        self._poll = QTimer(self)
+        self._poll.setInterval(poll_interval_ms)
+        self._poll.timeout.connect(self.detect_async)
+
+    # ---------------------------------
+    # QUERY
+    # ---------------------------------
+    def current(self, default: str = LIGHT) -> str:
+        scheme = self._qt_scheme()
+        if scheme is not None:
+            return scheme
+
+        with self._lock:
+            scheme = self._scheme
+        if scheme is None:
+            self.detect_async()
+            return default
+        return scheme
+
+    def wait(self, timeout: float | None = None, default: str = LIGHT) -> str:
+        """
+        Blocking variant of current() for code that can't react to changed.
+        """
+        scheme = self._qt_scheme()
+        if scheme is not None:
+            return scheme
+        self.detect_async()
+        self._detected.wait(timeout)
+        with self._lock:
+            return self._scheme or default
+
+    def _qt_scheme(self):
+        app = QGuiApplication.instance()
+        if app is None:
+            return None
+        scheme = app.styleHints().colorScheme()
+        if scheme == Qt.ColorScheme.Dark:
+            return DARK
+        if scheme == Qt.ColorScheme.Light:
+            return LIGHT
+        return None
+
+    # ---------------------------------
+    # DETECTION (worker thread)
+    # ---------------------------------
+    def detect_async(self):
+        """
+        Runs one detection off the GUI thread (no-op if one is running).
+        """
+        with self._lock:
+            if self._detecting:
+                return
+            self._detecting = True
+        threading.Thread(target=self._detect_worker, name="system-theme", daemon=True).start()
+
+    def _detect_worker(self):
+        try:
+            scheme = self.detect()
+        except Exception:
+            scheme = LIGHT
+        finally:
+            with self._lock:
+                self._detecting = False
+        self._update(scheme)
+
+    def detect(self) -> str:
+        """
+        Synchronous detection; blocks on the OS query.
+        """
+        if self.command:
+            try:
+                result = subprocess.run(
+                    self.command, capture_output=True, text=True, timeout=self.TIMEOUT_S,
+                )
+            except (OSError, subprocess.TimeoutExpired):
+                return LIGHT
+            if result.returncode != 0:
+                # `defaults read` fails when the key is unset, i.e. light mode
+                return LIGHT
+            return _scheme_from_output(result.stdout)
+
+        if self.os_name == "windows":
+            return _read_windows_scheme()
+        return LIGHT
+
+    def _update(self, scheme: str):
+        with self._lock:
+            previous, self._scheme = self._scheme, scheme
+        self._detected.set()
+        if scheme != previous:
+            # Queued to the GUI thread when emitted from a worker
+            self.changed.emit(scheme)
+
+    # ---------------------------------
+    # SUBSCRIPTION
+    # ---------------------------------
+    def start(self):
+        """
+        Starts following OS changes (idempotent).
+        """
+        if self._running:
+            return
+        self._running = True
+
+        app = QGuiApplication.instance()
+        if app is not None:
+            app.styleHints().colorSchemeChanged.connect(self._on_qt_scheme)
+
+        if self.monitor_command and shutil.which(self.monitor_command[0]):
+            try:
+                self._process = subprocess.Popen(
+                    self.monitor_command, stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL, text=True,
+                )
+            except OSError:
+                self._process = None
+            else:
+                threading.Thread(
+                    target=self._monitor_worker, args=(self._process,),
+                    name="system-theme-monitor", daemon=True,
+                ).start()
+
+        if self._process is None:
+            self._poll.start()
+        self.detect_async()
+
+    def stop(self):
+        if not self._running:
+            return
+        self._running = False
+
+        app = QGuiApplication.instance()
+        if app is not None:
+            try:
+                app.styleHints().colorSchemeChanged.disconnect(self._on_qt_scheme)
+            except (RuntimeError, TypeError):
+                pass
+
+        self._poll.stop()
+        process, self._process = self._process, None
+        if process is not None:
+            # Reap it, or it stays a zombie until the next subprocess call
+            process.terminate()
+            try:
+                process.wait(self.TIMEOUT_S)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+    def is_running(self) -> bool:
+        return self._running
+
+    def _monitor_worker(self, process):
+        for line in process.stdout:
+            if line.strip():
+                self._update(_scheme_from_output(line))
+        process.stdout.close()
+
+    def _on_qt_scheme(self, scheme):
+        if scheme == Qt.ColorScheme.Dark:
+            self._update(DARK)
+        elif scheme == Qt.ColorScheme.Light:
+            self._update(LIGHT)
+
+
+_monitor = None
+_monitor_lock = threading.Lock()
+
+
+def system_theme_monitor() -> SystemThemeMonitor:
+    """
+    Process-wide monitor (created on first use, from any thread).
+    """
+    global _monitor
+    if _monitor is None:
+        with _monitor_lock:
+            if _monitor is None:
+                _monitor = SystemThemeMonitor()
+    return _monitor
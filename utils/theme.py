@@ -1,10 +1,13 @@
 from enum import Enum
+from functools import lru_cache, partial
 from PySide6.QtWidgets import QApplication, QLabel, QWidget, QGraphicsOpacityEffect
 from PySide6.QtCore import QPropertyAnimation, QEasingCurve, Qt
-import subprocess
+from PySide6.QtGui import QColor, QPalette
+import re
 
 from utils.paths import resource_path
-from utils.system_checker import OSInfo
+from utils.style import STYLESHEETS
+from utils.system_theme import system_theme_monitor
 
 
 class Theme(Enum):
@@ -14,75 +17,158 @@ class Theme(Enum):
 
 
 def detect_system_theme() -> Theme:
-    try:
-        os_name = OSInfo.get_os()
-
-        # ---------------- WINDOWS ----------------
-        if os_name == "windows":
-            import winreg
-            with winreg.OpenKey(
-                winreg.HKEY_CURRENT_USER,
-                r"Software\Microsoft\Windows\CurrentVersion\Themes\Personalize",
-            ) as key:
-                value, _ = winreg.QueryValueEx(key, "AppsUseLightTheme")
-                return Theme.LIGHT if value == 1 else Theme.DARK
-
-        # ---------------- MACOS ----------------
-        if os_name == "macos":
-            result = subprocess.run(
-                ["defaults", "read", "-g", "AppleInterfaceStyle"],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-            )
-            return Theme.DARK if result.returncode == 0 else Theme.LIGHT
-
-        # ---------------- LINUX ----------------
-        if os_name == "linux":
-            result = subprocess.run(
-                ["gsettings", "get", "org.gnome.desktop.interface", "color-scheme"],
-                capture_output=True,
-                text=True,
-            )
-            if "dark" in result.stdout.lower():
-                return Theme.DARK
-            return Theme.LIGHT
-
-    except Exception:
-        pass
-
-    return Theme.LIGHT
-
-
-def _load_qss(filename: str) -> str:
-    path = resource_path(f"assets/styles/{filename}")
-    if not path.exists():
-        print(f"[THEME ERROR] QSS file not found: {path}")
-        return ""
-    return path.read_text(encoding="utf-8")
-
-
-def apply_theme(app: QApplication, theme: Theme, animate: bool = True):
+    """
+    Cached and non-blocking: until the first detection finishes on its
+    worker thread this returns LIGHT (see utils.system_theme).
+    """
+    return Theme(system_theme_monitor().current())
+
+
+# Re-applies the theme while Theme.SYSTEM is selected
+_system_follower = None
+
+
+def _on_system_theme_changed(_scheme: str):
+    if _system_follower is not None:
+        _system_follower()
+
+
+def _follow_system(callback):
+    """
+    callback is re-run on every OS theme change; None stops following.
+    """
+    global _system_follower
+    monitor = system_theme_monitor()
+
+    if _system_follower is None and callback is not None:
+        monitor.changed.connect(_on_system_theme_changed)
+        monitor.start()
+    elif _system_follower is not None and callback is None:
+        monitor.changed.disconnect(_on_system_theme_changed)
+        monitor.stop()
+    _system_follower = callback
+
+
+def _qss_path(filename: str):
+    return resource_path(f"assets/styles/{filename}")
+
+
+# ---------------- STYLE LAYERS ----------------
+class StyleLayer:
+    """
+    Stylesheets a package adds to every theme (paths relative to the
+    source root, see resource_path).
+
+    :param component: Sizes, spacing and fonts; loaded in both modes.
+    :param colors: Theme value ("light" / "dark") -> color sheet (apply_theme).
+    :param palette: Sheet of palette() color rules (apply_palette_theme).
+    :param on_theme: Called with the theme value on every apply, for colors
+                     QSS can't reach (e.g. syntax highlighting).
+    """
+    __slots__ = ("name", "component", "colors", "palette", "on_theme")
+
+    def __init__(self, name: str, component=(), colors: dict | None = None,
+                 palette: str | None = None, on_theme=None):
+        self.name = name
+        self.component = list(component)
+        self.colors = dict(colors or {})
+        self.palette = palette
+        self.on_theme = on_theme
+
+
+# name -> StyleLayer, in registration order
+_style_layers = {}
+
+# Re-runs the last apply_theme / apply_palette_theme call
+_reapply = None
+
+
+def register_style_layer(layer: StyleLayer):
+    """
+    Adds (or replaces, by name) a layer. A theme that is already applied
+    is re-applied with it.
+    """
+    _style_layers[layer.name] = layer
+    if _reapply is not None:
+        _reapply()
+
+
+def _component_paths() -> list:
+    """
+    Sizes, spacing and fonts; shared by the stylesheet and palette modes.
+    """
+    paths = [_qss_path("metrics.qss")]
+    for layer in _style_layers.values():
+        paths += [resource_path(path) for path in layer.component]
+    return paths
+
+
+def _theme_paths(theme: Theme) -> list:
+    paths = _component_paths()
+    for layer in _style_layers.values():
+        if theme.value in layer.colors:
+            paths.append(resource_path(layer.colors[theme.value]))
+    return paths + [_qss_path(f"{theme.value}_theme.qss")]
+
+
+def _notify_layers(theme: Theme):
+    for layer in _style_layers.values():
+        if layer.on_theme is not None:
+            layer.on_theme(theme.value)
+
+
+def _palette_layers_qss(qss: str) -> str:
+    """
+    qss followed by the palette sheets of the registered layers.
+    """
+    texts = [qss]
+    for layer in _style_layers.values():
+        if layer.palette:
+            texts.append(STYLESHEETS.read(resource_path(layer.palette)))
+    return "\n".join(texts)
+
+
+def apply_theme(app: QApplication, theme: Theme, animate: bool = True, watch: bool = False):
+    """
+    :param watch: Re-apply the theme files when they change on disk
+                  (for theme development).
+    """
+    global _reapply
+    _reapply = partial(apply_theme, app, theme, animate=False, watch=watch)
+
     if theme == Theme.SYSTEM:
+        _follow_system(lambda: apply_theme(app, Theme.SYSTEM, animate, watch))
         theme = detect_system_theme()
+    else:
+        _follow_system(None)
+    _notify_layers(theme)
+
+    paths = _theme_paths(theme)
+    if watch:
+        STYLESHEETS.watch(app, paths)
+    else:
+        STYLESHEETS.unwatch(app)
 
-    metrics_qss = _load_qss("metrics.qss")
-    theme_qss = _load_qss(f"{theme.value}_theme.qss")
-    final_qss = metrics_qss + "\n" + theme_qss
+    final_qss = STYLESHEETS.compile(paths)
+
+    # Same stylesheet → nothing to re-polish (and nothing to animate)
+    if app.styleSheet() == final_qss:
+        return
 
     # No animation → instant apply
     if not animate:
-        app.setStyleSheet(final_qss)
+        STYLESHEETS.apply_text(app, final_qss)
         return
 
     window = app.activeWindow()
     if not window:
-        app.setStyleSheet(final_qss)
+        STYLESHEETS.apply_text(app, final_qss)
         return
 
     # 🔒 Animate ONLY the central widget
     content: QWidget | None = window.centralWidget()
     if content is None:
-        app.setStyleSheet(final_qss)
+        STYLESHEETS.apply_text(app, final_qss)
         return
 
     # Prepare opacity effect
@@ -102,9 +188,140 @@ def apply_theme(app: QApplication, theme: Theme, animate: bool = True):
     fade_in.setEasingCurve(QEasingCurve.InCubic)
 
     def apply_and_fade_in():
-        app.setStyleSheet(final_qss)
+        STYLESHEETS.apply_text(app, final_qss)
         content.repaint()
         fade_in.start()
 
     fade_out.finished.connect(apply_and_fade_in)
     fade_out.start()
+
+
+
+# ---------------- PALETTE MODE ----------------
+# Colors live in a QPalette; switching themes only swaps the palette and
+# repaints, instead of re-parsing the stylesheet and re-polishing every widget.
+PALETTES = {
+    Theme.DARK: {
+        QPalette.Window: "#0d1117",
+        QPalette.WindowText: "#e6edf3",
+        QPalette.Base: "#0b1220",
+        QPalette.AlternateBase: "#161b22",
+        QPalette.Text: "#e6edf3",
+        QPalette.PlaceholderText: "#7d8590",
+        QPalette.Button: "#21262d",
+        QPalette.ButtonText: "#e6edf3",
+        QPalette.BrightText: "#ffffff",
+        QPalette.Mid: "#30363d",
+        QPalette.Highlight: "#1f6feb",
+        QPalette.HighlightedText: "#ffffff",
+        QPalette.Link: "#58a6ff",
+        QPalette.LinkVisited: "#bc8cff",
+        QPalette.ToolTipBase: "#161b22",
+        QPalette.ToolTipText: "#e6edf3",
+    },
+    Theme.LIGHT: {
+        QPalette.Window: "#ffffff",
+        QPalette.WindowText: "#1f2328",
+        QPalette.Base: "#f6f8fa",
+        QPalette.AlternateBase: "#eaeef2",
+        QPalette.Text: "#1f2328",
+        QPalette.PlaceholderText: "#6e7781",
+        QPalette.Button: "#f6f8fa",
+        QPalette.ButtonText: "#1f2328",
+        QPalette.BrightText: "#000000",
+        QPalette.Mid: "#d0d7de",
+        QPalette.Highlight: "#0969da",
+        QPalette.HighlightedText: "#ffffff",
+        QPalette.Link: "#0969da",
+        QPalette.LinkVisited: "#8250df",
+        QPalette.ToolTipBase: "#ffffff",
+        QPalette.ToolTipText: "#1f2328",
+    },
+}
+
+# Rules for colors widgets don't take from the palette on their own; the
+# palette sheets of registered StyleLayers are added after it.
+# palette() is resolved at polish time, so on a switch only the widgets these
+# selectors target are re-polished; keep them few and by object name / class.
+PALETTE_QSS = """
+QToolTip {
+    color: palette(tooltip-text);
+    background: palette(tooltip-base);
+    border: 1px solid palette(mid);
+}
+"""
+
+
+def build_palette(theme: Theme) -> QPalette:
+    palette = QPalette()
+    for role, color in PALETTES[theme].items():
+        palette.setColor(role, QColor(color))
+
+    disabled = QColor(PALETTES[theme][QPalette.PlaceholderText])
+    for role in (QPalette.WindowText, QPalette.Text, QPalette.ButtonText):
+        palette.setColor(QPalette.Disabled, role, disabled)
+    return palette
+
+
+@lru_cache(maxsize=8)
+def _palette_selectors(qss: str) -> tuple:
+    """
+    (object names, class names) targeted by the rules in qss.
+    """
+    names, classes = set(), set()
+    qss = re.sub(r"/\*.*?\*/", "", qss, flags=re.S)
+    for selectors in re.findall(r"([^{}]+)\{", qss):
+        for selector in selectors.split(","):
+            parts = selector.split()
+            if not parts:
+                continue
+            subject = parts[-1]
+            match = re.search(r"#([\w-]+)", subject)
+            if match:
+                names.add(match.group(1))
+            else:
+                match = re.match(r"[A-Za-z_]\w*", subject)
+                if match:
+                    classes.add(match.group(0))
+    return frozenset(names), frozenset(classes)
+
+
+def _repolish(app: QApplication, qss: str):
+    names, classes = _palette_selectors(qss)
+    style = app.style()
+    for widget in app.allWidgets():
+        if widget.objectName() in names or widget.metaObject().className() in classes:
+            style.unpolish(widget)
+            style.polish(widget)
+            widget.update()
+
+
+def apply_palette_theme(app: QApplication, theme: Theme, qss: str = PALETTE_QSS):
+    """
+    Palette-driven alternative to apply_theme.
+
+    The stylesheet (the component QSS apply_theme also uses, plus qss and
+    the layers' palette sheets as the color layer) is set once; later
+    switches only call app.setPalette() and re-polish the few widgets the
+    color layer targets.
+    """
+    global _reapply
+    _reapply = partial(apply_palette_theme, app, theme, qss)
+
+    if theme == Theme.SYSTEM:
+        _follow_system(lambda: apply_palette_theme(app, Theme.SYSTEM, qss))
+        theme = detect_system_theme()
+    else:
+        _follow_system(None)
+    _notify_layers(theme)
+
+    # Without this, any app stylesheet pins each widget's palette at polish time
+    QApplication.setAttribute(Qt.AA_UseStyleSheetPropagationInWidgetStyles, True)
+    STYLESHEETS.unwatch(app)
+
+    app.setPalette(build_palette(theme))
+
+    colors = _palette_layers_qss(qss)
+    final_qss = STYLESHEETS.compile(_component_paths()) + "\n" + colors
+    if not STYLESHEETS.apply_text(app, final_qss):
+        _repolish(app, colors)